@@ -3,20 +3,26 @@ App Console API - FastAPI application for managing workspaces, jobs, and runs.
 Migrated to use Beanie (MongoDB) and Celery for task execution.
 """
 
-from fastapi import FastAPI, HTTPException, WebSocket, WebSocketDisconnect
+from fastapi import Depends, FastAPI, HTTPException, Query, Response, WebSocket, WebSocketDisconnect
+from pymongo.errors import DuplicateKeyError
 from cryptography.fernet import Fernet
 import os
 import asyncio
 import json
-import redis.asyncio as redis
 from typing import List
-from datetime import datetime
+from datetime import datetime, timedelta
 from core.utils.date_utils import get_now
 
-from core.db import init_db, close_db
+from core.db import init_db, close_db, close_redis
 from core.config import settings
-from core.models.mongo_models import Workspace, InboxIntegration, OtpRule, Job, Run, OtpAudit, Credential
+from core.models.mongo_models import Workspace, InboxIntegration, OtpRule, Job, Run, RunLog, OtpAudit, Credential
 from core.tasks import scrape_task
+from core.repositories import repo
+from core.worker import selenium_slots
+from core.worker.run_supervisor import publish_run_cancel
+from core.services.run_log_buffer import format_log_line, write_run_logs
+from core.services import dashboard_stats, run_stats
+from core.services.job_lookup import forget_job, resolve_job_info
 from core.services.user_service import ensure_admin_exists
 from django_config import celery_app
 from core.schemas.otp import (
@@ -24,39 +30,22 @@ from core.schemas.otp import (
     InboxIntegrationCreate, InboxIntegrationResponse,
     OtpRuleCreate, OtpRuleResponse
 )
-from app.console.schemas import JobCreate, JobResponse, RunResponse
+from app.console.schemas import JobCreate, JobResponse, RunResponse, RunLogPage
+from app.console.pagination import NEXT_CURSOR_HEADER, PageParams, fetch_page
 from app.console.websockets import ConnectionManager
+from app.console.realtime import (
+    WORKER_ID,
+    collect_worker_stats,
+    redis_listener,
+    remove_worker_stats,
+    report_worker_stats,
+)
 
 # WebSocket Manager
 manager = ConnectionManager()
 
-# Background Redis Listener
-async def redis_listener():
-    """
-    Subscribes to Redis 'run_updates' channel and broadcasts messages to WebSockets.
-    """
-    try:
-        r = redis.from_url(settings.REDIS_URL)
-        pubsub = r.pubsub()
-        await pubsub.subscribe("run_updates")
-        
-        async for message in pubsub.listen():
-            if message["type"] == "message":
-                data = message["data"]
-                if isinstance(data, bytes):
-                    data = data.decode("utf-8")
-                
-                try:
-                    payload = json.loads(data)
-                    await manager.broadcast(payload)
-                except json.JSONDecodeError:
-                    print(f"Failed to decode Redis message: {data}")
-                    
-    except asyncio.CancelledError:
-        # Task cancelled on shutdown
-        pass
-    except Exception as e:
-        print(f"Redis listener error: {e}")
+# Upper bound for one page of GET /runs/{run_id}/logs
+MAX_RUN_LOG_PAGE = 2000
 
 # Crypto Helpers
 def encrypt_token(token: str) -> str:
@@ -78,17 +67,29 @@ async def lifespan(app: FastAPI):
     """Initialize DB and start background tasks."""
     # Startup
     await init_db()
-    await ensure_admin_exists()
-    redis_task = asyncio.create_task(redis_listener())
+    try:
+        await ensure_admin_exists()
+    except DuplicateKeyError:
+        # Another uvicorn worker/replica bootstrapped the admin concurrently
+        pass
+    # Each console process relays Redis pub/sub to its own WebSockets
+    background_tasks = [
+        asyncio.create_task(redis_listener(manager)),
+        asyncio.create_task(report_worker_stats(manager)),
+    ]
     
     yield
     
     # Shutdown
-    redis_task.cancel()
-    try:
-        await redis_task
-    except asyncio.CancelledError:
-        pass
+    for task in background_tasks:
+        task.cancel()
+    for task in background_tasks:
+        try:
+            await task
+        except asyncio.CancelledError:
+            pass
+    await remove_worker_stats()
+    await close_redis()
     await close_db()
 
 
@@ -111,9 +112,11 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=[NEXT_CURSOR_HEADER],
 )
 
-from app.console.routers import auth, credentials, users, downloads, processors
+from app.console.routers import admin, auth, credentials, users, downloads, processors
+app.include_router(admin.router)
 app.include_router(auth.router)
 app.include_router(credentials.router)
 app.include_router(users.router)
@@ -134,10 +137,9 @@ async def create_workspace(ws_in: WorkspaceCreate):
 
 
 @app.get("/workspaces", response_model=List[WorkspaceResponse])
-async def list_workspaces():
-    """List all workspaces."""
-    workspaces = await Workspace.find_all().to_list()
-    return workspaces
+async def list_workspaces(response: Response, page: PageParams = Depends()):
+    """List workspaces, newest first (keyset paginated, see X-Next-Cursor)."""
+    return await fetch_page(Workspace, {}, page, response, WorkspaceResponse)
 
 
 
@@ -187,15 +189,12 @@ async def create_inbox_integration(integration_in: InboxIntegrationCreate):
 
 
 @app.get("/inbox_integrations", response_model=List[InboxIntegrationResponse])
-async def list_inbox_integrations(workspace_id: str = None):
-    """List inbox integrations, optionally filtered by workspace."""
-    if workspace_id:
-        integrations = await InboxIntegration.find(
-            InboxIntegration.workspace_id == workspace_id
-        ).to_list()
-    else:
-        integrations = await InboxIntegration.find_all().to_list()
-    return integrations
+async def list_inbox_integrations(
+    response: Response, workspace_id: str = None, page: PageParams = Depends()
+):
+    """List inbox integrations, optionally filtered by workspace (keyset paginated)."""
+    filters = {"workspace_id": workspace_id} if workspace_id else {}
+    return await fetch_page(InboxIntegration, filters, page, response, InboxIntegrationResponse)
 
 
 # ============================================================================
@@ -211,13 +210,10 @@ async def create_otp_rule(rule_in: OtpRuleCreate):
 
 
 @app.get("/otp_rules", response_model=List[OtpRuleResponse])
-async def list_otp_rules(workspace_id: str = None):
-    """List OTP rules, optionally filtered by workspace."""
-    if workspace_id:
-        rules = await OtpRule.find(OtpRule.workspace_id == workspace_id).to_list()
-    else:
-        rules = await OtpRule.find_all().to_list()
-    return rules
+async def list_otp_rules(response: Response, workspace_id: str = None, page: PageParams = Depends()):
+    """List OTP rules, optionally filtered by workspace (keyset paginated)."""
+    filters = {"workspace_id": workspace_id} if workspace_id else {}
+    return await fetch_page(OtpRule, filters, page, response, OtpRuleResponse)
 
 
 # ============================================================================
@@ -255,13 +251,10 @@ async def create_job(job_in: JobCreate):
 
 
 @app.get("/jobs", response_model=List[JobResponse])
-async def list_jobs(workspace_id: str = None):
-    """List jobs, optionally filtered by workspace."""
-    if workspace_id:
-        jobs = await Job.find(Job.workspace_id == workspace_id).to_list()
-    else:
-        jobs = await Job.find_all().to_list()
-    return jobs
+async def list_jobs(response: Response, workspace_id: str = None, page: PageParams = Depends()):
+    """List jobs, optionally filtered by workspace (keyset paginated)."""
+    filters = {"workspace_id": workspace_id} if workspace_id else {}
+    return await fetch_page(Job, filters, page, response, JobResponse)
 
 
 @app.get("/jobs/{job_id}", response_model=JobResponse)
@@ -281,6 +274,7 @@ async def delete_job(job_id: str):
         raise HTTPException(status_code=404, detail="Job not found")
     
     await job.delete()
+    forget_job(job_id)
     return {"message": f"Job {job_id} deleted successfully"}
 
 
@@ -316,6 +310,7 @@ async def trigger_run(job_id: str):
     # 2. Create run document
     run = Run(job_id=job.id, job_name=job.name, connector=job.connector, status="queued")
     await run.save()
+    await repo.record_run_created(run)
     
     # Merge job configuration into params
     execution_params = job.params.copy()
@@ -335,12 +330,13 @@ async def trigger_run(job_id: str):
         run_id=str(run.id),  # Convert to string
         workspace_id=job.workspace_id,
         connector_name=job.connector,
-        params=execution_params
+        params=execution_params,
+        priority=selenium_slots.PRIORITY_MANUAL,
     )
     
     # 4. Save task ID for cancellation support
-    run.celery_task_id = task.id
-    await run.save()
+    # Atomic $set: the worker may already be updating status/log_seq on this run
+    await run.update({"$set": {"celery_task_id": task.id}})
     
     return run
 
@@ -360,18 +356,20 @@ async def retry_run(job_id: str, run_id: str):
     if not run or run.job_id != job.id:
         raise HTTPException(status_code=404, detail="Run not found for this job")
     
-    # Increment attempt and reset status
-    run.attempt += 1
-    run.status = "queued"
-    run.error_summary = None
-    run.started_at = None
-    run.finished_at = None
     # Ensure connector is set (for old runs that didn't have it)
+    backfill = {}
     if not run.connector and job:
-        run.connector = job.connector
+        backfill["connector"] = job.connector
     if not run.job_name and job:
-        run.job_name = job.name
-    await run.save()
+        backfill["job_name"] = job.name
+    update = {"$inc": {"attempt": 1}}
+    if backfill:
+        update["$set"] = backfill
+    await run.update(update)
+
+    # Reset status and timings; moves the run between run_stats buckets
+    await repo.save_run_status(run.id, "queued")
+    run = await Run.get(run_id)
     
     # Merge job configuration into params
     execution_params = job.params.copy()
@@ -391,12 +389,12 @@ async def retry_run(job_id: str, run_id: str):
         run_id=run.id,
         workspace_id=job.workspace_id,
         connector_name=job.connector,
-        params=execution_params
+        params=execution_params,
+        priority=selenium_slots.PRIORITY_RETRY,
     )
     
     # Save new task ID
-    run.celery_task_id = task.id
-    await run.save()
+    await run.update({"$set": {"celery_task_id": task.id}})
     
     return run
 
@@ -416,13 +414,16 @@ async def stop_run(run_id: str):
     # Revoke the Celery task if we have a task ID
     if run.celery_task_id:
         celery_app.control.revoke(run.celery_task_id, terminate=True)
+
+    # Threads-pool workers ignore terminate; cancel the run's asyncio task instead.
+    try:
+        await publish_run_cancel(run_id)
+    except Exception as e:
+        print(f"⚠️ Failed to publish cancel for run {run_id}: {e}")
     
-    # Update run status
-    run.status = "failed"
-    run.error_summary = "Cancelled by user"
-    run.logs.append(f"[{get_now().time()}] 🛑 Run cancelled by user")
-    run.finished_at = get_now()
-    await run.save()
+    # Update run status (atomic $set, run_stats and dashboard cache included)
+    await repo.save_run_status(run_id, "failed", "Cancelled by user")
+    await write_run_logs(run_id, [format_log_line("🛑 Run cancelled by user")])
     
     return {"message": f"Run {run_id} stopped successfully", "run_id": run_id}
 
@@ -432,17 +433,19 @@ async def stop_run(run_id: str):
 # ============================================================================
 
 @app.get("/runs", response_model=List[RunResponse])
-async def list_runs(job_id: str = None, status: str = None):
-    """List runs, optionally filtered by job_id and/or status."""
-    query = Run.find()
-    
+async def list_runs(
+    response: Response, job_id: str = None, status: str = None, page: PageParams = Depends()
+):
+    """
+    List runs, optionally filtered by job_id and/or status.
+    Newest first, keyset paginated (see X-Next-Cursor); files are not loaded.
+    """
+    filters = {}
     if job_id:
-        query = query.find(Run.job_id == job_id)
+        filters["job_id"] = job_id
     if status:
-        query = query.find(Run.status == status)
-    
-    runs = await query.sort(-Run.created_at).to_list()
-    return runs
+        filters["status"] = status
+    return await fetch_page(Run, filters, page, response, RunResponse)
 
 
 @app.get("/runs/{run_id}", response_model=RunResponse)
@@ -454,6 +457,31 @@ async def get_run(run_id: str):
     return run
 
 
+@app.get("/runs/{run_id}/logs", response_model=RunLogPage)
+async def get_run_logs(
+    run_id: str,
+    after: int = Query(0, ge=0, description="Return lines with seq greater than this"),
+    limit: int = Query(500, ge=1, le=MAX_RUN_LOG_PAGE),
+):
+    """
+    Page through a run's log lines in order.
+    Tail a live run by passing the last seen seq as `after`.
+    """
+    if not await Run.find(Run.id == run_id).count():
+        raise HTTPException(status_code=404, detail="Run not found")
+
+    lines = await RunLog.find(
+        RunLog.run_id == run_id,
+        RunLog.seq > after,
+    ).sort(+RunLog.seq).limit(limit).to_list()
+
+    return RunLogPage(
+        run_id=run_id,
+        items=lines,
+        next_after=lines[-1].seq if lines else after,
+    )
+
+
 
 # ============================================================================
 # Dashboard Endpoints
@@ -463,53 +491,41 @@ async def get_run(run_id: str):
 async def get_dashboard_stats():
     """
     Get dashboard statistics from real database.
+    Served from a short-lived Redis cache; see core.services.dashboard_stats.
     """
-    from datetime import datetime, timedelta
-    
-    # Count runs by status
-    total_runs = await Run.count()
-    successful_runs = await Run.find(Run.status == "success").count()
-    failed_runs = await Run.find(Run.status == "failed").count()
-    running_runs = await Run.find(Run.status == "running").count()
-    queued_runs = await Run.find(Run.status == "queued").count()
-    
-    # Active includes running and queued
-    active_total = running_runs + queued_runs
-    
-    # Count active jobs
-    active_jobs = await Job.find(Job.status == "active").count()
-    
-    # Calculate trend (last 7 days vs previous 7 days)
-    now = get_now()
-    week_ago = now - timedelta(days=7)
-    two_weeks_ago = now - timedelta(days=14)
-    
-    recent_success = await Run.find(
-        Run.status == "success",
-        Run.created_at >= week_ago
-    ).count()
-    
-    previous_success = await Run.find(
-        Run.status == "success",
-        Run.created_at >= two_weeks_ago,
-        Run.created_at < week_ago
-    ).count()
-    
-    success_trend = 0
-    if previous_success > 0:
-        success_trend = round(((recent_success - previous_success) / previous_success) * 100, 1)
-    
-    return {
-        "successful_runs": successful_runs,
-        "failed_runs": failed_runs,
-        "running_runs": running_runs,
-        "queued_runs": queued_runs,
-        "active_workers": active_total,
-        "browser_sessions": running_runs,  # Only running jobs use browser
-        "success_trend": success_trend,
-        "total_runs": total_runs,
-        "active_jobs": active_jobs
-    }
+    return await dashboard_stats.get_dashboard_stats()
+
+
+@app.get("/dashboard/run-stats")
+async def get_run_stats(
+    days: int = Query(30, ge=1, le=366),
+    connector: str = None,
+    workspace_id: str = None,
+    status: str = None,
+):
+    """
+    Daily run counts and average durations per connector/workspace/status.
+    Read from the precomputed run_stats buckets; see core.services.run_stats.
+    """
+    since_day = run_stats.stats_day(get_now() - timedelta(days=days - 1))
+    buckets = await run_stats.read_daily_buckets(
+        since_day, status=status, connector=connector, workspace_id=workspace_id
+    )
+    return [
+        {
+            "day": bucket.day,
+            "connector": bucket.connector,
+            "workspace_id": bucket.workspace_id,
+            "status": bucket.status,
+            "count": bucket.count,
+            "avg_duration_seconds": (
+                round(bucket.duration_ms_sum / bucket.duration_count / 1000, 1)
+                if bucket.duration_count else None
+            ),
+        }
+        for bucket in buckets
+        if bucket.count > 0
+    ]
 
 
 @app.get("/dashboard/recent-runs")
@@ -518,24 +534,25 @@ async def get_recent_runs(limit: int = 10):
     Get recent runs with job details for dashboard table.
     """
     runs = await Run.find().sort(-Run.created_at).limit(limit).to_list()
+
+    # Older runs lack connector/job_name: resolve their jobs in one batch
+    jobs = {}
+    missing_job_ids = [
+        run.job_id for run in runs
+        if (not run.connector or not run.job_name) and run.job_id and run.job_id != "test-job"
+    ]
+    if missing_job_ids:
+        try:
+            jobs = await resolve_job_info(missing_job_ids)
+        except Exception as e:
+            print(f"⚠️ Failed to fetch jobs for recent runs: {e}")
     
     result = []
     for run in runs:
-        # Use connector and job name from run if available, otherwise fetch from job
-        connector_name = run.connector if run.connector else "Unknown"
-        job_name = run.job_name if run.job_name else None
-        
-        # If connector not in run, try to fetch from job (for backwards compatibility)
-        if (not run.connector or not job_name) and run.job_id and run.job_id != "test-job":
-            try:
-                job = await Job.get(run.job_id)
-                if job:
-                    if not run.connector:
-                        connector_name = job.connector
-                    if not job_name:
-                        job_name = job.name
-            except Exception as e:
-                logger.warning(f"Failed to fetch job {run.job_id}: {e}")
+        # Use connector and job name from run if available, otherwise from its job
+        job = jobs.get(run.job_id)
+        connector_name = run.connector or (job.connector if job else None) or "Unknown"
+        job_name = run.job_name or (job.name if job else None)
         
         # Convert created_at to local timezone for display
         created_at_str = None
@@ -560,6 +577,8 @@ async def get_recent_runs(limit: int = 10):
             "job_name": job_name or connector_name,
             "connector": connector_name,
             "status": run.status,
+            "queue_position": run.queue_position,
+            "queue_eta_seconds": run.queue_eta_seconds,
             "report_date": run.report_date,
             "history_date": run.history_date,
             "node": "selenium-node-1",  # TODO: Add node tracking
@@ -579,6 +598,22 @@ async def health_check():
     return {"status": "healthy", "service": "app-console"}
 
 
+@app.get("/health/ws")
+async def websocket_health():
+    """
+    WebSocket metrics across all console processes (uvicorn workers/replicas).
+    Each process reports its counters to Redis every few seconds.
+    """
+    workers = await collect_worker_stats()
+    return {
+        "status": "healthy",
+        "worker_id": WORKER_ID,
+        "local": manager.stats(),
+        "workers": workers,
+        "total_connections": sum(w.get("connections", 0) for w in workers),
+    }
+
+
 # ============================================================================
 # Test Endpoints
 # ============================================================================
@@ -591,8 +626,10 @@ async def trigger_jpmorgan_test(user: str = "demo_user", password: str = "demo_p
     from core.tasks import login_to_jpmorgan_task
     
     # Create a placeholder run
-    run = Run(job_id="test-job", status="queued", logs=["[System] Manual test triggered"])
+    run = Run(job_id="test-job", status="queued")
     await run.save()
+    await repo.record_run_created(run)
+    await write_run_logs(run.id, ["[System] Manual test triggered"])
     
     task = login_to_jpmorgan_task.delay(user, password, str(run.id))
     
@@ -605,13 +642,65 @@ async def trigger_jpmorgan_test(user: str = "demo_user", password: str = "demo_p
 
 @app.websocket("/ws/runs")
 async def websocket_runs_endpoint(websocket: WebSocket):
+    """
+    Run status updates for every client, plus opt-in live logs.
+
+    Client messages (JSON):
+      {"action": "watch", "workspace_ids": [...], "job_ids": [...], "run_ids": [...]}
+          limit status updates to matching runs (no filters = every run)
+      {"action": "subscribe", "run_id": "...", "after": <seq>}  stream lines with seq > after
+          (the replay holds at most the newest MAX_RUN_LOG_PAGE of them: when its
+          first seq is past after + 1, page the gap via GET /runs/{run_id}/logs)
+      {"action": "unsubscribe", "run_id": "..."}
+    Log lines arrive as {"type": "log", "run_id": "...", "lines": [{seq, message, created_at}]}.
+    Reconnecting clients resume by subscribing with the last seq they received.
+    """
     await manager.connect(websocket)
     try:
         while True:
-            # Keep connection alive
-            # We don't expect messages from client, but we need to await something
-            # to keep the connection open and detect disconnects
-            await websocket.receive_text()
+            raw = await websocket.receive_text()
+            try:
+                command = json.loads(raw)
+            except json.JSONDecodeError:
+                continue
+            if not isinstance(command, dict):
+                continue
+
+            action = command.get("action")
+            if action == "watch":
+                manager.watch(
+                    websocket,
+                    workspace_ids=command.get("workspace_ids") or [],
+                    job_ids=command.get("job_ids") or [],
+                    run_ids=command.get("run_ids") or [],
+                )
+                continue
+            if not command.get("run_id"):
+                continue
+
+            run_id = str(command["run_id"])
+            if action == "subscribe":
+                try:
+                    after = max(0, int(command.get("after") or 0))
+                except (TypeError, ValueError):
+                    after = 0
+                # Register first so lines published during the replay are held, not lost
+                manager.subscribe(websocket, run_id, after)
+                history = await RunLog.find(
+                    RunLog.run_id == run_id,
+                    RunLog.seq > after,
+                ).sort(-RunLog.seq).limit(MAX_RUN_LOG_PAGE).to_list()
+                history.reverse()
+                await manager.catch_up(
+                    websocket,
+                    run_id,
+                    [
+                        {"seq": line.seq, "message": line.message, "created_at": line.created_at.isoformat()}
+                        for line in history
+                    ],
+                )
+            elif action == "unsubscribe":
+                manager.unsubscribe(websocket, run_id)
     except WebSocketDisconnect:
         manager.disconnect(websocket)
     except Exception:
@@ -0,0 +1,108 @@
+"""
+Keyset pagination for console listings.
+
+Pages are ordered newest first on (created_at, _id) and continue from an
+opaque cursor, so every page costs one indexed range scan no matter how deep
+the client pages. Bodies stay plain JSON lists (what the web console already
+consumes); the cursor of the next page, if any, is returned in the
+X-Next-Cursor response header.
+
+Only the fields of the response model are fetched from Mongo, so heavy fields
+(run files, secrets, scripts) never leave the database for a listing.
+"""
+
+import base64
+import json
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple, Type
+
+from beanie import Document
+from fastapi import HTTPException, Query, Response
+from pydantic import BaseModel
+
+DEFAULT_PAGE_SIZE = 100
+MAX_PAGE_SIZE = 500
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+
+class PageParams:
+    """`limit`/`cursor` query parameters, used as a FastAPI dependency."""
+
+    def __init__(
+        self,
+        limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+        cursor: Optional[str] = Query(None, description=f"Value of a previous {NEXT_CURSOR_HEADER} header"),
+    ):
+        self.limit = limit
+        self.cursor = cursor
+
+
+def encode_cursor(created_at: datetime, doc_id: str) -> str:
+    raw = json.dumps([created_at.isoformat(), doc_id]).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime, str]:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        created_at, doc_id = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+        return datetime.fromisoformat(created_at), str(doc_id)
+    except (ValueError, TypeError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
+def projection_for(model: Type[BaseModel]) -> Dict[str, int]:
+    """Mongo projection with the fields of a response model (plus the sort key)."""
+    projection = {"_id": 1, "created_at": 1}
+    for name in model.model_fields:
+        if name != "id":
+            projection[name] = 1
+    return projection
+
+
+async def fetch_page(
+    document: Type[Document],
+    filters: Dict[str, Any],
+    page: PageParams,
+    response: Response,
+    model: Type[BaseModel],
+) -> List[Dict[str, Any]]:
+    """
+    Return one page of raw documents (with `id` instead of `_id`), newest
+    first, projected on `model`; sets X-Next-Cursor when more remain.
+    """
+    query = dict(filters)
+    if page.cursor:
+        created_at, doc_id = decode_cursor(page.cursor)
+        query = {
+            "$and": [
+                filters,
+                {
+                    "$or": [
+                        {"created_at": {"$lt": created_at}},
+                        {"created_at": created_at, "_id": {"$lt": doc_id}},
+                    ]
+                },
+            ]
+        }
+
+    docs = await (
+        document.get_motor_collection()
+        .find(query, projection=projection_for(model))
+        .sort([("created_at", -1), ("_id", -1)])
+        .limit(page.limit + 1)
+        .to_list(length=page.limit + 1)
+    )
+
+    if len(docs) > page.limit:
+        docs = docs[:page.limit]
+        last = docs[-1]
+        response.headers[NEXT_CURSOR_HEADER] = encode_cursor(last["created_at"], last["_id"])
+
+    # Documents written before a field existed lack it; Beanie would have filled None
+    required = [name for name, field in model.model_fields.items() if field.is_required()]
+    for doc in docs:
+        doc["id"] = doc.pop("_id")
+        for name in required:
+            doc.setdefault(name, None)
+    return docs
@@ -0,0 +1,132 @@
+"""
+Redis-backed realtime relay for the console.
+
+Every console process (uvicorn worker or replica) keeps its own WebSocket
+connections and subscribes to the shared Redis channels, so each client gets
+each message exactly once from the process it is connected to. No WebSocket
+state has to be shared; what is shared is:
+
+- the pub/sub channels (`run_updates`, `run_logs`), consumed by every process;
+- a registry of per-process connection counters (`console:ws:<worker_id>`
+  keys with a TTL) that backs the /health/ws endpoint.
+"""
+
+import asyncio
+import json
+import logging
+import os
+import socket
+
+from core.db import get_redis
+from core.services.run_log_buffer import RUN_LOGS_CHANNEL
+from core.utils.date_utils import get_now
+from app.console.websockets import ConnectionManager
+
+logger = logging.getLogger(__name__)
+
+RUN_UPDATES_CHANNEL = "run_updates"
+WORKER_STATS_PREFIX = "console:ws:"
+WORKER_STATS_INTERVAL = 10
+WORKER_STATS_TTL = 30
+
+WORKER_ID = f"{socket.gethostname()}:{os.getpid()}"
+
+
+async def redis_listener(manager: ConnectionManager):
+    """
+    Relay Redis messages to this process' WebSockets, reconnecting on errors.
+    Status updates are broadcast; log lines only go to subscribed connections.
+    """
+    backoff = 1
+    connected_before = False
+    while True:
+        pubsub = get_redis().pubsub()
+        try:
+            await pubsub.subscribe(RUN_UPDATES_CHANNEL, RUN_LOGS_CHANNEL)
+            backoff = 1
+            if connected_before:
+                # Messages published while we were away are lost; let clients
+                # re-subscribe (log resume by seq) and refresh their views.
+                await manager.broadcast({"type": "resync"})
+            connected_before = True
+
+            async for message in pubsub.listen():
+                if message["type"] != "message":
+                    continue
+                data = message["data"]
+                if isinstance(data, bytes):
+                    data = data.decode("utf-8")
+                channel = message.get("channel")
+                if isinstance(channel, bytes):
+                    channel = channel.decode("utf-8")
+
+                try:
+                    payload = json.loads(data)
+                except json.JSONDecodeError:
+                    logger.warning(f"Failed to decode Redis message: {data}")
+                    continue
+                # Forward the published text as-is; fan-out does not re-encode
+                if channel == RUN_LOGS_CHANNEL:
+                    await manager.send_run_logs(payload, text=data)
+                else:
+                    await manager.broadcast(payload, text=data)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.error(f"Redis listener error, reconnecting in {backoff}s: {e}")
+            await asyncio.sleep(backoff)
+            backoff = min(backoff * 2, 30)
+        finally:
+            try:
+                await pubsub.close()
+            except Exception:
+                pass
+
+
+async def report_worker_stats(manager: ConnectionManager):
+    """Publish this process' connection counters to the shared registry."""
+    started_at = get_now().isoformat()
+    while True:
+        try:
+            stats = {
+                "worker_id": WORKER_ID,
+                "started_at": started_at,
+                "reported_at": get_now().isoformat(),
+                **manager.stats(),
+            }
+            await get_redis().set(
+                f"{WORKER_STATS_PREFIX}{WORKER_ID}",
+                json.dumps(stats),
+                ex=WORKER_STATS_TTL,
+            )
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.warning(f"Failed to report WebSocket stats: {e}")
+        await asyncio.sleep(WORKER_STATS_INTERVAL)
+
+
+async def remove_worker_stats():
+    """Drop this process from the registry on shutdown."""
+    try:
+        await get_redis().delete(f"{WORKER_STATS_PREFIX}{WORKER_ID}")
+    except Exception as e:
+        logger.warning(f"Failed to remove WebSocket stats: {e}")
+
+
+async def collect_worker_stats() -> list[dict]:
+    """Counters of every live console process (expired entries drop out)."""
+    redis_client = get_redis()
+    keys = [key async for key in redis_client.scan_iter(match=f"{WORKER_STATS_PREFIX}*", count=100)]
+    if not keys:
+        return []
+    values = await redis_client.mget(keys)
+    workers = []
+    for value in values:
+        if not value:
+            continue
+        try:
+            workers.append(json.loads(value))
+        except (TypeError, ValueError):
+            continue
+    return sorted(workers, key=lambda w: w.get("worker_id", ""))
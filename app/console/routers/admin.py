@@ -0,0 +1,34 @@
+"""
+Admin Router - Operational views for administrators.
+"""
+
+from fastapi import APIRouter, Depends, HTTPException
+
+from app.console.routers.auth import get_current_user
+from core.models.mongo_models import User
+from core.worker import selenium_slots
+
+router = APIRouter(prefix="/admin", tags=["admin"])
+
+
+def require_admin(current_user: User = Depends(get_current_user)) -> User:
+    if current_user.role != "admin":
+        raise HTTPException(status_code=403, detail="Admin privileges required")
+    return current_user
+
+
+@router.get("/selenium-slots")
+async def list_selenium_slots(_: User = Depends(require_admin)):
+    """
+    Selenium slot leases: which run (and worker) holds each slot, for how
+    long, and when the lease expires unless renewed by the run heartbeat;
+    plus the runs waiting for a slot in queue order (with priority and caps).
+    """
+    slots = await selenium_slots.list_slots()
+    return {
+        "max_slots": selenium_slots.SELENIUM_MAX_SLOTS,
+        "lease_seconds": selenium_slots.lease_seconds(),
+        "leased": sum(1 for slot in slots if slot["state"] == "leased"),
+        "slots": slots,
+        "waiting": await selenium_slots.list_waiters(),
+    }
@@ -2,10 +2,11 @@
 Credentials Router - API endpoints for managing secure credentials.
 """
 
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Response
 from typing import List, Optional
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 
+from app.console.pagination import PageParams, fetch_page
 from core.models.mongo_models import Credential
 from core.security import encrypt_value, decrypt_value
 
@@ -21,6 +22,7 @@ class CredentialCreate(BaseModel):
     metadata: dict = {}
     carteira: Optional[str] = None
     enable_processing: bool = False
+    session_limit: Optional[int] = Field(None, ge=1)
 
 
 class CredentialUpdate(BaseModel):
@@ -30,6 +32,7 @@ class CredentialUpdate(BaseModel):
     metadata: Optional[dict] = None
     carteira: Optional[str] = None
     enable_processing: Optional[bool] = None
+    session_limit: Optional[int] = Field(None, ge=1)  # send null to remove the cap
 
 
 class CredentialResponse(BaseModel):
@@ -40,6 +43,7 @@ class CredentialResponse(BaseModel):
     metadata: dict
     carteira: Optional[str] = None
     enable_processing: bool = False
+    session_limit: Optional[int] = None
     created_at: str
     updated_at: str
 
@@ -61,6 +65,7 @@ async def create_credential(cred_in: CredentialCreate):
         metadata=cred_in.metadata,
         carteira=cred_in.carteira,
         enable_processing=cred_in.enable_processing,
+        session_limit=cred_in.session_limit,
     )
     await credential.save()
     
@@ -72,32 +77,34 @@ async def create_credential(cred_in: CredentialCreate):
         metadata=credential.metadata,
         carteira=credential.carteira,
         enable_processing=credential.enable_processing,
+        session_limit=credential.session_limit,
         created_at=credential.created_at.isoformat(),
         updated_at=credential.updated_at.isoformat()
     )
 
 
 @router.get("", response_model=List[CredentialResponse])
-async def list_credentials(workspace_id: Optional[str] = None):
-    """List all credentials, optionally filtered by workspace."""
-    if workspace_id:
-        credentials = await Credential.find(
-            Credential.workspace_id == workspace_id
-        ).to_list()
-    else:
-        credentials = await Credential.find_all().to_list()
+async def list_credentials(
+    response: Response,
+    workspace_id: Optional[str] = None,
+    page: PageParams = Depends(),
+):
+    """List credentials, optionally filtered by workspace (keyset paginated)."""
+    filters = {"workspace_id": workspace_id} if workspace_id else {}
+    credentials = await fetch_page(Credential, filters, page, response, CredentialResponse)
     
     return [
         CredentialResponse(
-            id=str(cred.id),
-            workspace_id=cred.workspace_id,
-            label=cred.label,
-            username=cred.username,
-            metadata=cred.metadata,
-            carteira=cred.carteira,
-            enable_processing=cred.enable_processing,
-            created_at=cred.created_at.isoformat(),
-            updated_at=cred.updated_at.isoformat()
+            id=str(cred["id"]),
+            workspace_id=cred["workspace_id"],
+            label=cred["label"],
+            username=cred["username"],
+            metadata=cred.get("metadata") or {},
+            carteira=cred.get("carteira"),
+            enable_processing=cred.get("enable_processing", False),
+            session_limit=cred.get("session_limit"),
+            created_at=cred["created_at"].isoformat(),
+            updated_at=cred["updated_at"].isoformat()
         )
         for cred in credentials
     ]
@@ -118,6 +125,7 @@ async def get_credential(credential_id: str):
         metadata=credential.metadata,
         carteira=credential.carteira,
         enable_processing=credential.enable_processing,
+        session_limit=credential.session_limit,
         created_at=credential.created_at.isoformat(),
         updated_at=credential.updated_at.isoformat()
     )
@@ -145,6 +153,8 @@ async def update_credential(credential_id: str, cred_update: CredentialUpdate):
         credential.carteira = cred_update.carteira
     if cred_update.enable_processing is not None:
         credential.enable_processing = cred_update.enable_processing
+    if "session_limit" in cred_update.model_fields_set:
+        credential.session_limit = cred_update.session_limit
     
     credential.updated_at = datetime.utcnow()
     await credential.save()
@@ -157,6 +167,7 @@ async def update_credential(credential_id: str, cred_update: CredentialUpdate):
         metadata=credential.metadata,
         carteira=credential.carteira,
         enable_processing=credential.enable_processing,
+        session_limit=credential.session_limit,
         created_at=credential.created_at.isoformat(),
         updated_at=credential.updated_at.isoformat()
     )
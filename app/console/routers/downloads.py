@@ -2,21 +2,34 @@
 Downloads API router - Provides endpoints for listing and downloading processed files.
 """
 
-from fastapi import APIRouter, HTTPException
-from fastapi.responses import FileResponse
+from fastapi import APIRouter, HTTPException, Query, Request
+from fastapi.responses import Response, StreamingResponse
 from pydantic import BaseModel
 from pathlib import Path
 from datetime import datetime, timezone
-from typing import Any, Dict, List, Optional
+from email.utils import format_datetime, parsedate_to_datetime
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+from urllib.parse import quote
 import logging
 import os
+import re
+import zipfile
 
-from core.models.mongo_models import Job, Run
+from core.config import settings
+from core.models.mongo_models import RUNS_WITH_FILES, Run
+from core.services.artifact_retention import open_artifact
+from core.services.job_lookup import resolve_job_info
 
 logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/downloads", tags=["downloads"])
 
+CHUNK_SIZE = 256 * 1024
+ARCHIVE_MAX_RUNS = 500
+# Already compressed: deflating them again costs CPU for nothing
+STORED_SUFFIXES = {".xlsx", ".xls", ".zip", ".gz", ".pdf", ".png", ".jpg", ".jpeg"}
+_RANGE_RE = re.compile(r"^bytes=(\d*)-(\d*)$")
+
 
 class FileMetadata(BaseModel):
     """File metadata response model."""
@@ -25,6 +38,8 @@ class FileMetadata(BaseModel):
     filename: str
     path: str
     size_bytes: Optional[int]
+    sha256: Optional[str] = None
+    compression: Optional[str] = None
     status: str
 
 
@@ -64,6 +79,184 @@ def _resolve_artifact_path(relative_path: str) -> Path:
     return candidate
 
 
+def _etag(selected: Dict[str, Any], stat: os.stat_result) -> str:
+    """Content digest when recorded, else size + mtime (like nginx)."""
+    if selected.get("sha256"):
+        return f'"{selected["sha256"]}"'
+    return f'"{stat.st_size:x}-{stat.st_mtime_ns:x}"'
+
+
+def _content_disposition(filename: str) -> str:
+    quoted = quote(filename)
+    if quoted != filename:
+        return f"attachment; filename*=utf-8''{quoted}"
+    return f'attachment; filename="{filename}"'
+
+
+def _not_modified(request: Request, etag: str, mtime: float) -> bool:
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        tags = [tag.strip().removeprefix("W/") for tag in if_none_match.split(",")]
+        return "*" in tags or etag in tags
+    if_modified_since = request.headers.get("if-modified-since")
+    if if_modified_since:
+        try:
+            return int(mtime) <= parsedate_to_datetime(if_modified_since).timestamp()
+        except (TypeError, ValueError):
+            return False
+    return False
+
+
+def _requested_range(request: Request, etag: str, last_modified: str, size: int) -> Optional[Tuple[int, int]]:
+    """
+    Single byte range (start, end inclusive) asked for, or None for the whole
+    file. Raises 416 when it cannot be satisfied.
+    """
+    header = request.headers.get("range")
+    if not header:
+        return None
+    if_range = request.headers.get("if-range")
+    if if_range and if_range.strip() not in (etag, last_modified):
+        return None  # File changed since the partial download started: send it whole
+    match = _RANGE_RE.match(header.strip())
+    if not match:
+        return None  # Multiple or unknown ranges: the whole file is a valid answer
+    first, last = match.groups()
+    if first:
+        start = int(first)
+        end = min(int(last), size - 1) if last else size - 1
+    elif last:
+        start, end = max(0, size - int(last)), size - 1
+    else:
+        return None
+    if start >= size or start > end:
+        raise HTTPException(
+            status_code=416,
+            detail="Requested range not satisfiable",
+            headers={"Content-Range": f"bytes */{size}"},
+        )
+    return start, end
+
+
+def _read_file(path: Path, start: int, length: int) -> Iterator[bytes]:
+    with open(path, "rb") as fh:
+        fh.seek(start)
+        while length > 0:
+            chunk = fh.read(min(CHUNK_SIZE, length))
+            if not chunk:
+                break
+            length -= len(chunk)
+            yield chunk
+
+
+def _read_compressed(path: Path, compression: str) -> Iterator[bytes]:
+    with open_artifact(path, compression) as fh:
+        for chunk in iter(lambda: fh.read(CHUNK_SIZE), b""):
+            yield chunk
+
+
+def _file_response(request: Request, file_path: Path, selected: Dict[str, Any]) -> Response:
+    """
+    Serve an artifact with ETag / Last-Modified, conditional GET and single
+    byte ranges. With DOWNLOADS_ACCEL_REDIRECT_PREFIX set, nginx sends the
+    bytes (ranges included) from its internal location instead. Files
+    compressed by the retention pass are decompressed while streaming
+    (whole file only: gzip has no random access).
+    """
+    stat = file_path.stat()
+    etag = _etag(selected, stat)
+    last_modified = format_datetime(datetime.fromtimestamp(stat.st_mtime, timezone.utc), usegmt=True)
+    headers = {
+        "ETag": etag,
+        "Last-Modified": last_modified,
+        "Accept-Ranges": "bytes",
+        "Content-Disposition": _content_disposition(selected["filename"]),
+    }
+    if _not_modified(request, etag, stat.st_mtime):
+        return Response(status_code=304, headers=headers)
+
+    compression = selected.get("compression")
+    if compression:
+        headers["Accept-Ranges"] = "none"
+        return StreamingResponse(
+            _read_compressed(file_path, compression),
+            headers=headers,
+            media_type="application/octet-stream",
+        )
+
+    if settings.DOWNLOADS_ACCEL_REDIRECT_PREFIX:
+        relative = file_path.relative_to(_artifacts_dir().resolve()).as_posix()
+        headers["X-Accel-Redirect"] = settings.DOWNLOADS_ACCEL_REDIRECT_PREFIX.rstrip("/") + "/" + quote(relative)
+        return Response(headers=headers, media_type="application/octet-stream")
+
+    byte_range = _requested_range(request, etag, last_modified, stat.st_size)
+    if byte_range is None:
+        start, end, status_code = 0, stat.st_size - 1, 200
+    else:
+        start, end = byte_range
+        status_code = 206
+        headers["Content-Range"] = f"bytes {start}-{end}/{stat.st_size}"
+    headers["Content-Length"] = str(end - start + 1)
+    return StreamingResponse(
+        _read_file(file_path, start, end - start + 1),
+        status_code=status_code,
+        headers=headers,
+        media_type="application/octet-stream",
+    )
+
+
+class _ZipStream:
+    """Write-only sink for zipfile: buffers what it writes until drained."""
+
+    def __init__(self):
+        self._chunks: List[bytes] = []
+
+    def write(self, data: bytes) -> int:
+        self._chunks.append(bytes(data))
+        return len(data)
+
+    def flush(self) -> None:
+        pass
+
+    def drain(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks.clear()
+        return data
+
+
+def _zip_entries(entries: List[Tuple[Path, str, Optional[str]]]) -> Iterator[bytes]:
+    """
+    Build the archive while sending it (data descriptors, no temp file).
+    Files that cannot be opened are left out; a read failing mid-member
+    aborts the stream, so the client gets a visibly broken archive instead
+    of one holding a truncated file.
+    """
+    sink = _ZipStream()
+    with zipfile.ZipFile(sink, mode="w", allowZip64=True) as archive:
+        for file_path, arcname, compression in entries:
+            try:
+                stat = file_path.stat()
+                source = open_artifact(file_path, compression)
+            except OSError as e:
+                logger.warning(f"Skipping {arcname} in archive: {e}")
+                continue
+            info = zipfile.ZipInfo(arcname, datetime.fromtimestamp(stat.st_mtime).timetuple()[:6])
+            info.compress_type = (
+                zipfile.ZIP_STORED if Path(arcname).suffix.lower() in STORED_SUFFIXES else zipfile.ZIP_DEFLATED
+            )
+            with source:
+                try:
+                    with archive.open(info, "w", force_zip64=True) as target:
+                        for chunk in iter(lambda: source.read(CHUNK_SIZE), b""):
+                            target.write(chunk)
+                            yield sink.drain()
+                except (OSError, EOFError) as e:
+                    logger.error(f"Aborting archive: reading {arcname} failed mid-stream: {e}")
+                    raise
+            yield sink.drain()
+    yield sink.drain()
+
+
 def _to_iso8601_utc(value: datetime) -> str:
     """
     Return a timezone-aware ISO-8601 UTC string.
@@ -93,24 +286,22 @@ async def list_downloads(
     - skip: Number of results to skip for pagination
     """
     try:
-        query = {}
+        query = dict(RUNS_WITH_FILES)
         if status:
             query["status"] = status
         if connector:
             query["connector"] = connector
 
-        query["files"] = {"$exists": True, "$ne": []}
-
         runs = await Run.find(query).sort("-created_at").skip(skip).limit(limit).to_list()
 
+        # One batched lookup for runs created before job_name was stored
+        jobs = await resolve_job_info(run.job_id for run in runs if not run.job_name and run.job_id)
+
         items = []
         for run in runs:
             normalized_files = [_file_meta_to_dict(f) for f in (run.files or [])]
-            job_name = run.job_name
-            if not job_name and run.job_id:
-                job = await Job.get(run.job_id)
-                if job:
-                    job_name = job.name
+            job = jobs.get(run.job_id)
+            job_name = run.job_name or (job.name if job else None)
             items.append(
                 DownloadItem(
                     run_id=run.id,
@@ -130,10 +321,81 @@ async def list_downloads(
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@router.get("/archive")
+async def download_archive(
+    run_ids: Optional[List[str]] = Query(None),
+    file_type: Optional[str] = None,
+    status: Optional[str] = None,
+    connector: Optional[str] = None,
+    created_from: Optional[datetime] = None,
+    created_to: Optional[datetime] = None,
+):
+    """
+    Download the files of many runs as one ZIP, built while it streams.
+
+    Query Parameters:
+    - run_ids: Runs to include (repeat the parameter); otherwise the filters select them
+    - file_type: Only original or processed files
+    - status / connector: Same filters as the listing
+    - created_from / created_to: Run creation window (ISO-8601)
+
+    Entries are named {run_id}/{file_type}/{filename}.
+    """
+    try:
+        query = dict(RUNS_WITH_FILES)
+        if run_ids:
+            query["_id"] = {"$in": run_ids}
+        if status:
+            query["status"] = status
+        if connector:
+            query["connector"] = connector
+        if created_from or created_to:
+            query["created_at"] = {
+                **({"$gte": created_from} if created_from else {}),
+                **({"$lt": created_to} if created_to else {}),
+            }
+
+        runs = await Run.find(query).sort("-created_at").limit(ARCHIVE_MAX_RUNS + 1).to_list()
+        if len(runs) > ARCHIVE_MAX_RUNS:
+            raise HTTPException(
+                status_code=400,
+                detail=f"More than {ARCHIVE_MAX_RUNS} runs match; narrow the filters",
+            )
+
+        entries: List[Tuple[Path, str, Optional[str]]] = []
+        for run in runs:
+            for f in run.files or []:
+                meta = _file_meta_to_dict(f)
+                if file_type and meta.get("file_type") != file_type:
+                    continue
+                file_path = _resolve_artifact_path(meta["path"])
+                if file_path.is_file():
+                    entries.append(
+                        (file_path, f"{run.id}/{meta['file_type']}/{meta['filename']}", meta.get("compression"))
+                    )
+
+        if not entries:
+            raise HTTPException(status_code=404, detail="No files found for these runs")
+
+        archive_name = f"beehus-downloads-{datetime.now(timezone.utc).strftime('%Y%m%d-%H%M%S')}.zip"
+        return StreamingResponse(
+            _zip_entries(entries),
+            media_type="application/zip",
+            headers={"Content-Disposition": _content_disposition(archive_name)},
+        )
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error building downloads archive: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+
 @router.get("/{run_id}/{file_type}")
-async def download_file(run_id: str, file_type: str, filename: Optional[str] = None):
+async def download_file(request: Request, run_id: str, file_type: str, filename: Optional[str] = None):
     """
-    Download a file for a specific run.
+    Download a file for a specific run. Supports resumable downloads
+    (Range / If-Range) and conditional GET (ETag / Last-Modified).
 
     Path Parameters:
     - run_id: Run ID
@@ -161,12 +423,7 @@ async def download_file(run_id: str, file_type: str, filename: Optional[str] = N
         if not file_path.exists() or not file_path.is_file():
             raise HTTPException(status_code=404, detail="File not found on disk")
 
-        requested_name = selected["filename"]
-        return FileResponse(
-            path=str(file_path),
-            filename=requested_name,
-            media_type="application/octet-stream",
-        )
+        return _file_response(request, file_path, selected)
 
     except HTTPException:
         raise
@@ -1,4 +1,4 @@
-from pydantic import BaseModel, field_validator
+from pydantic import BaseModel, Field, field_validator
 from typing import Dict, Any, Optional, List
 from datetime import datetime
 from core.schemas.enums import JobStatus, RunStatus
@@ -10,6 +10,8 @@ class JobCreate(BaseModel):
     credential_id: Optional[str] = None
     params: Dict[str, Any] = {}
     schedule: Optional[str] = None  # Cron expression for periodic execution
+    # Max concurrent Selenium sessions of this connector while the job's runs wait for a slot
+    connector_session_limit: Optional[int] = Field(None, ge=1)
     
     # Export options
     export_holdings: bool = True
@@ -51,12 +53,28 @@ class RunResponse(BaseModel):
     created_at: datetime
     error_summary: Optional[str]
     vnc_url: Optional[str] = None
-    logs: List[str] = []
+    queue_position: Optional[int] = None
+    queue_eta_seconds: Optional[int] = None
     
     class Config:
         from_attributes = True
 
 
+class RunLogLine(BaseModel):
+    seq: int
+    message: str
+    created_at: datetime
+
+    class Config:
+        from_attributes = True
+
+
+class RunLogPage(BaseModel):
+    run_id: str
+    items: List[RunLogLine]
+    next_after: int
+
+
 class ProcessorCreate(BaseModel):
     credential_id: str
     name: str
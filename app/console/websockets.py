@@ -1,24 +1,220 @@
-from typing import List
+"""
+WebSocket fan-out for the console.
+
+Every connection gets a bounded send queue drained by its own writer task, so
+a slow browser tab never delays the others: broadcast only enqueues, and a
+client whose queue is full is evicted. Messages are JSON-encoded once and the
+same text is queued for every matching client.
+
+Clients receive status updates for the workspaces/jobs/runs they watch (all of
+them by default) and log lines only for runs they subscribed to.
+"""
+
+import asyncio
+import json
+import logging
+from typing import Dict, Iterable, List, Optional, Set
+
 from fastapi import WebSocket
 
+logger = logging.getLogger(__name__)
+
+SEND_QUEUE_SIZE = 256
+SEND_TIMEOUT_SECONDS = 10
+
+
+class RunSubscription:
+    """Log stream state of one run watched by one connection."""
+
+    def __init__(self, last_seq: int):
+        self.last_seq = last_seq
+        # Live lines received while the history is being replayed; None once caught up
+        self.backlog: Optional[List[dict]] = []
+
+    def take_new(self, lines: List[dict]) -> List[dict]:
+        """Return lines not yet sent, in seq order, and advance last_seq."""
+        new_lines = sorted(
+            (line for line in lines if line["seq"] > self.last_seq),
+            key=lambda line: line["seq"],
+        )
+        if new_lines:
+            self.last_seq = new_lines[-1]["seq"]
+        return new_lines
+
+
+class ClientConnection:
+    """One WebSocket with its send queue, writer task and filters."""
+
+    def __init__(self, websocket: WebSocket, queue_size: int = SEND_QUEUE_SIZE):
+        self.websocket = websocket
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=queue_size)
+        self.writer: Optional[asyncio.Task] = None
+        self.workspace_ids: Set[str] = set()
+        self.job_ids: Set[str] = set()
+        self.run_ids: Set[str] = set()
+        self.log_subscriptions: Dict[str, RunSubscription] = {}
+
+    def watch(
+        self,
+        workspace_ids: Iterable[str] = (),
+        job_ids: Iterable[str] = (),
+        run_ids: Iterable[str] = (),
+    ):
+        """Replace status filters; with none set the client sees every run."""
+        self.workspace_ids = {str(v) for v in workspace_ids}
+        self.job_ids = {str(v) for v in job_ids}
+        self.run_ids = {str(v) for v in run_ids}
+
+    def wants_status(self, message: dict) -> bool:
+        if message.get("type") == "resync":
+            return True
+        if not (self.workspace_ids or self.job_ids or self.run_ids):
+            return True
+        if "runs" in message:
+            # Batched update: wanted if any of its runs is
+            return any(self.wants_status(run) for run in message["runs"])
+        return (
+            message.get("run_id") in self.run_ids
+            or message.get("job_id") in self.job_ids
+            or message.get("workspace_id") in self.workspace_ids
+        )
+
+    def offer(self, text: str) -> bool:
+        """Queue an encoded message; False means the client is too slow."""
+        try:
+            self.queue.put_nowait(text)
+            return True
+        except asyncio.QueueFull:
+            return False
+
+    async def write_loop(self):
+        while True:
+            text = await self.queue.get()
+            await asyncio.wait_for(self.websocket.send_text(text), SEND_TIMEOUT_SECONDS)
+
+
 class ConnectionManager:
-    def __init__(self):
-        self.active_connections: List[WebSocket] = []
+    def __init__(self, queue_size: int = SEND_QUEUE_SIZE):
+        self.queue_size = queue_size
+        self.clients: Dict[WebSocket, ClientConnection] = {}
+        self.evicted_count = 0
+
+    @property
+    def active_connections(self) -> List[WebSocket]:
+        return list(self.clients)
+
+    def stats(self) -> dict:
+        """Connection counters of this process, reported to the shared registry."""
+        return {
+            "connections": len(self.clients),
+            "filtered_connections": sum(
+                1 for c in self.clients.values() if c.workspace_ids or c.job_ids or c.run_ids
+            ),
+            "log_subscriptions": sum(len(c.log_subscriptions) for c in self.clients.values()),
+            "queued_messages": sum(c.queue.qsize() for c in self.clients.values()),
+            "evicted_total": self.evicted_count,
+        }
 
-    async def connect(self, websocket: WebSocket):
+    async def connect(self, websocket: WebSocket) -> ClientConnection:
         await websocket.accept()
-        self.active_connections.append(websocket)
+        client = ClientConnection(websocket, self.queue_size)
+        client.writer = asyncio.create_task(self._run_writer(client))
+        self.clients[websocket] = client
+        return client
 
     def disconnect(self, websocket: WebSocket):
-        if websocket in self.active_connections:
-            self.active_connections.remove(websocket)
-
-    async def broadcast(self, message: dict):
-        # Broadcasts a JSON message to all connected clients
-        for connection in self.active_connections:
-            try:
-                await connection.send_json(message)
-            except Exception:
-                # If sending fails, we might want to remove the dead connection
-                # typically handled in disconnect, but safe to ignore here for simplicity
-                pass
+        client = self.clients.pop(websocket, None)
+        if client and client.writer and client.writer is not asyncio.current_task():
+            client.writer.cancel()
+
+    async def _run_writer(self, client: ClientConnection):
+        try:
+            await client.write_loop()
+        except asyncio.CancelledError:
+            pass
+        except Exception:
+            # Dead or stuck socket: drop it so it stops accumulating messages
+            self.disconnect(client.websocket)
+
+    def _evict(self, client: ClientConnection):
+        """Drop a consumer that cannot keep up and close its socket."""
+        self.evicted_count += 1
+        logger.warning("Evicting slow WebSocket consumer (send queue full)")
+        self.disconnect(client.websocket)
+        asyncio.create_task(self._close_quietly(client.websocket))
+
+    @staticmethod
+    async def _close_quietly(websocket: WebSocket):
+        try:
+            await websocket.close(code=1013)  # Try again later
+        except Exception:
+            pass
+
+    def _fan_out(self, text: str, clients: Iterable[ClientConnection]):
+        for client in list(clients):
+            if not client.offer(text):
+                self._evict(client)
+
+    async def broadcast(self, message: dict, text: Optional[str] = None):
+        # Status update: encode once, enqueue for every client watching it
+        if text is None:
+            text = json.dumps(message, default=str)
+        self._fan_out(
+            text,
+            (client for client in self.clients.values() if client.wants_status(message)),
+        )
+
+    # ========== RUN LOG SUBSCRIPTIONS ==========
+
+    def watch(self, websocket: WebSocket, **filters):
+        client = self.clients.get(websocket)
+        if client:
+            client.watch(**filters)
+
+    def subscribe(self, websocket: WebSocket, run_id: str, after: int = 0) -> Optional[RunSubscription]:
+        """Start watching a run's logs; live lines are held until catch_up() runs."""
+        client = self.clients.get(websocket)
+        if not client:
+            return None
+        subscription = RunSubscription(after)
+        client.log_subscriptions[run_id] = subscription
+        return subscription
+
+    def unsubscribe(self, websocket: WebSocket, run_id: str):
+        client = self.clients.get(websocket)
+        if client:
+            client.log_subscriptions.pop(run_id, None)
+
+    async def catch_up(self, websocket: WebSocket, run_id: str, history: List[dict]):
+        """Queue replayed history plus any live lines held meanwhile, then go live."""
+        client = self.clients.get(websocket)
+        subscription = client.log_subscriptions.get(run_id) if client else None
+        if not subscription:
+            return
+        held = subscription.backlog or []
+        subscription.backlog = None
+        lines = subscription.take_new(history + held)
+        if lines:
+            text = json.dumps({"type": "log", "run_id": run_id, "lines": lines})
+            self._fan_out(text, [client])
+
+    async def send_run_logs(self, message: dict, text: Optional[str] = None):
+        # Log lines go only to connections subscribed to the run
+        run_id = message.get("run_id")
+        published = message.get("lines", [])
+        for client in list(self.clients.values()):
+            subscription = client.log_subscriptions.get(run_id)
+            if not subscription:
+                continue
+            if subscription.backlog is not None:
+                subscription.backlog.extend(published)
+                continue
+            lines = subscription.take_new(published)
+            if not lines:
+                continue
+            if len(lines) == len(published) and text is not None:
+                # Common case: nothing already sent, reuse the published encoding
+                client_text = text
+            else:
+                client_text = json.dumps({"type": "log", "run_id": run_id, "lines": lines})
+            self._fan_out(client_text, [client])
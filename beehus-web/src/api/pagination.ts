@@ -0,0 +1,24 @@
+import axios from "axios";
+
+const NEXT_CURSOR_HEADER = "x-next-cursor";
+const PAGE_SIZE = 500;
+
+/**
+ * Fetch every page of a keyset-paginated listing (/jobs, /workspaces,
+ * /credentials, ...), following the X-Next-Cursor response header.
+ */
+export async function fetchAllPages<T>(
+  url: string,
+  params: Record<string, string> = {},
+): Promise<T[]> {
+  const items: T[] = [];
+  let cursor: string | undefined;
+  do {
+    const response = await axios.get<T[]>(url, {
+      params: { ...params, limit: PAGE_SIZE, ...(cursor ? { cursor } : {}) },
+    });
+    items.push(...response.data);
+    cursor = response.headers[NEXT_CURSOR_HEADER] || undefined;
+  } while (cursor);
+  return items;
+}
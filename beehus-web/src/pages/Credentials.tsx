@@ -8,6 +8,7 @@ import Layout from "../components/Layout";
 import ConfirmModal from "../components/ui/ConfirmModal";
 import { useToast } from "../context/ToastContext";
 import { processorsApi } from "../api/processors";
+import { fetchAllPages } from "../api/pagination";
 import type { Processor } from "../api/processors";
 import { formatDate, formatDateTime } from "../utils/datetime";
 
@@ -74,10 +75,11 @@ export default function Credentials() {
 
   const fetchCredentials = async () => {
     try {
-      const res = await axios.get(
-        `${import.meta.env.VITE_API_URL || "http://localhost:8000"}/credentials`,
+      setCredentials(
+        await fetchAllPages<Credential>(
+          `${import.meta.env.VITE_API_URL || "http://localhost:8000"}/credentials`,
+        ),
       );
-      setCredentials(res.data);
     } catch (error) {
       console.error("Failed to fetch credentials:", error);
     } finally {
@@ -87,10 +89,11 @@ export default function Credentials() {
 
   const fetchWorkspaces = async () => {
     try {
-      const res = await axios.get(
-        `${import.meta.env.VITE_API_URL || "http://localhost:8000"}/workspaces`,
+      setWorkspaces(
+        await fetchAllPages<Workspace>(
+          `${import.meta.env.VITE_API_URL || "http://localhost:8000"}/workspaces`,
+        ),
       );
-      setWorkspaces(res.data);
     } catch (error) {
       console.error("Failed to fetch workspaces:", error);
     }
@@ -9,6 +9,7 @@ interface FileMetadata {
     filename: string;
     path: string;
     size_bytes?: number;
+    sha256?: string;
     status: string;
 }
 
@@ -64,6 +65,18 @@ export default function Downloads() {
         }
     };
 
+    const handleDownloadAll = () => {
+        // Streamed as one ZIP by the API; no need to fetch the files one by one
+        const params = new URLSearchParams();
+        downloads.forEach((item) => params.append('run_ids', item.run_id));
+        const link = document.createElement('a');
+        link.href = `${import.meta.env.VITE_API_URL || 'http://localhost:8000'}/downloads/archive?${params.toString()}`;
+        document.body.appendChild(link);
+        link.click();
+        document.body.removeChild(link);
+        showToast('Download started', 'success');
+    };
+
     const getStatusBadge = (status: string) => {
         const badges = {
             ready: 'bg-green-500/20 text-green-400 border-green-500/30',
@@ -93,9 +106,18 @@ export default function Downloads() {
     return (
         <Layout>
             <div className="p-8 max-w-7xl mx-auto space-y-8">
-                <header>
-                    <h2 className="text-2xl font-bold text-white">Downloads & Reports</h2>
-                    <p className="text-slate-400">Access downloaded and processed files</p>
+                <header className="flex justify-between items-center">
+                    <div>
+                        <h2 className="text-2xl font-bold text-white">Downloads & Reports</h2>
+                        <p className="text-slate-400">Access downloaded and processed files</p>
+                    </div>
+                    <button
+                        onClick={handleDownloadAll}
+                        disabled={downloads.length === 0}
+                        className="bg-brand-600 hover:bg-brand-500 disabled:opacity-50 text-white px-6 py-2.5 rounded-lg font-medium shadow-lg shadow-brand-500/20 transition-all"
+                    >
+                        Download all (ZIP)
+                    </button>
                 </header>
 
                 <div className="glass rounded-xl overflow-hidden border border-white/5">
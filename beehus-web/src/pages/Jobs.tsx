@@ -3,6 +3,7 @@ import axios from 'axios';
 import { useSearchParams, useNavigate } from 'react-router-dom';
 import Layout from '../components/Layout';
 import ConfirmModal from '../components/ui/ConfirmModal';
+import { fetchAllPages } from '../api/pagination';
 import { useToast } from '../context/ToastContext';
 
 interface Job {
@@ -116,8 +117,7 @@ export default function Jobs() {
 
     const fetchJobs = async () => {
         try {
-            const res = await axios.get(`${import.meta.env.VITE_API_URL || 'http://localhost:8000'}/jobs`);
-            setJobs(res.data);
+            setJobs(await fetchAllPages<Job>(`${import.meta.env.VITE_API_URL || 'http://localhost:8000'}/jobs`));
         } catch (error) {
             console.error('Failed to fetch jobs:', error);
         } finally {
@@ -127,8 +127,7 @@ export default function Jobs() {
 
     const fetchWorkspaces = async () => {
         try {
-            const res = await axios.get(`${import.meta.env.VITE_API_URL || 'http://localhost:8000'}/workspaces`);
-            setWorkspaces(res.data);
+            setWorkspaces(await fetchAllPages<Workspace>(`${import.meta.env.VITE_API_URL || 'http://localhost:8000'}/workspaces`));
         } catch (error) {
             console.error('Failed to fetch workspaces:', error);
         }
@@ -136,8 +135,7 @@ export default function Jobs() {
 
     const fetchCredentials = async () => {
         try {
-            const res = await axios.get(`${import.meta.env.VITE_API_URL || 'http://localhost:8000'}/credentials`);
-            setCredentials(res.data);
+            setCredentials(await fetchAllPages<Credential>(`${import.meta.env.VITE_API_URL || 'http://localhost:8000'}/credentials`));
         } catch (error) {
             console.error('Failed to fetch credentials:', error);
         }
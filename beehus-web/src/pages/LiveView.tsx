@@ -6,12 +6,25 @@ import { useAuth } from '../context/AuthContext';
 interface RunData {
     id: string;
     status: string;
-    logs: string[];
     error_summary?: string;
     connector?: string;
     vnc_url?: string;
 }
 
+interface RunLogLine {
+    seq: number;
+    message: string;
+    created_at: string;
+}
+
+interface WsMessage {
+    type?: string;
+    run_id?: string;
+    status?: string;
+    lines?: RunLogLine[];
+    runs?: { run_id: string }[];
+}
+
 export default function LiveView() {
   const { runId } = useParams();
   const navigate = useNavigate();
@@ -21,21 +34,31 @@ export default function LiveView() {
 
   const [logsCollapsed, setLogsCollapsed] = useState(false);
   const [logs, setLogs] = useState<string[]>([]);
+  const lastLogSeq = useRef(0);
   const [error, setError] = useState<string | null>(null);
 
-  // Poll for Run Data
+  // Load run details, then stream status and log lines over the WebSocket
   useEffect(() => {
     if (!runId) {
         setError("Run ID is missing.");
         return;
     }
 
+    const apiUrl = import.meta.env.VITE_API_URL || 'http://localhost:8000';
+    const wsUrl = `${apiUrl.replace(/^http/, 'ws')}/ws/runs`;
+    let ws: WebSocket | null = null;
+    let reconnectTimeout: number | null = null;
+    let retryCount = 0;
+    let active = true;
+
+    lastLogSeq.current = 0;
+    setLogs([]);
+
     const fetchRun = async () => {
         try {
             // Fetch run details
-            const runRes = await axios.get(`${import.meta.env.VITE_API_URL || 'http://localhost:8000'}/runs/${runId}`);
+            const runRes = await axios.get(`${apiUrl}/runs/${runId}`);
             setRun(runRes.data);
-            setLogs(runRes.data.logs || []);
         } catch (err) {
             console.error("Error fetching run:", err);
             if (axios.isAxiosError(err) && err.response?.status === 401) {
@@ -47,27 +70,74 @@ export default function LiveView() {
         }
     };
 
-    fetchRun(); // Initial fetch
+    const appendLines = (lines: RunLogLine[]) => {
+        // Server already de-duplicates per subscription; this guards reconnect overlaps
+        const fresh = lines.filter(line => line.seq > lastLogSeq.current);
+        if (fresh.length === 0) return;
+        lastLogSeq.current = fresh[fresh.length - 1].seq;
+        setLogs(prev => [...prev, ...fresh.map(line => line.message)]);
+    };
 
-    const interval = setInterval(async () => {
-        try {
-            const pollRes = await axios.get(`${import.meta.env.VITE_API_URL || 'http://localhost:8000'}/runs/${runId}`);
-            setRun(pollRes.data);
-            setLogs(pollRes.data.logs || []);
-            if (['success', 'failed'].includes(pollRes.data.status)) {
-                clearInterval(interval);
-            }
-        } catch (err) {
-            console.error("Error polling run:", err);
-            if (axios.isAxiosError(err) && err.response?.status === 401) {
-                logout();
-                navigate('/login');
+    const connect = () => {
+        ws = new WebSocket(wsUrl);
+
+        ws.onopen = () => {
+            retryCount = 0;
+            // Resume from the last line we have; the server replays anything missed
+            ws?.send(JSON.stringify({ action: 'subscribe', run_id: runId, after: lastLogSeq.current }));
+        };
+
+        ws.onmessage = (event) => {
+            try {
+                const data: WsMessage = JSON.parse(event.data);
+                if (data.type === 'resync') {
+                    // Server relay reconnected to Redis: resume from our last seq
+                    ws?.send(JSON.stringify({ action: 'subscribe', run_id: runId, after: lastLogSeq.current }));
+                    fetchRun();
+                    return;
+                }
+                if (data.type === 'status_batch') {
+                    // Many runs changed at once (e.g. reaped zombies)
+                    if (data.runs?.some(r => r.run_id === runId)) fetchRun();
+                    return;
+                }
+                if (data.run_id !== runId) return;
+                if (data.type === 'log') {
+                    appendLines(data.lines || []);
+                } else if (data.status) {
+                    // Status changed: refresh details (error summary, VNC URL)
+                    fetchRun();
+                }
+            } catch (e) {
+                console.error('Failed to parse WS message:', e);
             }
-            // Don't set global error for polling, just log
-        }
-    }, 2000);
+        };
+
+        ws.onclose = () => {
+            if (!active) return;
+            const timeout = Math.min(1000 * (2 ** retryCount), 10000);
+            retryCount += 1;
+            reconnectTimeout = window.setTimeout(connect, timeout);
+        };
+
+        ws.onerror = () => {
+            ws?.close();
+        };
+    };
+
+    fetchRun(); // Initial fetch
+    connect();
 
-    return () => clearInterval(interval);
+    return () => {
+        active = false;
+        if (reconnectTimeout) {
+            window.clearTimeout(reconnectTimeout);
+        }
+        if (ws) {
+            ws.onclose = null;
+            ws.close();
+        }
+    };
   }, [runId, navigate, logout]);
 
   // Scroll to bottom of logs
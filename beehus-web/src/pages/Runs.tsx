@@ -11,6 +11,8 @@ interface Run {
     job_name?: string;
     connector: string;
     status: string;
+    queue_position?: number | null;
+    queue_eta_seconds?: number | null;
     report_date?: string;
     history_date?: string;
     node: string;
@@ -72,12 +74,31 @@ export default function Runs() {
             if (ws !== wsRef.current) return;
             try {
                 const data = JSON.parse(event.data);
+                if (data.type === 'status_batch') {
+                    // Many runs moved to one status at once (e.g. reaped zombies)
+                    const changed = new Set((data.runs || []).map((r: { run_id: string }) => r.run_id));
+                    setRuns(prevRuns => prevRuns.map(run => changed.has(run.run_id)
+                        ? { ...run, status: data.status, queue_position: null, queue_eta_seconds: null }
+                        : run
+                    ));
+                    return;
+                }
                 setRuns(prevRuns => {
                     return prevRuns.map(run => {
                        if (run.run_id === data.run_id) {
+                           if (data.type === 'queue') {
+                               return {
+                                   ...run,
+                                   queue_position: data.queue_position,
+                                   queue_eta_seconds: data.queue_eta_seconds,
+                               };
+                           }
                            return { 
                                ...run, 
                                status: data.status,
+                               // Any status change means the run left the slot queue
+                               queue_position: null,
+                               queue_eta_seconds: null,
                                ...(data.node && { node: data.node })
                            };
                        }
@@ -277,6 +298,12 @@ export default function Runs() {
                                                 {run.status === 'running' && <span className="w-1.5 h-1.5 bg-brand-400 rounded-full mr-1.5 animate-pulse"></span>}
                                                 {run.status.charAt(0).toUpperCase() + run.status.slice(1)}
                                             </span>
+                                            {run.queue_position ? (
+                                                <span className="ml-2 text-xs text-slate-400" title="Waiting for a Selenium slot">
+                                                    Slot queue #{run.queue_position}
+                                                    {run.queue_eta_seconds ? ` (~${Math.max(1, Math.round(run.queue_eta_seconds / 60))} min)` : ''}
+                                                </span>
+                                            ) : null}
                                         </td>
                                         <td className="px-6 py-4 text-slate-400">{run.node}</td>
                                         <td className="px-6 py-4">
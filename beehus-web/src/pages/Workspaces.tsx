@@ -4,6 +4,7 @@ import Layout from '../components/Layout';
 import axios from 'axios';
 import { Link } from 'react-router-dom';
 import ConfirmModal from '../components/ui/ConfirmModal';
+import { fetchAllPages } from '../api/pagination';
 import { useToast } from '../context/ToastContext';
 
 interface Workspace {
@@ -28,8 +29,7 @@ export default function Workspaces() {
 
     const fetchWorkspaces = async () => {
         try {
-            const res = await axios.get(`${import.meta.env.VITE_API_URL || 'http://localhost:8000'}/workspaces`);
-            setWorkspaces(res.data);
+            setWorkspaces(await fetchAllPages<Workspace>(`${import.meta.env.VITE_API_URL || 'http://localhost:8000'}/workspaces`));
         } catch (error) {
             console.error('Failed to fetch workspaces:', error);
             showToast('Failed to fetch workspaces', 'error');
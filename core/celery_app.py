@@ -26,6 +26,16 @@ app.conf.beat_schedule = {
          'task': 'core.tasks.cleanup_old_runs_task',
          'schedule': crontab(hour=0, minute=0), # Daily midnight
          'args': (30,) # Keep 30 days
+    },
+    'artifact-retention': {
+        'task': 'core.tasks.artifact_retention_task',
+        'schedule': crontab(hour=1, minute=0),  # After cleanup-old-runs: compress cold files, drop orphaned dirs
+        'options': {'queue': 'celery'}
+    },
+    'rebuild-run-stats': {
+        'task': 'core.tasks.rebuild_run_stats_task',
+        'schedule': crontab(hour=3, minute=30),  # Daily reconciliation of run_stats counters
+        'options': {'queue': 'celery'}
     }
 }
 
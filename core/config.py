@@ -16,11 +16,35 @@ class Settings(BaseSettings):
     SELENIUM_MAX_SLOTS: int = 5
     SELENIUM_NODE_COUNT: int = 5
     SELENIUM_NODE_MAX_SESSIONS: int = 1
+    # Slot lease lifetime; renewed by the run heartbeat (every lease/3, at most 60s), reclaimed once expired
+    SELENIUM_SLOT_LEASE_SECONDS: int = 180
+    # Queue head start per priority step: manual runs get 2 steps, retries 1, scheduled 0
+    SELENIUM_PRIORITY_STEP_SECONDS: int = 900
+
+    # Ready Grid sessions kept open per worker process and reused across runs (0 = off)
+    SELENIUM_SESSION_POOL_SIZE: int = 0
+    SELENIUM_SESSION_POOL_WARMUP_CONCURRENCY: int = 2
+    SELENIUM_SESSION_POOL_MAX_USES: int = 20
+    SELENIUM_SESSION_POOL_IDLE_SECONDS: int = 900
+
+    # Worker: runs driven concurrently by one process (>1 requires --pool=threads)
+    WORKER_MAX_CONCURRENT_RUNS: int = 1
     
     # Selenium
     SELENIUM_REMOTE_URL: str = "http://selenium-hub:4444/wd/hub"  # Selenium Grid Hub
+    # Grid /status poll interval for the session -> node -> VNC map
+    SELENIUM_GRID_POLL_SECONDS: int = 30
     VNC_URL_BASE: str = "http://localhost"
 
+    # Downloads: nginx internal location aliasing ARTIFACTS_DIR (e.g. /_artifacts);
+    # when set, file bytes are sent by nginx via X-Accel-Redirect instead of the API
+    DOWNLOADS_ACCEL_REDIRECT_PREFIX: str | None = None
+
+    # Artifact retention: runs older than this get their files gzip-compressed;
+    # each daily pass compresses / deletes (orphaned dirs) at most BATCH runs
+    ARTIFACTS_HOT_DAYS: int = 7
+    ARTIFACTS_RETENTION_BATCH: int = 500
+
     # Security
     DATABASE_ENCRYPTION_KEY: str = "qQkYhPB2wmkqTLcJxmiiKjYHrnJpDVRtMne4cxd8SpM="
 
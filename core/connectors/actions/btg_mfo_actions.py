@@ -10,7 +10,7 @@ from selenium.webdriver.remote.webdriver import WebDriver
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 
-from core.connectors.helpers.selenium_helpers import SeleniumHelpers
+from core.connectors.helpers.async_driver import AsyncSeleniumHelpers
 from core.connectors.seletores.btg_mfo import SeletorBtgMfo
 
 logger = logging.getLogger(__name__)
@@ -22,11 +22,12 @@ class BtgMfoActions:
     def __init__(
         self,
         driver: WebDriver,
-        helpers: SeleniumHelpers,
+        helpers: AsyncSeleniumHelpers,
         selectors: SeletorBtgMfo,
         log_func,
     ):
         self.driver = driver
+        self.browser = helpers.browser
         self.helpers = helpers
         self.selectors = selectors
         self.log = log_func
@@ -51,6 +52,12 @@ class BtgMfoActions:
             pass
         return False
 
+    def _click_or_js(self, el) -> None:
+        try:
+            el.click()
+        except Exception:
+            self.driver.execute_script("arguments[0].click();", el)
+
     async def login_step(
         self,
         username: str,
@@ -66,41 +73,40 @@ class BtgMfoActions:
         """
         try:
             await self.log("Navigating to BTG MFO login page...")
-            self.driver.get(self.selectors.URL_BASE)
+            await self.browser.get(self.selectors.URL_BASE)
 
-            login_field = self.helpers.wait_for_element(*self.selectors.LOGIN_FIELD)
-            password_field = self.helpers.wait_for_element(*self.selectors.PASSWORD_FIELD)
-            token_field = self.helpers.wait_for_element(*self.selectors.TOKEN_FIELD)
+            login_field = await self.helpers.wait_for_element(*self.selectors.LOGIN_FIELD)
+            password_field = await self.helpers.wait_for_element(*self.selectors.PASSWORD_FIELD)
+            token_field = await self.helpers.wait_for_element(*self.selectors.TOKEN_FIELD)
 
-            login_field.clear()
-            password_field.clear()
-            token_field.clear()
+            await self.browser.run(login_field.clear)
+            await self.browser.run(password_field.clear)
+            await self.browser.run(token_field.clear)
 
             await self.log(f"Username: {username}")
 
-            login_field.send_keys(str(username))
-            password_field.send_keys(str(password))
+            await self.browser.run(login_field.send_keys, str(username))
+            await self.browser.run(password_field.send_keys, str(password))
 
             if token:
-                token_field.send_keys(str(token))
+                await self.browser.run(token_field.send_keys, str(token))
             else:
                 await self.log("Waiting for token input in the grid...")
-                self.helpers.wait_until(
+                await self.helpers.wait_until(
                     lambda d: (token_field.get_attribute("value") or "").strip() != "",
                     timeout=token_timeout_seconds,
                 )
                 await self.log("Token filled by user")
 
             try:
-                submit_button = self.helpers.find_element(*self.selectors.SUBMIT_BUTTON)
-                if submit_button.is_displayed() and submit_button.is_enabled():
-                    submit_button.click()
+                submit_button = await self.helpers.find_element(*self.selectors.SUBMIT_BUTTON)
+                await self.browser.run(self._click_if_ready, submit_button)
             except Exception:
                 pass
 
             await self.log("Verifying login...")
-            login_verified = self._wait_for_login_result(
-                timeout_seconds=login_timeout_seconds
+            login_verified = await self.browser.run(
+                self._wait_for_login_result, timeout_seconds=login_timeout_seconds
             )
 
             if not login_verified.get("logged"):
@@ -132,6 +138,10 @@ class BtgMfoActions:
                 "message": error_msg,
             }
 
+    def _click_if_ready(self, el) -> None:
+        if el.is_displayed() and el.is_enabled():
+            el.click()
+
     def _wait_for_login_result(self, timeout_seconds: int = 60) -> Dict[str, Any]:
         """
         Wait for login to complete or show error.
@@ -162,15 +172,16 @@ class BtgMfoActions:
             await self.log("Navigating to reports page...")
 
             await self.log("Looking for FAMILY OFFICE WM access type...")
-            client_selections = self.driver.find_elements(
+            client_selections = await self.browser.find_elements(
                 *self.selectors.CLIENT_SELECTION_BUTTONS
             )
 
             correct_client_selection = None
             for index, element in enumerate(client_selections):
-                if "FAMILY OFFICE WM" in element.text:
+                element_text = await self.browser.run(lambda: element.text)
+                if "FAMILY OFFICE WM" in element_text:
                     await self.log(
-                        f"Found access type: {element.text} (index {index})"
+                        f"Found access type: {element_text} (index {index})"
                     )
                     correct_client_selection = element
                     break
@@ -185,31 +196,25 @@ class BtgMfoActions:
                 }
 
             await self.log("Clicking access button...")
-            access_button = correct_client_selection.find_element(
-                *self.selectors.ACCESS_BUTTON
+            access_button = await self.browser.run(
+                correct_client_selection.find_element, *self.selectors.ACCESS_BUTTON
             )
-            try:
-                access_button.click()
-            except Exception:
-                self.driver.execute_script("arguments[0].click();", access_button)
+            await self.browser.run(self._click_or_js, access_button)
             await asyncio.sleep(2)
 
             await self.log("Clicking operations button...")
-            operation_button = self.helpers.wait_for_element(
+            operation_button = await self.helpers.wait_for_element(
                 *self.selectors.OPERATION_BUTTON
             )
-            try:
-                operation_button.click()
-            except Exception:
-                self.driver.execute_script("arguments[0].click();", operation_button)
+            await self.browser.run(self._click_or_js, operation_button)
             await asyncio.sleep(1)
 
             await self.log("Looking for WM reports feature...")
-            reports_types = self.driver.find_elements(*self.selectors.REPORTS_WM_FEATURE)
+            reports_types = await self.browser.find_elements(*self.selectors.REPORTS_WM_FEATURE)
 
             correct_report_element = None
             for element in reports_types:
-                text_lower = element.text.lower()
+                text_lower = (await self.browser.run(lambda: element.text)).lower()
                 if "relat" in text_lower and "wm" in text_lower:
                     correct_report_element = element
                     break
@@ -224,10 +229,7 @@ class BtgMfoActions:
                 }
 
             await self.log("Clicking WM reports button...")
-            try:
-                correct_report_element.click()
-            except Exception:
-                self.driver.execute_script("arguments[0].click();", correct_report_element)
+            await self.browser.run(self._click_or_js, correct_report_element)
 
             await self.log("Navigation successful")
             return {
@@ -252,47 +254,32 @@ class BtgMfoActions:
         """
         try:
             await self.log("Selecting 'Investimento' category...")
-            category_select = self.helpers.wait_for_element(
+            category_select = await self.helpers.wait_for_element(
                 *self.selectors.CATEGORY_SELECT
             )
             await asyncio.sleep(1)
-            try:
-                category_select.click()
-            except Exception:
-                self.driver.execute_script("arguments[0].click();", category_select)
+            await self.browser.run(self._click_or_js, category_select)
 
-            category_investment = self.helpers.wait_for_element(
+            category_investment = await self.helpers.wait_for_element(
                 *self.selectors.CATEGORY_INVESTMENT
             )
             await asyncio.sleep(1)
-            try:
-                category_investment.click()
-            except Exception:
-                self.driver.execute_script("arguments[0].click();", category_investment)
+            await self.browser.run(self._click_or_js, category_investment)
 
             await self.log("Selecting 'Investimentos (WM Externo) (D-1 e D0)' report...")
-            report_select = self.helpers.wait_for_element(*self.selectors.REPORT_SELECT)
+            report_select = await self.helpers.wait_for_element(*self.selectors.REPORT_SELECT)
             await asyncio.sleep(1)
-            try:
-                report_select.click()
-            except Exception:
-                self.driver.execute_script("arguments[0].click();", report_select)
+            await self.browser.run(self._click_or_js, report_select)
 
-            report_investment = self.helpers.wait_for_element(
+            report_investment = await self.helpers.wait_for_element(
                 *self.selectors.REPORT_INVESTMENT_WM
             )
             await asyncio.sleep(1)
-            try:
-                report_investment.click()
-            except Exception:
-                self.driver.execute_script("arguments[0].click();", report_investment)
+            await self.browser.run(self._click_or_js, report_investment)
 
             await self.log("Clicking filter button...")
-            filter_button = self.helpers.wait_for_element(*self.selectors.FILTER_BUTTON)
-            try:
-                filter_button.click()
-            except Exception:
-                self.driver.execute_script("arguments[0].click();", filter_button)
+            filter_button = await self.helpers.wait_for_element(*self.selectors.FILTER_BUTTON)
+            await self.browser.run(self._click_or_js, filter_button)
 
             await self.log("Waiting for Power BI to load...")
             await asyncio.sleep(5)
@@ -321,96 +308,76 @@ class BtgMfoActions:
         try:
             await self.log(f"Starting positions download (Target date: {date or 'D0'})...")
 
-            self.driver.switch_to.default_content()
+            await self.browser.switch_to_default_content()
 
             await self.log("Waiting for Power BI iframe...")
-            powerbi_iframe = WebDriverWait(self.driver, 35).until(
-                EC.presence_of_element_located(self.selectors.POWERBI_IFRAME)
+            powerbi_iframe = await self.browser.wait_until(
+                EC.presence_of_element_located(self.selectors.POWERBI_IFRAME), timeout=35
             )
-            self.driver.switch_to.frame(powerbi_iframe)
+            await self.browser.switch_to_frame(powerbi_iframe)
             await self.log("Switched to Power BI iframe")
 
             await self.log("Clicking positions button...")
-            positions_container = WebDriverWait(self.driver, 30).until(
-                EC.element_to_be_clickable(self.selectors.POSITIONS_BUTTON_CONTAINER)
+            positions_container = await self.browser.wait_until(
+                EC.element_to_be_clickable(self.selectors.POSITIONS_BUTTON_CONTAINER), timeout=30
             )
-            self.driver.execute_script(
+            await self.browser.execute_script(
                 "arguments[0].scrollIntoView(true);", positions_container
             )
 
-            tile = positions_container.find_element(*self.selectors.POSITIONS_TILE)
-            positions_button = tile.find_element(*self.selectors.POSITIONS_BUTTON)
+            tile = await self.browser.run(
+                positions_container.find_element, *self.selectors.POSITIONS_TILE
+            )
+            positions_button = await self.browser.run(
+                tile.find_element, *self.selectors.POSITIONS_BUTTON
+            )
 
             await asyncio.sleep(0.5)
-            try:
-                positions_button.click()
-            except Exception:
-                self.driver.execute_script("arguments[0].click();", positions_button)
+            await self.browser.run(self._click_or_js, positions_button)
             await self.log("Navigated to positions page")
             await asyncio.sleep(5)
 
             await self.log("Selecting D0 date...")
-            date_select = WebDriverWait(self.driver, 30).until(
-                EC.presence_of_element_located(self.selectors.POSITIONS_DATE_SELECT)
+            date_select = await self.browser.wait_until(
+                EC.presence_of_element_located(self.selectors.POSITIONS_DATE_SELECT), timeout=30
             )
-            try:
-                date_select.click()
-            except Exception:
-                self.driver.execute_script("arguments[0].click();", date_select)
+            await self.browser.run(self._click_or_js, date_select)
             await asyncio.sleep(1)
 
-            dzero_option = WebDriverWait(self.driver, 6).until(
-                EC.presence_of_element_located(self.selectors.POSITIONS_DZERO_OPTION)
+            dzero_option = await self.browser.wait_until(
+                EC.presence_of_element_located(self.selectors.POSITIONS_DZERO_OPTION), timeout=6
             )
-            try:
-                dzero_option.click()
-            except Exception:
-                self.driver.execute_script("arguments[0].click();", dzero_option)
+            await self.browser.run(self._click_or_js, dzero_option)
             await self.log("D0 date selected")
             await asyncio.sleep(1)
 
             await self.log("Opening export menu...")
-            positions_title = WebDriverWait(self.driver, 6).until(
-                EC.presence_of_element_located(self.selectors.POSITIONS_TITLE)
+            positions_title = await self.browser.wait_until(
+                EC.presence_of_element_located(self.selectors.POSITIONS_TITLE), timeout=6
             )
-            try:
-                positions_title.click()
-            except Exception:
-                self.driver.execute_script("arguments[0].click();", positions_title)
+            await self.browser.run(self._click_or_js, positions_title)
 
-            menu_button = WebDriverWait(self.driver, 12).until(
-                EC.presence_of_element_located(self.selectors.POSITIONS_MENU_BUTTON)
+            menu_button = await self.browser.wait_until(
+                EC.presence_of_element_located(self.selectors.POSITIONS_MENU_BUTTON), timeout=12
             )
-            try:
-                menu_button.click()
-            except Exception:
-                self.driver.execute_script("arguments[0].click();", menu_button)
+            await self.browser.run(self._click_or_js, menu_button)
 
-            export_button = WebDriverWait(self.driver, 6).until(
-                EC.presence_of_element_located(self.selectors.EXPORT_DATA_BUTTON)
+            export_button = await self.browser.wait_until(
+                EC.presence_of_element_located(self.selectors.EXPORT_DATA_BUTTON), timeout=6
             )
-            try:
-                export_button.click()
-            except Exception:
-                self.driver.execute_script("arguments[0].click();", export_button)
+            await self.browser.run(self._click_or_js, export_button)
             await asyncio.sleep(0.5)
 
             await self.log("Downloading positions file...")
-            download_button = WebDriverWait(self.driver, 6).until(
-                EC.presence_of_element_located(self.selectors.DOWNLOAD_BUTTON)
+            download_button = await self.browser.wait_until(
+                EC.presence_of_element_located(self.selectors.DOWNLOAD_BUTTON), timeout=6
             )
-            try:
-                download_button.click()
-            except Exception:
-                self.driver.execute_script("arguments[0].click();", download_button)
+            await self.browser.run(self._click_or_js, download_button)
             await asyncio.sleep(3)
 
-            self.driver.switch_to.default_content()
-            filter_button = self.driver.find_element(*self.selectors.FILTER_BUTTON)
-            try:
-                filter_button.click()
-            except Exception:
-                self.driver.execute_script("arguments[0].click();", filter_button)
+            await self.browser.switch_to_default_content()
+            filter_button = await self.browser.find_element(*self.selectors.FILTER_BUTTON)
+            await self.browser.run(self._click_or_js, filter_button)
             await asyncio.sleep(5)
 
             await self.log("Positions report downloaded successfully")
@@ -426,7 +393,7 @@ class BtgMfoActions:
             logger.exception(error_msg)
 
             try:
-                self.driver.switch_to.default_content()
+                await self.browser.switch_to_default_content()
             except Exception:
                 pass
 
@@ -443,76 +410,62 @@ class BtgMfoActions:
         try:
             await self.log(f"Starting transactions download (Target date: {date})...")
 
-            self.driver.switch_to.default_content()
+            await self.browser.switch_to_default_content()
 
             await self.log("Waiting for Power BI iframe...")
-            powerbi_iframe = WebDriverWait(self.driver, 35).until(
-                EC.presence_of_element_located(self.selectors.POWERBI_IFRAME)
+            powerbi_iframe = await self.browser.wait_until(
+                EC.presence_of_element_located(self.selectors.POWERBI_IFRAME), timeout=35
             )
-            self.driver.switch_to.frame(powerbi_iframe)
+            await self.browser.switch_to_frame(powerbi_iframe)
             await self.log("Switched to Power BI iframe")
 
             await self.log("Clicking transactions button...")
-            transactions_container = WebDriverWait(self.driver, 30).until(
-                EC.element_to_be_clickable(self.selectors.TRANSACTIONS_BUTTON_CONTAINER)
+            transactions_container = await self.browser.wait_until(
+                EC.element_to_be_clickable(self.selectors.TRANSACTIONS_BUTTON_CONTAINER), timeout=30
             )
-            self.driver.execute_script(
+            await self.browser.execute_script(
                 "arguments[0].scrollIntoView(true);", transactions_container
             )
 
-            tile = transactions_container.find_element(*self.selectors.POSITIONS_TILE)
-            transactions_button = tile.find_element(*self.selectors.POSITIONS_BUTTON)
+            tile = await self.browser.run(
+                transactions_container.find_element, *self.selectors.POSITIONS_TILE
+            )
+            transactions_button = await self.browser.run(
+                tile.find_element, *self.selectors.POSITIONS_BUTTON
+            )
 
             await asyncio.sleep(0.5)
-            try:
-                transactions_button.click()
-            except Exception:
-                self.driver.execute_script("arguments[0].click();", transactions_button)
+            await self.browser.run(self._click_or_js, transactions_button)
             await self.log("Navigated to transactions page")
             await asyncio.sleep(4)
 
             await self.log("Opening export menu...")
-            transactions_title = WebDriverWait(self.driver, 15).until(
-                EC.presence_of_element_located(self.selectors.TRANSACTIONS_TITLE)
+            transactions_title = await self.browser.wait_until(
+                EC.presence_of_element_located(self.selectors.TRANSACTIONS_TITLE), timeout=15
             )
-            try:
-                transactions_title.click()
-            except Exception:
-                self.driver.execute_script("arguments[0].click();", transactions_title)
+            await self.browser.run(self._click_or_js, transactions_title)
 
-            menu_button = WebDriverWait(self.driver, 30).until(
-                EC.presence_of_element_located(self.selectors.TRANSACTIONS_MENU_BUTTON)
+            menu_button = await self.browser.wait_until(
+                EC.presence_of_element_located(self.selectors.TRANSACTIONS_MENU_BUTTON), timeout=30
             )
-            try:
-                menu_button.click()
-            except Exception:
-                self.driver.execute_script("arguments[0].click();", menu_button)
+            await self.browser.run(self._click_or_js, menu_button)
 
-            export_button = WebDriverWait(self.driver, 6).until(
-                EC.presence_of_element_located(self.selectors.EXPORT_DATA_BUTTON)
+            export_button = await self.browser.wait_until(
+                EC.presence_of_element_located(self.selectors.EXPORT_DATA_BUTTON), timeout=6
             )
-            try:
-                export_button.click()
-            except Exception:
-                self.driver.execute_script("arguments[0].click();", export_button)
+            await self.browser.run(self._click_or_js, export_button)
             await asyncio.sleep(0.5)
 
             await self.log("Downloading transactions file...")
-            download_button = WebDriverWait(self.driver, 6).until(
-                EC.presence_of_element_located(self.selectors.DOWNLOAD_BUTTON)
+            download_button = await self.browser.wait_until(
+                EC.presence_of_element_located(self.selectors.DOWNLOAD_BUTTON), timeout=6
             )
-            try:
-                download_button.click()
-            except Exception:
-                self.driver.execute_script("arguments[0].click();", download_button)
+            await self.browser.run(self._click_or_js, download_button)
             await asyncio.sleep(3)
 
-            self.driver.switch_to.default_content()
-            filter_button = self.driver.find_element(*self.selectors.FILTER_BUTTON)
-            try:
-                filter_button.click()
-            except Exception:
-                self.driver.execute_script("arguments[0].click();", filter_button)
+            await self.browser.switch_to_default_content()
+            filter_button = await self.browser.find_element(*self.selectors.FILTER_BUTTON)
+            await self.browser.run(self._click_or_js, filter_button)
 
             await self.log("Transactions report downloaded successfully")
             return {
@@ -527,7 +480,7 @@ class BtgMfoActions:
             logger.exception(error_msg)
 
             try:
-                self.driver.switch_to.default_content()
+                await self.browser.switch_to_default_content()
             except Exception:
                 pass
 
@@ -9,10 +9,11 @@ from selenium.webdriver.common.by import By
 from selenium.webdriver.common.action_chains import ActionChains
 from selenium.webdriver.common.keys import Keys
 from selenium.common.exceptions import TimeoutException
+import asyncio
 import time
 import random
 
-from core.connectors.helpers.selenium_helpers import SeleniumHelpers
+from core.connectors.helpers.async_driver import AsyncSeleniumHelpers
 from core.connectors.seletores.btg_offshore import SeletorBtgOffshore
 from core.utils.date_utils import get_previous_business_day, get_today
 
@@ -23,11 +24,12 @@ class BtgOffshoreActions:
     def __init__(
         self,
         driver: WebDriver,
-        helpers: SeleniumHelpers,
+        helpers: AsyncSeleniumHelpers,
         selectors: SeletorBtgOffshore,
         log_func: Callable,
     ):
         self.driver = driver
+        self.browser = helpers.browser
         self.helpers = helpers
         self.sel = selectors
         self.log = log_func
@@ -46,7 +48,7 @@ class BtgOffshoreActions:
 
     def _click_with_fallback(self, locator) -> bool:
         try:
-            self.helpers.click_element(*locator)
+            self.helpers.sync.click_element(*locator)
             return True
         except Exception:
             pass
@@ -71,13 +73,13 @@ class BtgOffshoreActions:
         return None
 
     def _wait_enabled(self, locator, timeout: Optional[int] = None):
-        el = self.helpers.find_element(*locator)
-        self.helpers.wait_until(lambda d: el.is_displayed() and el.is_enabled(), timeout=timeout)
+        el = self.helpers.sync.find_element(*locator)
+        self.helpers.sync.wait_until(lambda d: el.is_displayed() and el.is_enabled(), timeout=timeout)
         return el
 
     def _wait_any_visible(self, locators, timeout_msg: str):
         try:
-            return self.helpers.wait_until(
+            return self.helpers.sync.wait_until(
                 lambda d: any(
                     el.is_displayed()
                     for loc in locators
@@ -109,6 +111,20 @@ class BtgOffshoreActions:
         except Exception:
             return False
 
+    def _click_overlay_close_buttons(self) -> int:
+        clicked = 0
+        for ov in self.driver.find_elements(*self.sel.MODAL_OVERLAY):
+            try:
+                btns = ov.find_elements(*self.sel.MODAL_CLOSE_BUTTON)
+                for btn in btns:
+                    if btn.is_displayed() and btn.is_enabled():
+                        btn.click()
+                        clicked += 1
+                        break
+            except Exception:
+                continue
+        return clicked
+
     def _wait_overlay_gone(self, timeout_seconds: int = 15) -> bool:
         deadline = time.time() + timeout_seconds
         while time.time() < deadline:
@@ -120,120 +136,116 @@ class BtgOffshoreActions:
     async def dismiss_modal_overlay(self, context: str = "", wait_seconds: int = 15) -> None:
         if wait_seconds > 0:
             deadline = time.time() + wait_seconds
-            while time.time() < deadline and not self._overlay_visible():
-                time.sleep(0.25)
-        if not self._overlay_visible():
+            while time.time() < deadline and not await self.browser.run(self._overlay_visible):
+                await asyncio.sleep(0.25)
+        if not await self.browser.run(self._overlay_visible):
             return
 
         suffix = f" ({context})" if context else ""
         await self.log(f"INFO Modal overlay detected{suffix}")
 
         for _ in range(3):
-            if not self._overlay_visible():
+            if not await self.browser.run(self._overlay_visible):
                 return
 
-            overlay_state = self._overlay_state()
+            overlay_state = await self.browser.run(self._overlay_state)
             if overlay_state.get("generic") and not overlay_state.get("modal"):
                 await self.log("INFO Generic overlay visible, waiting to clear before close")
-                self._wait_overlay_gone()
-                if self._overlay_visible():
-                    if self._remove_generic_overlay_js():
+                await self.browser.run(self._wait_overlay_gone)
+                if await self.browser.run(self._overlay_visible):
+                    if await self.browser.run(self._remove_generic_overlay_js):
                         await self.log("WARN Generic overlay removed via JS fallback")
                     return
 
             if overlay_state.get("modal"):
-                overlays = self.driver.find_elements(*self.sel.MODAL_OVERLAY)
-                for ov in overlays:
-                    try:
-                        btns = ov.find_elements(*self.sel.MODAL_CLOSE_BUTTON)
-                        for btn in btns:
-                            if btn.is_displayed() and btn.is_enabled():
-                                btn.click()
-                                await self.log("OK Dismissed modal (Close button in overlay)")
-                                break
-                    except Exception:
-                        continue
-                if not self._overlay_visible():
+                clicked = await self.browser.run(self._click_overlay_close_buttons)
+                for _ in range(clicked):
+                    await self.log("OK Dismissed modal (Close button in overlay)")
+                if not await self.browser.run(self._overlay_visible):
                     return
 
-            if self._click_if_visible(self.sel.MODAL_CLOSE_BUTTON):
+            if await self.browser.run(self._click_if_visible, self.sel.MODAL_CLOSE_BUTTON):
                 await self.log("OK Dismissed modal (Close button)")
-            elif self._click_if_visible(self.sel.MODAL_CLOSE):
+            elif await self.browser.run(self._click_if_visible, self.sel.MODAL_CLOSE):
                 await self.log("OK Dismissed modal (Close icon/btn)")
-            elif self._click_if_visible(self.sel.DONT_SHOW_AGAIN):
+            elif await self.browser.run(self._click_if_visible, self.sel.DONT_SHOW_AGAIN):
                 await self.log("OK Dismissed modal (Don't show again)")
-            elif self._click_if_visible(self.sel.MODAL_SKIP):
+            elif await self.browser.run(self._click_if_visible, self.sel.MODAL_SKIP):
                 await self.log("OK Dismissed modal (Skip/Close text)")
 
-            time.sleep(1)
+            await asyncio.sleep(1)
 
-        if self._overlay_visible():
-            if self._wait_overlay_gone():
+        if await self.browser.run(self._overlay_visible):
+            if await self.browser.run(self._wait_overlay_gone):
                 await self.log("OK Modal overlay gone after close")
                 return
 
-        if self._overlay_visible() and self._is_visible(self.sel.GENERIC_OVERLAY):
-            if self._remove_generic_overlay_js():
+        generic_visible = await self.browser.run(
+            lambda: self._overlay_visible() and self._is_visible(self.sel.GENERIC_OVERLAY)
+        )
+        if generic_visible:
+            if await self.browser.run(self._remove_generic_overlay_js):
                 await self.log("WARN Generic overlay removed via JS fallback")
 
-        if self._overlay_visible():
-            overlays = self.driver.find_elements(*self.sel.MODAL_OVERLAY)
+        if await self.browser.run(self._overlay_visible):
+            overlays = await self.browser.find_elements(*self.sel.MODAL_OVERLAY)
             if overlays:
                 try:
-                    self.driver.execute_script("arguments[0].click();", overlays[-1])
-                    time.sleep(1)
+                    await self.browser.execute_script("arguments[0].click();", overlays[-1])
+                    await asyncio.sleep(1)
                 except Exception:
                     pass
 
-        if self._overlay_visible():
-            overlays = self.driver.find_elements(*self.sel.GENERIC_OVERLAY)
+        if await self.browser.run(self._overlay_visible):
+            overlays = await self.browser.find_elements(*self.sel.GENERIC_OVERLAY)
             if overlays:
                 try:
-                    self.driver.execute_script("arguments[0].click();", overlays[-1])
-                    time.sleep(1)
+                    await self.browser.execute_script("arguments[0].click();", overlays[-1])
+                    await asyncio.sleep(1)
                 except Exception:
                     pass
 
-        if self._overlay_visible():
-            self._wait_overlay_gone()
+        if await self.browser.run(self._overlay_visible):
+            await self.browser.run(self._wait_overlay_gone)
 
-        if self._overlay_visible():
+        if await self.browser.run(self._overlay_visible):
             await self.log("WARN Modal overlay still visible after attempts")
 
     # ========== NAVIGATION ==========
 
     async def navigate_to_login(self, url: str) -> None:
         await self.log(f"NAVIGATE: {url}")
-        self.driver.get(url)
+        await self.browser.get(url)
 
     async def click_portal_global(self) -> None:
-        before_handles = set(self.driver.window_handles)
+        before_handles = set(await self.browser.run(lambda: self.driver.window_handles))
         deadline = time.time() + 12
         while time.time() < deadline:
-            el = self._find_first_visible(
-                [self.sel.PORTAL_GLOBAL_CARD, self.sel.PORTAL_GLOBAL, self.sel.PORTAL_GLOBAL_ALT]
+            el = await self.browser.run(
+                self._find_first_visible,
+                [self.sel.PORTAL_GLOBAL_CARD, self.sel.PORTAL_GLOBAL, self.sel.PORTAL_GLOBAL_ALT],
             )
             if el:
                 try:
-                    el.click()
+                    await self.browser.run(el.click)
                 except Exception:
-                    self.driver.execute_script("arguments[0].scrollIntoView(true);", el)
-                    self.driver.execute_script("arguments[0].click();", el)
-                self._switch_to_new_window(before_handles)
+                    await self.browser.execute_script("arguments[0].scrollIntoView(true);", el)
+                    await self.browser.execute_script("arguments[0].click();", el)
+                await self.browser.run(self._switch_to_new_window, before_handles)
                 await self.log("OK Portal Global clicked")
                 return
 
-            if self._is_visible(self.sel.EMAIL):
+            if await self.browser.run(self._is_visible, self.sel.EMAIL):
                 await self.log("INFO Global login form visible, skipping Portal Global")
                 return
 
-            time.sleep(0.5)
+            await asyncio.sleep(0.5)
 
         await self.log("WARN Portal Global not visible after wait, continuing")
 
     def _switch_to_new_window(self, before_handles) -> None:
         try:
-            self.helpers.wait_until(lambda d: len(d.window_handles) > len(before_handles))
+            self.helpers.sync.wait_until(lambda d: len(d.window_handles) > len(before_handles))
         except Exception:
             return
 
@@ -243,21 +255,21 @@ class BtgOffshoreActions:
                 return
 
     async def wait_for_login_form(self) -> None:
-        self.helpers.wait_for_visible(*self.sel.EMAIL)
+        await self.helpers.wait_for_visible(*self.sel.EMAIL)
         await self.log("OK Login form visible")
 
     # ========== LOGIN ==========
 
     async def fill_credentials(self, email: str, password: str) -> None:
-        email_input = self.helpers.wait_for_visible(*self.sel.EMAIL)
-        password_input = self.helpers.wait_for_visible(*self.sel.PASSWORD)
+        email_input = await self.helpers.wait_for_visible(*self.sel.EMAIL)
+        password_input = await self.helpers.wait_for_visible(*self.sel.PASSWORD)
 
-        self._type_human(email_input, email)
-        self._type_human(password_input, password)
+        await self.browser.run(self._type_human, email_input, email)
+        await self.browser.run(self._type_human, password_input, password)
         await self.log("OK Credentials filled")
 
-        sign_in_btn = self._wait_enabled(self.sel.SIGN_IN)
-        sign_in_btn.click()
+        sign_in_btn = await self.browser.run(self._wait_enabled, self.sel.SIGN_IN)
+        await self.browser.run(sign_in_btn.click)
         await self.log("OK Sign in submitted")
 
     # ========== OTP ==========
@@ -266,18 +278,21 @@ class BtgOffshoreActions:
         await self.log("INFO OTP already sent, waiting for user input")
 
     async def wait_for_otp(self, timeout_seconds: int = 240) -> None:
-        self.helpers.wait_for_element(*self.sel.OTP_CODE)
+        await self.helpers.wait_for_element(*self.sel.OTP_CODE)
         await self.log("INFO Waiting for OTP entry")
 
-        continue_btn = self._wait_enabled(self.sel.OTP_CONTINUE, timeout=timeout_seconds)
-        continue_btn.click()
+        continue_btn = await self.browser.run(
+            self._wait_enabled, self.sel.OTP_CONTINUE, timeout=timeout_seconds
+        )
+        await self.browser.run(continue_btn.click)
         await self.log("OK OTP continued")
 
     # ========== ACCESS ==========
 
     async def wait_for_access_screen(self) -> None:
         try:
-            self._wait_any_visible(
+            await self.browser.run(
+                self._wait_any_visible,
                 [self.sel.COUNTRY_US, self.sel.ACCOUNT_CHECKBOXES],
                 "Access screen not visible after OTP.",
             )
@@ -287,8 +302,8 @@ class BtgOffshoreActions:
 
     async def select_country_us(self) -> None:
         try:
-            self.helpers.wait_for_visible(*self.sel.COUNTRY_US)
-            self.helpers.click_element(*self.sel.COUNTRY_US)
+            await self.helpers.wait_for_visible(*self.sel.COUNTRY_US)
+            await self.helpers.click_element(*self.sel.COUNTRY_US)
             await self.log("OK Country selected: United States")
         except TimeoutException:
             await self.log("WARN Country tab not visible: United States")
@@ -297,22 +312,22 @@ class BtgOffshoreActions:
         """Selects all available accounts using JS click for reliability."""
         try:
             # Try specific "Select All" checkbox first
-            total_chk = self.driver.find_elements(*self.sel.CHECKBOX_TOTAL)
+            total_chk = await self.browser.find_elements(*self.sel.CHECKBOX_TOTAL)
             if total_chk:
-                self.log("INFO Found Total Checkbox, attempting click...")
+                await self.log("INFO Found Total Checkbox, attempting click...")
                 # Use JS click as the input might be hidden/overlayed
-                self.driver.execute_script("arguments[0].click();", total_chk[0])
-                time.sleep(1) # Wait for UI to update
+                await self.browser.execute_script("arguments[0].click();", total_chk[0])
+                await asyncio.sleep(1) # Wait for UI to update
                 await self.log("OK Total Checkbox clicked")
                 return
 
             # Fallback to individual checkboxes
             await self.log("INFO Total Checkbox not found, selecting individually")
-            checkboxes = self.driver.find_elements(*self.sel.ACCOUNT_CHECKBOXES)
+            checkboxes = await self.browser.find_elements(*self.sel.ACCOUNT_CHECKBOXES)
             clicked_count = 0
             for chk in checkboxes:
-                if not chk.is_selected():
-                    self.driver.execute_script("arguments[0].click();", chk)
+                if not await self.browser.run(chk.is_selected):
+                    await self.browser.execute_script("arguments[0].click();", chk)
                     clicked_count += 1
             
             if clicked_count > 0:
@@ -324,11 +339,11 @@ class BtgOffshoreActions:
             await self.log(f"WARN Error selecting accounts: {e}")
 
     async def submit_access(self) -> None:
-        access_btn = self._wait_enabled(self.sel.ACCESS_BTN)
+        access_btn = await self.browser.run(self._wait_enabled, self.sel.ACCESS_BTN)
         try:
-            access_btn.click()
+            await self.browser.run(access_btn.click)
         except Exception:
-            self.driver.execute_script("arguments[0].click();", access_btn)
+            await self.browser.execute_script("arguments[0].click();", access_btn)
         await self.log("OK Access submitted")
         await self.dismiss_modal_overlay("post-access", wait_seconds=6)
 
@@ -336,72 +351,72 @@ class BtgOffshoreActions:
 
     async def open_start_date_input(self) -> None:
         await self.dismiss_modal_overlay("before start date input")
-        self._click_with_fallback(self.sel.DATE_INPUT)
+        await self.browser.run(self._click_with_fallback, self.sel.DATE_INPUT)
         await self.log("OK Start date input opened")
 
     async def select_calendar_date(self, date_str: str) -> None:
         day_cell = (By.XPATH, f"//td[@title='{date_str}']")
-        self._click_with_fallback(day_cell)
+        await self.browser.run(self._click_with_fallback, day_cell)
         await self.log(f"OK Date selected: {date_str}")
 
     async def open_check_all_anchor(self) -> None:
-        if self._click_with_fallback(self.sel.CHECK_ALL_ANCHOR):
+        if await self.browser.run(self._click_with_fallback, self.sel.CHECK_ALL_ANCHOR):
             await self.log("OK Check all opened")
         else:
             await self.log("INFO Check all already open or not visible")
 
     async def open_export_options(self) -> None:
-        self._click_with_fallback(self.sel.EXPORT_OPTIONS_BTN)
+        await self.browser.run(self._click_with_fallback, self.sel.EXPORT_OPTIONS_BTN)
         await self.log("OK Export options opened")
 
     async def select_export_all(self) -> None:
-        self._click_with_fallback(self.sel.EXPORT_ALL_OPTION)
+        await self.browser.run(self._click_with_fallback, self.sel.EXPORT_ALL_OPTION)
         await self.log("OK Export all selected")
 
     async def open_portfolio(self) -> None:
-        if not self._is_visible(self.sel.SIDEBAR_PORTFOLIO):
-            self._click_if_visible(self.sel.SIDEBAR_TOGGLE)
-        self._click_with_fallback(self.sel.SIDEBAR_PORTFOLIO)
+        if not await self.browser.run(self._is_visible, self.sel.SIDEBAR_PORTFOLIO):
+            await self.browser.run(self._click_if_visible, self.sel.SIDEBAR_TOGGLE)
+        await self.browser.run(self._click_with_fallback, self.sel.SIDEBAR_PORTFOLIO)
         await self.log("OK Portfolio opened")
 
     async def click_portfolio_check_all(self) -> None:
-        self._click_with_fallback(self.sel.PORTFOLIO_CHECK_ALL)
+        await self.browser.run(self._click_with_fallback, self.sel.PORTFOLIO_CHECK_ALL)
         await self.log("OK Portfolio check all selected")
 
     async def open_filters(self) -> None:
-        self._click_with_fallback(self.sel.FILTERS_BTN)
+        await self.browser.run(self._click_with_fallback, self.sel.FILTERS_BTN)
         await self.log("OK Filters opened")
 
     async def open_time_period(self) -> None:
-        self._click_with_fallback(self.sel.TIME_PERIOD)
+        await self.browser.run(self._click_with_fallback, self.sel.TIME_PERIOD)
         await self.log("OK Time Period opened")
 
     async def select_custom_period(self) -> None:
-        self._click_with_fallback(self.sel.CUSTOM_PERIOD)
+        await self.browser.run(self._click_with_fallback, self.sel.CUSTOM_PERIOD)
         await self.log("OK Custom period selected")
 
     async def set_custom_period_dates(self, date_str: str) -> None:
-        date_inputs = self.driver.find_elements(*self.sel.CUSTOM_DATE_INPUTS)
+        date_inputs = await self.browser.find_elements(*self.sel.CUSTOM_DATE_INPUTS)
         if len(date_inputs) >= 2:
-            date_inputs[0].click()
+            await self.browser.run(date_inputs[0].click)
             await self.select_calendar_date(date_str)
-            date_inputs[1].click()
+            await self.browser.run(date_inputs[1].click)
             await self.select_calendar_date(date_str)
         else:
-            self._click_with_fallback(self.sel.CUSTOM_DATE_INPUTS)
+            await self.browser.run(self._click_with_fallback, self.sel.CUSTOM_DATE_INPUTS)
             await self.select_calendar_date(date_str)
         await self.log(f"OK Custom period dates set: {date_str}")
 
     async def click_filter(self) -> None:
-        self._click_with_fallback(self.sel.FILTER_BTN)
+        await self.browser.run(self._click_with_fallback, self.sel.FILTER_BTN)
         await self.log("OK Filter applied")
 
     async def click_export(self) -> None:
-        self._click_with_fallback(self.sel.EXPORT_BTN)
+        await self.browser.run(self._click_with_fallback, self.sel.EXPORT_BTN)
         await self.log("OK Export requested")
 
     async def click_download(self) -> None:
-        self._click_with_fallback(self.sel.DOWNLOAD_BTN)
+        await self.browser.run(self._click_with_fallback, self.sel.DOWNLOAD_BTN)
         await self.log("OK Download started")
 
     def _type_human(self, el, value: str) -> None:
@@ -419,18 +434,18 @@ class BtgOffshoreActions:
             await self.log("OK Changed custody to Cayman Islands")
 
     async def open_profile_menu(self) -> bool:
-        if self._click_if_visible(self.sel.PROFILE_MENU):
+        if await self.browser.run(self._click_if_visible, self.sel.PROFILE_MENU):
             await self.log("OK Profile menu opened")
             return True
         await self.log("WARN Profile menu not visible")
         return False
 
     async def click_change_custody(self) -> None:
-        self._click_with_fallback(self.sel.CHANGE_CUSTODY)
+        await self.browser.run(self._click_with_fallback, self.sel.CHANGE_CUSTODY)
         await self.log("OK Change custody clicked")
 
     async def select_cayman_country(self) -> None:
-        self._click_with_fallback(self.sel.COUNTRY_CAYMAN)
+        await self.browser.run(self._click_with_fallback, self.sel.COUNTRY_CAYMAN)
         await self.log("OK Cayman Islands selected")
 
     # ========== LOGOUT ==========
@@ -441,7 +456,7 @@ class BtgOffshoreActions:
             await self.log("OK Signed out")
 
     async def click_sign_out(self) -> None:
-        self._click_with_fallback(self.sel.SIGN_OUT)
+        await self.browser.run(self._click_with_fallback, self.sel.SIGN_OUT)
         await self.log("OK Sign out clicked")
 
     # ========== EXPORT METHODS ==========
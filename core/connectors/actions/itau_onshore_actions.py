@@ -3,41 +3,56 @@ Módulo de ações específicas para o conector Itaú Onshore.
 Encapsula toda a lógica de interação com o portal em métodos reutilizáveis.
 """
 
-import asyncio
-from typing import Callable
+import os
+from typing import Callable, Optional
 from selenium.webdriver.remote.webdriver import WebDriver
-from core.connectors.helpers.selenium_helpers import SeleniumHelpers
+from core.connectors.helpers.async_driver import AsyncSeleniumHelpers
+from core.services.download_watcher import DownloadWatcher, run_download_dirs
 from core.connectors.seletores.itau_onshore import SeletorItauOnshore
 from core.connectors.utils.digital_keyboard_utils import build_digit_to_button_map
 
 
 class ItauOnshoreActions:
     """Encapsula ações específicas do portal Itaú Onshore."""
+
+    DOWNLOAD_TIMEOUT_SECONDS = 60
     
     def __init__(
         self,
         driver: WebDriver,
-        helpers: SeleniumHelpers,
+        helpers: AsyncSeleniumHelpers,
         selectors: SeletorItauOnshore,
-        log_func: Callable
+        log_func: Callable,
+        run_id: Optional[str] = None,
     ):
         """
         Inicializa as ações do Itaú Onshore.
         
         Args:
-            driver: Instância do WebDriver
-            helpers: Instância de SeleniumHelpers
+            driver: Instância do WebDriver (usada apenas na thread da sessão)
+            helpers: Instância de AsyncSeleniumHelpers
             selectors: Instância de SeletorItauOnshore
             log_func: Função assíncrona para logging
+            run_id: ID do run (localiza a pasta de downloads)
         """
         self.driver = driver
+        self.browser = helpers.browser
         self.helpers = helpers
         self.sel = selectors
         self.log = log_func
+        self.run_id = run_id
+
+    async def _wait_for_download(self, watcher: DownloadWatcher) -> None:
+        """Aguarda o arquivo exportado terminar de baixar (no máximo DOWNLOAD_TIMEOUT_SECONDS)."""
+        files = await watcher.wait_async(count=1, timeout_seconds=self.DOWNLOAD_TIMEOUT_SECONDS)
+        if files:
+            await self.log(f"OK Download concluido: {', '.join(os.path.basename(path) for path in files)}")
+        else:
+            await self.log(f"WARN Nenhum download concluido em {self.DOWNLOAD_TIMEOUT_SECONDS}s")
 
     def _click_with_fallback(self, locator) -> bool:
         try:
-            self.helpers.click_element(*locator)
+            self.helpers.sync.click_element(*locator)
             return True
         except Exception:
             pass
@@ -53,18 +68,23 @@ class ItauOnshoreActions:
             pass
 
         return False
+
+    def _check_all_visible(self, locator) -> None:
+        for chk in self.driver.find_elements(*locator):
+            if chk.is_displayed() and chk.is_enabled() and not chk.is_selected():
+                chk.click()
     
     # ========== NAVEGAÇÃO ==========
     
     async def navigate_to_login(self, url: str) -> None:
         """Navega para a página de login do Itaú."""
         await self.log(f"NAVIGATE: {url}")
-        self.driver.get(url)
+        await self.browser.get(url)
     
     async def open_more_access_modal(self) -> None:
         """Abre o modal de acesso com agência e conta."""
         await self.log("Abrindo modal de acesso...")
-        self.helpers.click_any_element(
+        await self.helpers.click_any_element(
             self.sel.MORE_ACCESS_BTN[0],
             [self.sel.MORE_ACCESS_BTN[1], self.sel.MORE_ACCESS_BTN_ZOOM[1]]
         )
@@ -81,27 +101,27 @@ class ItauOnshoreActions:
             account: Número da conta
         """
         await self.log(f"Preenchendo agência: {agency}")
-        self.helpers.send_keys(*self.sel.AGENCY, agency)
+        await self.helpers.send_keys(*self.sel.AGENCY, agency)
         
         await self.log(f"Preenchendo conta: {account}")
-        self.helpers.send_keys(*self.sel.ACCOUNT, account)
+        await self.helpers.send_keys(*self.sel.ACCOUNT, account)
         
         await self.log("OK Agência e conta preenchidas")
     
     async def submit_access(self) -> None:
         """Clica no botão de acessar após preencher agência e conta."""
         await self.log("Clicando em Acessar...")
-        if not self._click_with_fallback(self.sel.SUBMIT_MORE_ACCESS):
+        if not await self.browser.run(self._click_with_fallback, self.sel.SUBMIT_MORE_ACCESS):
             await self.log("Fallback: Tentando botão alternativo...")
-            self._click_with_fallback(self.sel.ACCESS_FALLBACK)
+            await self.browser.run(self._click_with_fallback, self.sel.ACCESS_FALLBACK)
         await self.log("OK Acesso enviado")
     
     async def select_assessores_profile(self) -> None:
         """Seleciona o perfil de Assessores."""
         await self.log("Selecionando perfil Assessores...")
-        if not self._click_with_fallback(self.sel.ASSESSORES_BTN):
+        if not await self.browser.run(self._click_with_fallback, self.sel.ASSESSORES_BTN):
             await self.log("Fallback: Tentando link ASSESSORES...")
-            self._click_with_fallback(self.sel.ASSESSORES_LINK)
+            await self.browser.run(self._click_with_fallback, self.sel.ASSESSORES_LINK)
         await self.log("OK Perfil Assessores selecionado")
     
     async def fill_cpf(self, cpf: str) -> None:
@@ -112,13 +132,13 @@ class ItauOnshoreActions:
             cpf: CPF do assessor
         """
         await self.log(f"Preenchendo CPF: {cpf[:3]}.***.***-**")
-        self.helpers.send_keys(*self.sel.CPF, cpf)
+        await self.helpers.send_keys(*self.sel.CPF, cpf)
         await self.log("OK CPF preenchido")
     
     async def submit_cpf(self) -> None:
         """Clica no botão de submit após preencher o CPF."""
         await self.log("Enviando CPF...")
-        self._click_with_fallback(self.sel.SUBMIT_BTN)
+        await self.browser.run(self._click_with_fallback, self.sel.SUBMIT_BTN)
         await self.log("OK CPF enviado")
     
     async def fill_password_keyboard(self, password: str) -> None:
@@ -129,23 +149,23 @@ class ItauOnshoreActions:
             password: Senha numérica
         """
         await self.log("Aguardando teclado digital...")
-        self.helpers.wait_for_element(*self.sel.KEYBOARD)
+        await self.helpers.wait_for_element(*self.sel.KEYBOARD)
         
         await self.log("Mapeando teclado digital...")
-        digit_to_btn = build_digit_to_button_map(self.driver)
+        digit_to_btn = await self.browser.run(build_digit_to_button_map, self.driver)
         
         await self.log("Preenchendo senha...")
         for digit in password:
             btn = digit_to_btn[digit]
-            self.helpers.wait_until(lambda d: btn.is_enabled())
-            btn.click()
+            await self.helpers.wait_until(lambda d: btn.is_enabled())
+            await self.browser.run(btn.click)
         
         await self.log("OK Senha preenchida")
     
     async def submit_password(self) -> None:
         """Clica no botão de continuar após preencher a senha."""
         await self.log("Enviando senha...")
-        self._click_with_fallback(self.sel.SUBMIT_BTN)
+        await self.browser.run(self._click_with_fallback, self.sel.SUBMIT_BTN)
         await self.log("OK Senha enviada")
     
     # ========== MENU E NAVEGAÇÃO INTERNA ==========
@@ -153,73 +173,71 @@ class ItauOnshoreActions:
     async def open_menu(self) -> None:
         """Abre o menu principal (hover)."""
         await self.log("Abrindo menu principal...")
-        self.helpers.hover_element(*self.sel.MENU)
+        await self.helpers.hover_element(*self.sel.MENU)
         await self.log("OK Menu aberto")
     
     async def navigate_to_posicao_diaria(self) -> None:
         """Navega para a página de Posição Diária."""
         await self.log("Navegando para Posição Diária...")
-        self._click_with_fallback(self.sel.POSICAO_DIARIA)
+        await self.browser.run(self._click_with_fallback, self.sel.POSICAO_DIARIA)
 
         await self.log("OK Posição Diária carregada")
     
     async def navigate_to_conta_corrente(self) -> None:
         """Navega para a pagina de Conta Corrente."""
         await self.log("Navegando para Conta Corrente...")
-        self._click_with_fallback(self.sel.CONTA_CORRENTE)
+        await self.browser.run(self._click_with_fallback, self.sel.CONTA_CORRENTE)
         await self.log("OK Conta Corrente carregada")
 
     async def open_extrato(self) -> None:
         """Abre a pagina de Extrato."""
         await self.log("Abrindo extrato...")
-        self._click_with_fallback(self.sel.EXTRATO)
+        await self.browser.run(self._click_with_fallback, self.sel.EXTRATO)
         await self.log("OK Extrato aberto")
 
     async def set_extrato_date_range(self, start_date: str, end_date: str) -> None:
         """Define data inicial e final do extrato."""
         await self.log("Selecionando periodo personalizado...")
-        self._click_with_fallback(self.sel.EXTRATO_PERIODO_TRIGGER)
-        option = self.helpers.wait_for_visible(*self.sel.EXTRATO_PERIODO_PERSONALIZADO)
-        self.helpers.wait_until(lambda d: option.is_enabled())
-        option.click()
+        await self.browser.run(self._click_with_fallback, self.sel.EXTRATO_PERIODO_TRIGGER)
+        option = await self.helpers.wait_for_visible(*self.sel.EXTRATO_PERIODO_PERSONALIZADO)
+        await self.helpers.wait_until(lambda d: option.is_enabled())
+        await self.browser.run(option.click)
 
         await self.log(f"Definindo periodo do extrato: {start_date} - {end_date}")
-        self.helpers.clear_and_send_keys(*self.sel.EXTRATO_DATE_INICIAL, start_date)
-        self.helpers.clear_and_send_keys(*self.sel.EXTRATO_DATE_FINAL, end_date)
+        await self.helpers.clear_and_send_keys(*self.sel.EXTRATO_DATE_INICIAL, start_date)
+        await self.helpers.clear_and_send_keys(*self.sel.EXTRATO_DATE_FINAL, end_date)
         await self.log("OK Periodo do extrato definido")
 
     async def apply_extrato_filter(self) -> None:
         """Aplica filtro do extrato."""
         await self.log("Aplicando filtro do extrato...")
-        btn = self.helpers.find_element(*self.sel.EXTRATO_FILTRAR)
-        self.helpers.wait_until(lambda d: btn.is_enabled())
-        btn.click()
-        self.helpers.wait_for_invisibility(*self.sel.EXTRATO_LOADING)
+        btn = await self.helpers.find_element(*self.sel.EXTRATO_FILTRAR)
+        await self.helpers.wait_until(lambda d: btn.is_enabled())
+        await self.browser.run(btn.click)
+        await self.helpers.wait_for_invisibility(*self.sel.EXTRATO_LOADING)
         # Aguarda atualizacao da pagina/resultado
-        export_menu = self.helpers.find_element(*self.sel.EXTRATO_EXPORT_MENU)
-        self.helpers.wait_until(lambda d: export_menu.is_displayed() and export_menu.is_enabled())
+        export_menu = await self.helpers.find_element(*self.sel.EXTRATO_EXPORT_MENU)
+        await self.helpers.wait_until(lambda d: export_menu.is_displayed() and export_menu.is_enabled())
         await self.log("OK Filtro aplicado")
 
     async def export_history(self) -> None:
         """Exporta extrato para Excel."""
         await self.log("Exportando extrato para Excel...")
         # Aguarda o loading sumir para nao interceptar o clique
-        self.helpers.wait_for_invisibility(*self.sel.EXTRATO_LOADING)
-        self._click_with_fallback(self.sel.EXTRATO_EXPORT_MENU)
-        self._click_with_fallback(self.sel.EXTRATO_EXPORT_EXCEL)
+        await self.helpers.wait_for_invisibility(*self.sel.EXTRATO_LOADING)
+        await self.browser.run(self._click_with_fallback, self.sel.EXTRATO_EXPORT_MENU)
+        await self.browser.run(self._click_with_fallback, self.sel.EXTRATO_EXPORT_EXCEL)
 
         try:
-            checks = self.driver.find_elements(*self.sel.EXTRATO_EXCEL_CHECKBOXES)
-            for chk in checks:
-                if chk.is_displayed() and chk.is_enabled() and not chk.is_selected():
-                    chk.click()
+            await self.browser.run(self._check_all_visible, self.sel.EXTRATO_EXCEL_CHECKBOXES)
         except Exception:
             pass
 
-        self._click_with_fallback(self.sel.EXTRATO_EXCEL_SAVE)
-        await self.log("OK Exportacao do extrato iniciada")
-        await self.log("Aguardando 15s para download...")
-        await asyncio.sleep(15)
+        with DownloadWatcher(run_download_dirs(self.run_id)) as watcher:
+            await self.browser.run(self._click_with_fallback, self.sel.EXTRATO_EXCEL_SAVE)
+            await self.log("OK Exportacao do extrato iniciada")
+            await self.log("Aguardando download...")
+            await self._wait_for_download(watcher)
 
     # ========== RELATÓRIOS ==========
     
@@ -232,7 +250,7 @@ class ItauOnshoreActions:
         """
         await self.log(f"Alterando data para: {date_str}")
         
-        self.helpers.set_angular_datepicker(
+        await self.helpers.set_angular_datepicker(
             trigger_locator=self.sel.DATEPICKER_TRIGGER,
             overlay_locator=self.sel.DATEPICKER_OVERLAY,
             day_selector_template=self.sel.DATEPICKER_DAY_BUTTON,
@@ -248,26 +266,27 @@ class ItauOnshoreActions:
     async def export_holdings(self) -> None:
         """Exporta o relatrio para Excel."""
         await self.log("Exportando para Excel...")
-        try:
-            self.helpers.click_element_maybe_shadow(*self.sel.EXPORT_EXCEL_BTN)
-        except Exception:
-            await self.log("Fallback: botao Excel nao encontrado, tentando alternativos...")
+        with DownloadWatcher(run_download_dirs(self.run_id)) as watcher:
             try:
-                self._click_with_fallback(self.sel.EXPORT_EXCEL_BTN_ALT)
+                await self.helpers.click_element_maybe_shadow(*self.sel.EXPORT_EXCEL_BTN)
             except Exception:
-                # Fluxo alternativo: selecionar Excel e confirmar download
-                self._click_with_fallback(self.sel.EXCEL)
-                self._click_with_fallback(self.sel.BAIXAR)
-        await self.log("OK Exportacao iniciada")
-        await self.log("Aguardando 15s para download...")
-        await asyncio.sleep(15)
+                await self.log("Fallback: botao Excel nao encontrado, tentando alternativos...")
+                try:
+                    await self.browser.run(self._click_with_fallback, self.sel.EXPORT_EXCEL_BTN_ALT)
+                except Exception:
+                    # Fluxo alternativo: selecionar Excel e confirmar download
+                    await self.browser.run(self._click_with_fallback, self.sel.EXCEL)
+                    await self.browser.run(self._click_with_fallback, self.sel.BAIXAR)
+            await self.log("OK Exportacao iniciada")
+            await self.log("Aguardando download...")
+            await self._wait_for_download(watcher)
 
     # ========== LOGOUT ==========
 
     async def logout(self) -> None:
         """Realiza logout do sistema."""
         await self.log("Iniciando logout...")
-        self._click_with_fallback(self.sel.SAIR)
+        await self.browser.run(self._click_with_fallback, self.sel.SAIR)
         await self.log("Confirmando logout...")
-        self._click_with_fallback(self.sel.SAIR_SIM)
+        await self.browser.run(self._click_with_fallback, self.sel.SAIR_SIM)
         await self.log(" Logout realizado")
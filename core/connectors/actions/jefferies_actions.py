@@ -3,10 +3,11 @@ Actions module for Jefferies connector.
 Encapsulates portal interactions into reusable methods.
 """
 
+import asyncio
 from typing import Callable
 from selenium.webdriver.remote.webdriver import WebDriver
 
-from core.connectors.helpers.selenium_helpers import SeleniumHelpers
+from core.connectors.helpers.async_driver import AsyncSeleniumHelpers
 from core.connectors.seletores.jefferies import SeletorJefferies
 
 
@@ -16,11 +17,12 @@ class JefferiesActions:
     def __init__(
         self,
         driver: WebDriver,
-        helpers: SeleniumHelpers,
+        helpers: AsyncSeleniumHelpers,
         selectors: SeletorJefferies,
         log_func: Callable,
     ):
         self.driver = driver
+        self.browser = helpers.browser
         self.helpers = helpers
         self.sel = selectors
         self.log = log_func
@@ -38,13 +40,13 @@ class JefferiesActions:
         return False
 
     def _wait_enabled(self, locator, timeout: int = None):
-        el = self.helpers.find_element(*locator)
-        self.helpers.wait_until(lambda d: el.is_displayed() and el.is_enabled(), timeout=timeout)
+        el = self.helpers.sync.find_element(*locator)
+        self.helpers.sync.wait_until(lambda d: el.is_displayed() and el.is_enabled(), timeout=timeout)
         return el
 
     def _click_with_fallback(self, locator) -> bool:
         try:
-            self.helpers.click_element(*locator)
+            self.helpers.sync.click_element(*locator)
             return True
         except Exception:
             pass
@@ -62,7 +64,7 @@ class JefferiesActions:
 
     def _wait_for_data(self, rows_locator, timeout: int = 40) -> bool:
         try:
-            self.helpers.wait_for_invisibility(*self.sel.LOADING_SPINNER)
+            self.helpers.sync.wait_for_invisibility(*self.sel.LOADING_SPINNER)
         except Exception:
             pass
 
@@ -71,14 +73,14 @@ class JefferiesActions:
             return any(row.is_displayed() for row in rows)
 
         try:
-            self.helpers.wait_until(_has_rows)
+            self.helpers.sync.wait_until(_has_rows)
             return True
         except Exception:
             return False
 
     def _wait_for_export_ready(self, timeout: int = 40) -> None:
         try:
-            self.helpers.wait_for_invisibility(*self.sel.LOADING_SPINNER)
+            self.helpers.sync.wait_for_invisibility(*self.sel.LOADING_SPINNER)
         except Exception:
             pass
 
@@ -86,73 +88,76 @@ class JefferiesActions:
             btn = self.driver.find_element(*self.sel.DOWNLOAD_BTN)
             return btn.is_displayed() and btn.is_enabled()
 
-        self.helpers.wait_until(_download_ready)
+        self.helpers.sync.wait_until(_download_ready)
 
     # ========== NAVIGATION ==========
 
     async def navigate_to_login(self, url: str) -> None:
         await self.log(f"NAVIGATE: {url}")
-        self.driver.get(url)
+        await self.browser.get(url)
         try:
-            self.helpers.wait_ready_state()
+            await self.helpers.wait_ready_state()
         except Exception:
             pass
 
     async def accept_cookies_if_needed(self) -> None:
-        if self._click_if_visible(self.sel.COOKIES_ACCEPT):
+        if await self.browser.run(self._click_if_visible, self.sel.COOKIES_ACCEPT):
             await self.log("OK Cookies accepted")
             # Wait for banner to disappear to avoid interception
             try:
-                self.helpers.wait_for_invisibility((By.ID, "onetrust-consent-sdk"))
+                await self.helpers.wait_for_invisibility((By.ID, "onetrust-consent-sdk"))
             except Exception:
                 pass
             
             try:
-                self.helpers.wait_for_visible(*self.sel.LOGIN_OPEN_BTN)
+                await self.helpers.wait_for_visible(*self.sel.LOGIN_OPEN_BTN)
             except Exception:
                 pass
 
     async def ensure_login_dialog(self) -> None:
         # Check if already visible (input field)
-        if self._is_visible(self.sel.USER_ID) or self._is_visible(self.sel.USER_ID_ALT):
+        dialog_visible = await self.browser.run(
+            lambda: self._is_visible(self.sel.USER_ID) or self._is_visible(self.sel.USER_ID_ALT)
+        )
+        if dialog_visible:
             return
 
         await self.log("INFO Login dialog not visible, opening it")
 
         try:
-            self.helpers.wait_for_element(*self.sel.LOGIN_OPEN_BTN)
+            await self.helpers.wait_for_element(*self.sel.LOGIN_OPEN_BTN)
         except Exception:
             pass
         
         # Aggressive overlay cleanupwait
         try:
-             self.helpers.wait_for_invisibility((By.CSS_SELECTOR, "div.cdk-overlay-backdrop"))
-             self.helpers.wait_for_invisibility((By.CSS_SELECTOR, "div.onetrust-pc-dark-filter"))
+             await self.helpers.wait_for_invisibility((By.CSS_SELECTOR, "div.cdk-overlay-backdrop"))
+             await self.helpers.wait_for_invisibility((By.CSS_SELECTOR, "div.onetrust-pc-dark-filter"))
         except Exception:
              pass
 
         # Use JS Click to bypass simple overlay interruptions if element is present
         try:
-            login_btn = self.helpers.find_element(*self.sel.LOGIN_OPEN_BTN)
+            login_btn = await self.helpers.find_element(*self.sel.LOGIN_OPEN_BTN)
             # Scroll to view
-            self.driver.execute_script("arguments[0].scrollIntoView({block: 'center'});", login_btn)
-            await self.helpers.sleep(1) # tiny pause for scroll
+            await self.browser.execute_script("arguments[0].scrollIntoView({block: 'center'});", login_btn)
+            await asyncio.sleep(1) # tiny pause for scroll
             
             try:
-                login_btn.click()
+                await self.browser.run(login_btn.click)
             except Exception:
                 await self.log("WARN Standard click failed, trying JS click")
-                self.driver.execute_script("arguments[0].click();", login_btn)
+                await self.browser.execute_script("arguments[0].click();", login_btn)
                 
         except Exception as e:
             await self.log(f"WARN Could not click login opening button: {e}")
 
         # Ensure the dialog is ready; some flows render a backdrop first.
         try:
-            self.helpers.wait_for_invisibility(*self.sel.OVERLAY_BACKDROP)
+            await self.helpers.wait_for_invisibility(*self.sel.OVERLAY_BACKDROP)
         except Exception:
             pass
-        self._wait_for_login_input()
+        await self.browser.run(self._wait_for_login_input)
 
     def _wait_for_login_input(self) -> None:
         self._find_visible_input(
@@ -173,54 +178,58 @@ class JefferiesActions:
     # ========== LOGIN ==========
 
     async def fill_credentials(self, username: str, password: str) -> None:
-        user_input = self._find_visible_input(
+        user_input = await self.browser.run(
+            self._find_visible_input,
             [
                 self.sel.USER_ID,
                 self.sel.USER_ID_ALT,
-            ]
+            ],
         )
-        user_input.clear()
-        user_input.send_keys(username)
+        await self.browser.run(user_input.clear)
+        await self.browser.run(user_input.send_keys, username)
 
-        password_input = self._find_visible_input(
+        password_input = await self.browser.run(
+            self._find_visible_input,
             [
                 self.sel.PASSWORD,
-            ]
+            ],
         )
-        password_input.clear()
-        password_input.send_keys(password)
+        await self.browser.run(password_input.clear)
+        await self.browser.run(password_input.send_keys, password)
         await self.log("OK Credentials filled")
 
-        login_btn = self._wait_enabled(self.sel.LOGIN_SUBMIT)
-        login_btn.click()
+        login_btn = await self.browser.run(self._wait_enabled, self.sel.LOGIN_SUBMIT)
+        await self.browser.run(login_btn.click)
         await self.log("OK Login submitted")
 
     # ========== OTP ==========
 
     async def request_otp(self) -> None:
-        self._click_with_fallback(self.sel.CONTACT_METHOD)
-        self._click_with_fallback(self.sel.CONTACT_METHOD_OPTION)
+        await self.browser.run(self._click_with_fallback, self.sel.CONTACT_METHOD)
+        await self.browser.run(self._click_with_fallback, self.sel.CONTACT_METHOD_OPTION)
         await self.log("OK Contact method selected")
 
-        self._click_with_fallback(self.sel.SEND_CODE)
+        await self.browser.run(self._click_with_fallback, self.sel.SEND_CODE)
         await self.log("OK OTP requested")
 
     async def wait_for_otp(self, timeout_seconds: int = 240, max_attempts: int = 3) -> None:
-        self.helpers.wait_for_element(*self.sel.OTP_INPUT)
+        await self.helpers.wait_for_element(*self.sel.OTP_INPUT)
         await self.log("INFO Waiting for OTP entry")
 
         attempts = 0
         while attempts < max_attempts:
-            verify_btn = self._wait_enabled(self.sel.VERIFY_OTP, timeout=timeout_seconds)
-            verify_btn.click()
+            verify_btn = await self.browser.run(
+                self._wait_enabled, self.sel.VERIFY_OTP, timeout=timeout_seconds
+            )
+            await self.browser.run(verify_btn.click)
 
             try:
-                self.helpers.wait_for_visible(*self.sel.OTP_ERROR)
+                await self.helpers.wait_for_visible(*self.sel.OTP_ERROR)
                 attempts += 1
                 await self.log("WARN OTP invalid, requesting new code")
-                self.helpers.click_element(*self.sel.OTP_RESEND)
-                self.helpers.wait_for_invisibility(*self.sel.OTP_ERROR)
-                self.helpers.wait_for_element(*self.sel.OTP_INPUT)
+                await self.helpers.click_element(*self.sel.OTP_RESEND)
+                await self.helpers.wait_for_invisibility(*self.sel.OTP_ERROR)
+                await self.helpers.wait_for_element(*self.sel.OTP_INPUT)
                 await self.log("INFO Waiting for new OTP entry")
                 continue
             except Exception:
@@ -232,48 +241,48 @@ class JefferiesActions:
     # ========== EXPORTS ==========
 
     async def export_holdings(self, date: str = None) -> None:
-        self._click_with_fallback(self.sel.NAV_ACCOUNTS)
-        self._click_with_fallback(self.sel.NAV_HOLDINGS)
+        await self.browser.run(self._click_with_fallback, self.sel.NAV_ACCOUNTS)
+        await self.browser.run(self._click_with_fallback, self.sel.NAV_HOLDINGS)
         await self.log(f"OK Holdings opened (Target date: {date})")
 
-        self._click_with_fallback(self.sel.SHOWING_SELECT)
-        self._click_with_fallback(self.sel.PRIOR_CLOSE_OPTION)
+        await self.browser.run(self._click_with_fallback, self.sel.SHOWING_SELECT)
+        await self.browser.run(self._click_with_fallback, self.sel.PRIOR_CLOSE_OPTION)
         await self.log("OK Prior Close selected")
 
-        if self._wait_for_data(self.sel.HOLDINGS_ROWS):
+        if await self.browser.run(self._wait_for_data, self.sel.HOLDINGS_ROWS):
             await self.log("OK Holdings data loaded")
         else:
             await self.log("WARN Holdings rows not detected, continuing to export")
 
-        self._wait_for_export_ready()
+        await self.browser.run(self._wait_for_export_ready)
 
-        self._click_with_fallback(self.sel.DOWNLOAD_BTN)
-        self._click_with_fallback(self.sel.EXPORT_EXCEL)
+        await self.browser.run(self._click_with_fallback, self.sel.DOWNLOAD_BTN)
+        await self.browser.run(self._click_with_fallback, self.sel.EXPORT_EXCEL)
         await self.log("OK Holdings exported")
 
     async def export_history(self, date: str = None, start_date: str = None, end_date: str = None) -> None:
-        self._click_with_fallback(self.sel.NAV_HISTORY)
+        await self.browser.run(self._click_with_fallback, self.sel.NAV_HISTORY)
         await self.log(f"OK History opened (Target date: {date})")
 
-        self._click_with_fallback(self.sel.TIME_PERIOD)
-        self._click_with_fallback(self.sel.PREV_BUSINESS_DAY)
-        self._click_with_fallback(self.sel.APPLY_FILTERS)
+        await self.browser.run(self._click_with_fallback, self.sel.TIME_PERIOD)
+        await self.browser.run(self._click_with_fallback, self.sel.PREV_BUSINESS_DAY)
+        await self.browser.run(self._click_with_fallback, self.sel.APPLY_FILTERS)
         await self.log("OK History filter applied")
 
-        if self._wait_for_data(self.sel.HISTORY_ROWS):
+        if await self.browser.run(self._wait_for_data, self.sel.HISTORY_ROWS):
             await self.log("OK History data loaded")
         else:
             await self.log("WARN History rows not detected, continuing to export")
 
-        self._wait_for_export_ready()
+        await self.browser.run(self._wait_for_export_ready)
 
-        self._click_with_fallback(self.sel.DOWNLOAD_BTN)
-        self._click_with_fallback(self.sel.EXPORT_EXCEL)
+        await self.browser.run(self._click_with_fallback, self.sel.DOWNLOAD_BTN)
+        await self.browser.run(self._click_with_fallback, self.sel.EXPORT_EXCEL)
         await self.log("OK History exported")
 
     # ========== LOGOUT ==========
 
     async def logout(self) -> None:
-        if self._click_if_visible(self.sel.USER_MENU):
-            self._click_with_fallback(self.sel.LOGOUT_BTN)
+        if await self.browser.run(self._click_if_visible, self.sel.USER_MENU):
+            await self.browser.run(self._click_with_fallback, self.sel.LOGOUT_BTN)
             await self.log("OK Logged out")
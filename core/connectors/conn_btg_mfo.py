@@ -2,9 +2,7 @@
 BTG MFO connector - refactored to application standard.
 """
 
-import asyncio
 import logging
-import os
 import shutil
 import time
 from dataclasses import dataclass
@@ -14,11 +12,13 @@ from typing import Dict, Any, Optional
 from selenium.webdriver.remote.webdriver import WebDriver
 
 from core.connectors.base import BaseConnector
+from core.services.run_log_buffer import RunLogBuffer
 from core.schemas.messages import ScrapeResult
-from core.connectors.helpers.selenium_helpers import SeleniumHelpers
+from core.connectors.helpers.async_driver import AsyncDriver, AsyncSeleniumHelpers
 from core.connectors.seletores.btg_mfo import SeletorBtgMfo
 from core.connectors.actions.btg_mfo_actions import BtgMfoActions
 from core.connectors.utils.date_calculator import calculate_holdings_date, calculate_history_date
+from core.services.download_watcher import DownloadWatcher, run_download_dirs
 from core.utils.date_utils import get_now
 
 logger = logging.getLogger(__name__)
@@ -44,8 +44,7 @@ class BtgMfoConnector(BaseConnector):
         async def log(msg: str):
             logger.info(f"[BTG MFO] {msg}")
             if run:
-                timestamped_msg = f"[{get_now().time()}] {msg}"
-                await run.update({"$push": {"logs": timestamped_msg}})
+                await RunLogBuffer.for_run(run.id).append(msg)
         return log
 
     async def _setup_run(self, params: Dict[str, Any]):
@@ -64,7 +63,7 @@ class BtgMfoConnector(BaseConnector):
         return BtgMfoCredentials(username=username, password=password)
 
     def _create_actions(self, driver: WebDriver, log_func) -> BtgMfoActions:
-        helpers = SeleniumHelpers(driver, timeout=50)
+        helpers = AsyncSeleniumHelpers(driver, timeout=50)
         selectors = SeletorBtgMfo()
         return BtgMfoActions(driver, helpers, selectors, log_func)
 
@@ -78,25 +77,18 @@ class BtgMfoConnector(BaseConnector):
 
     async def _wait_for_downloads(
         self,
-        downloads_dir: Path,
+        run_id: str,
         expected_count: int,
         log,
         timeout_seconds: int = 180,
     ) -> list[Path]:
-        start_time = time.time()
-        last_sizes: Dict[str, int] = {}
-
         await log("Waiting for downloaded files...")
-        while time.time() - start_time < timeout_seconds:
-            files = list(downloads_dir.glob("*.xlsx"))
-            if len(files) >= expected_count:
-                sizes = {str(path): path.stat().st_size for path in files}
-                if sizes == last_sizes and all(size > 0 for size in sizes.values()):
-                    return files
-                last_sizes = sizes
-            await asyncio.sleep(2)
-
-        raise RuntimeError("Timed out waiting for downloads")
+        # Exports were triggered before this point: every workbook already there counts
+        with DownloadWatcher(run_download_dirs(run_id), pattern="*.xlsx", is_new=lambda path: True) as watcher:
+            files = await watcher.wait_async(count=expected_count, timeout_seconds=timeout_seconds)
+        if len(files) < expected_count:
+            raise RuntimeError("Timed out waiting for downloads")
+        return [Path(path) for path in files]
 
     async def _organize_downloads(
         self,
@@ -105,7 +97,6 @@ class BtgMfoConnector(BaseConnector):
         expect_positions: bool,
         expect_transactions: bool,
     ) -> Dict[str, str]:
-        downloads_dir = Path(os.getenv("DOWNLOADS_DIR", "/downloads"))
         artifacts_dir = Path(f"/app/artifacts/{run_id}")
         artifacts_dir.mkdir(parents=True, exist_ok=True)
 
@@ -113,7 +104,7 @@ class BtgMfoConnector(BaseConnector):
         if expected_count == 0:
             await log("No exports requested; skipping download organization.")
             return {}
-        files = await self._wait_for_downloads(downloads_dir, expected_count, log)
+        files = await self._wait_for_downloads(run_id, expected_count, log)
 
         latest_by_type: Dict[str, Path] = {}
         for file_path in files:
@@ -179,7 +170,7 @@ class BtgMfoConnector(BaseConnector):
         try:
             timestamp = get_now().strftime("%Y%m%d_%H%M%S")
             screenshot_path = f"/app/artifacts/error_btg_mfo_{timestamp}.png"
-            driver.save_screenshot(screenshot_path)
+            await AsyncDriver.of(driver).save_screenshot(screenshot_path)
             await log_func(f"SCREEN Screenshot saved: {screenshot_path}")
         except Exception as ss_e:
             await log_func(f"WARN Screenshot failed: {ss_e}")
@@ -11,8 +11,9 @@ from typing import Dict, Any, Optional
 from selenium.webdriver.remote.webdriver import WebDriver
 
 from core.connectors.base import BaseConnector
+from core.services.run_log_buffer import RunLogBuffer
 from core.schemas.messages import ScrapeResult
-from core.connectors.helpers.selenium_helpers import SeleniumHelpers
+from core.connectors.helpers.async_driver import AsyncDriver, AsyncSeleniumHelpers
 from core.connectors.seletores.btg_offshore import SeletorBtgOffshore
 from core.connectors.actions.btg_offshore_actions import BtgOffshoreActions
 from core.utils.date_utils import get_previous_business_day, get_now, get_today
@@ -40,8 +41,7 @@ class BtgOffshoreConnector(BaseConnector):
         async def log(msg: str):
             logger.info(f"[BTG Offshore] {msg}")
             if run:
-                timestamped_msg = f"[{get_now().time()}] {msg}"
-                await run.update({"$push": {"logs": timestamped_msg}})
+                await RunLogBuffer.for_run(run.id).append(msg)
         return log
 
     async def _setup_run(self, params: Dict[str, Any]):
@@ -63,7 +63,7 @@ class BtgOffshoreConnector(BaseConnector):
         return BtgOffshoreCredentials(email=email, password=password)
 
     def _create_actions(self, driver: WebDriver, log_func) -> BtgOffshoreActions:
-        helpers = SeleniumHelpers(driver, timeout=50)
+        helpers = AsyncSeleniumHelpers(driver, timeout=50)
         selectors = SeletorBtgOffshore()
         return BtgOffshoreActions(driver, helpers, selectors, log_func)
 
@@ -130,7 +130,7 @@ class BtgOffshoreConnector(BaseConnector):
         try:
             timestamp = get_now().strftime("%Y%m%d_%H%M%S")
             screenshot_path = f"/app/artifacts/error_btg_offshore_{timestamp}.png"
-            driver.save_screenshot(screenshot_path)
+            await AsyncDriver.of(driver).save_screenshot(screenshot_path)
             await log_func(f"SCREEN Screenshot saved to: {screenshot_path}")
         except Exception as ss_e:
             await log_func(f"WARN Failed to save screenshot: {ss_e}")
@@ -1,4 +1,5 @@
 from core.connectors.base import BaseConnector
+from core.services.run_log_buffer import RunLogBuffer
 from core.schemas.messages import ScrapeResult
 import logging
 import time
@@ -37,8 +38,7 @@ class BTGOnshoreConnector(BaseConnector):
         async def log(msg):
             logger.info(f"[JPMorgan] {msg}")
             if run:
-                run.logs.append(f"[{datetime.now().time()}] {msg}")
-                await run.save()
+                await RunLogBuffer.for_run(run.id).append(msg)
 
         _url = "https://app.btgpactual.com/login"
 
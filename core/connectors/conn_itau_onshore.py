@@ -12,8 +12,9 @@ from datetime import datetime
 from selenium.webdriver.remote.webdriver import WebDriver
 
 from core.connectors.base import BaseConnector
+from core.services.run_log_buffer import RunLogBuffer
 from core.schemas.messages import ScrapeResult
-from core.connectors.helpers.selenium_helpers import SeleniumHelpers
+from core.connectors.helpers.async_driver import AsyncDriver, AsyncSeleniumHelpers
 from core.connectors.seletores.itau_onshore import SeletorItauOnshore
 from core.connectors.actions.itau_onshore_actions import ItauOnshoreActions
 from core.utils.date_utils import get_previous_business_day, get_now, get_today
@@ -53,8 +54,7 @@ class ItauOnshoreConnector(BaseConnector):
         async def log(msg: str):
             logger.info(f"[Itau Onshore] {msg}")
             if run:
-                timestamped_msg = f"[{get_now().time()}] {msg}"
-                await run.update({"$push": {"logs": timestamped_msg}})
+                await RunLogBuffer.for_run(run.id).append(msg)
         return log
     
     async def _setup_run(self, params: Dict[str, Any]):
@@ -103,7 +103,8 @@ class ItauOnshoreConnector(BaseConnector):
     def _create_actions(
         self,
         driver: WebDriver,
-        log_func
+        log_func,
+        run_id: Optional[str] = None,
     ) -> ItauOnshoreActions:
         """
         Cria instância de ItauOnshoreActions.
@@ -111,14 +112,15 @@ class ItauOnshoreConnector(BaseConnector):
         Args:
             driver: WebDriver instance
             log_func: Função de log
+            run_id: ID do run (pasta de downloads)
             
         Returns:
             ItauOnshoreActions instance
         """
-        helpers = SeleniumHelpers(driver, timeout=50)
+        helpers = AsyncSeleniumHelpers(driver, timeout=50)
         selectors = SeletorItauOnshore()
         
-        return ItauOnshoreActions(driver, helpers, selectors, log_func)
+        return ItauOnshoreActions(driver, helpers, selectors, log_func, run_id=run_id)
     
     def _get_business_day(
         self,
@@ -240,7 +242,7 @@ class ItauOnshoreConnector(BaseConnector):
         try:
             timestamp = get_now().strftime("%Y%m%d_%H%M%S")
             screenshot_path = f"/app/artifacts/error_itauonshore_{timestamp}.png"
-            driver.save_screenshot(screenshot_path)
+            await AsyncDriver.of(driver).save_screenshot(screenshot_path)
             await log_func(f"SCREEN Screenshot salvo em: {screenshot_path}")
         except Exception as ss_e:
             await log_func(f"WARN Falha ao salvar screenshot: {ss_e}")
@@ -276,7 +278,7 @@ class ItauOnshoreConnector(BaseConnector):
             return self._error_result(run_id, error_msg)
         
         # Criar actions
-        actions = self._create_actions(driver, log)
+        actions = self._create_actions(driver, log, run_id)
         
         try:
             # ========== FLUXO PRINCIPAL ==========
@@ -11,8 +11,9 @@ from typing import Dict, Any, Optional
 from selenium.webdriver.remote.webdriver import WebDriver
 
 from core.connectors.base import BaseConnector
+from core.services.run_log_buffer import RunLogBuffer
 from core.schemas.messages import ScrapeResult
-from core.connectors.helpers.selenium_helpers import SeleniumHelpers
+from core.connectors.helpers.async_driver import AsyncDriver, AsyncSeleniumHelpers
 from core.connectors.seletores.jefferies import SeletorJefferies
 from core.connectors.actions.jefferies_actions import JefferiesActions
 from core.connectors.utils.date_calculator import calculate_holdings_date, calculate_history_date
@@ -41,8 +42,7 @@ class JefferiesConnector(BaseConnector):
         async def log(msg: str):
             logger.info(f"[Jefferies] {msg}")
             if run:
-                timestamped_msg = f"[{get_now().time()}] {msg}"
-                await run.update({"$push": {"logs": timestamped_msg}})
+                await RunLogBuffer.for_run(run.id).append(msg)
         return log
 
     async def _setup_run(self, params: Dict[str, Any]):
@@ -64,7 +64,7 @@ class JefferiesConnector(BaseConnector):
         return JefferiesCredentials(username=username, password=password)
 
     def _create_actions(self, driver: WebDriver, log_func) -> JefferiesActions:
-        helpers = SeleniumHelpers(driver, timeout=50)
+        helpers = AsyncSeleniumHelpers(driver, timeout=50)
         selectors = SeletorJefferies()
         return JefferiesActions(driver, helpers, selectors, log_func)
 
@@ -131,7 +131,7 @@ class JefferiesConnector(BaseConnector):
         try:
             timestamp = get_now().strftime("%Y%m%d_%H%M%S")
             screenshot_path = f"/app/artifacts/error_jefferies_{timestamp}.png"
-            driver.save_screenshot(screenshot_path)
+            await AsyncDriver.of(driver).save_screenshot(screenshot_path)
             await log_func(f"SCREEN Screenshot saved to: {screenshot_path}")
         except Exception as ss_e:
             await log_func(f"WARN Failed to save screenshot: {ss_e}")
@@ -7,8 +7,9 @@ from typing import Dict, Any, Optional
 from selenium.webdriver.remote.webdriver import WebDriver
 
 from core.connectors.base import BaseConnector
+from core.services.run_log_buffer import RunLogBuffer
 from core.schemas.messages import ScrapeResult
-from core.connectors.helpers.selenium_helpers import SeleniumHelpers
+from core.connectors.helpers.async_driver import AsyncDriver, AsyncSeleniumHelpers
 from core.connectors.seletores.jpmorgan import SeletorJPMorgan
 from core.connectors.actions.jpmorgan_actions import JPMorganActions
 from core.connectors.utils.date_calculator import calculate_history_date, calculate_holdings_date
@@ -32,8 +33,7 @@ class JPMorganConnector(BaseConnector):
         async def log(msg: str):
             logger.info(f"[JPMorgan] {msg}")
             if run:
-                timestamped_msg = f"[{get_now().time()}] {msg}"
-                await run.update({"$push": {"logs": timestamped_msg}})
+                await RunLogBuffer.for_run(run.id).append(msg)
         return log
 
     async def _setup_run(self, params: Dict[str, Any]):
@@ -52,7 +52,7 @@ class JPMorganConnector(BaseConnector):
         return JPMorganCredentials(username=username, password=password)
 
     def _create_actions(self, driver: WebDriver, log_func) -> JPMorganActions:
-        helpers = SeleniumHelpers(driver, timeout=50)
+        helpers = AsyncSeleniumHelpers(driver, timeout=50)
         selectors = SeletorJPMorgan()
         return JPMorganActions(driver, helpers, selectors, log_func)
 
@@ -110,7 +110,7 @@ class JPMorganConnector(BaseConnector):
         try:
             timestamp = get_now().strftime("%Y%m%d_%H%M%S")
             screenshot_path = f"/app/artifacts/error_jpmorgan_{timestamp}.png"
-            driver.save_screenshot(screenshot_path)
+            await AsyncDriver.of(driver).save_screenshot(screenshot_path)
             await log_func(f"SCREEN Screenshot saved: {screenshot_path}")
         except Exception as ss_e:
             await log_func(f"WARN Screenshot failed: {ss_e}")
@@ -0,0 +1,114 @@
+"""
+Async facade over a blocking Selenium WebDriver.
+
+WebDriver commands are HTTP round-trips to the Grid and waits can block for
+minutes (OTP entry, exports). Connectors run inside the scrape task event loop,
+so every command is dispatched to a dedicated single-thread executor per
+session. The loop stays free for heartbeats and log writes, and commands for a
+session stay serialized because WebDriver is not thread-safe.
+"""
+
+import asyncio
+import functools
+import weakref
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable
+
+from selenium.webdriver.remote.webdriver import WebDriver
+from selenium.webdriver.support.ui import WebDriverWait
+
+from core.connectors.helpers.selenium_helpers import SeleniumHelpers
+
+_facades: "weakref.WeakKeyDictionary[WebDriver, AsyncDriver]" = weakref.WeakKeyDictionary()
+
+
+class AsyncDriver:
+    """Awaitable wrapper that runs WebDriver commands on the session thread."""
+
+    def __init__(self, driver: WebDriver):
+        self.driver = driver
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="webdriver")
+
+    @classmethod
+    def of(cls, driver: WebDriver) -> "AsyncDriver":
+        """Return the shared facade for a driver, creating it on first use."""
+        if isinstance(driver, AsyncDriver):
+            return driver
+        facade = _facades.get(driver)
+        if facade is None:
+            facade = cls(driver)
+            _facades[driver] = facade
+        return facade
+
+    @classmethod
+    def discard(cls, driver: WebDriver) -> None:
+        """Shut down the facade registered for a driver, if any."""
+        facade = _facades.pop(driver, None)
+        if facade:
+            facade.close()
+
+    def close(self) -> None:
+        """Stop the session thread. Pending commands are abandoned."""
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+    async def run(self, fn: Callable, *args, **kwargs) -> Any:
+        """Run a blocking callable on the session thread."""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            self._executor, functools.partial(fn, *args, **kwargs)
+        )
+
+    # ========== DRIVER COMMANDS ==========
+
+    async def get(self, url: str) -> None:
+        await self.run(self.driver.get, url)
+
+    async def find_element(self, by, value):
+        return await self.run(self.driver.find_element, by, value)
+
+    async def find_elements(self, by, value) -> list:
+        return await self.run(self.driver.find_elements, by, value)
+
+    async def execute_script(self, script: str, *args) -> Any:
+        return await self.run(self.driver.execute_script, script, *args)
+
+    async def execute_cdp_cmd(self, cmd: str, params: dict) -> Any:
+        return await self.run(self.driver.execute_cdp_cmd, cmd, params)
+
+    async def switch_to_frame(self, frame) -> None:
+        await self.run(self.driver.switch_to.frame, frame)
+
+    async def switch_to_default_content(self) -> None:
+        await self.run(self.driver.switch_to.default_content)
+
+    async def save_screenshot(self, path: str) -> bool:
+        return await self.run(self.driver.save_screenshot, path)
+
+    async def wait_until(self, condition: Callable, timeout: float) -> Any:
+        """WebDriverWait(driver, timeout).until(condition) off the event loop."""
+        return await self.run(WebDriverWait(self.driver, timeout).until, condition)
+
+
+class AsyncSeleniumHelpers:
+    """
+    Awaitable counterpart of SeleniumHelpers.
+
+    Every public helper is exposed as a coroutine executed on the session
+    thread. Code that already runs on that thread (sync action primitives
+    dispatched through AsyncDriver.run) must use `sync` instead.
+    """
+
+    def __init__(self, driver: WebDriver, timeout: int = 50):
+        self.browser = AsyncDriver.of(driver)
+        self.sync = SeleniumHelpers(self.browser.driver, timeout=timeout)
+
+    def __getattr__(self, name: str):
+        attr = getattr(self.sync, name)
+        if name.startswith("_") or not callable(attr):
+            return attr
+
+        @functools.wraps(attr)
+        async def call(*args, **kwargs):
+            return await self.browser.run(attr, *args, **kwargs)
+
+        return call
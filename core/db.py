@@ -3,6 +3,9 @@ Database initialization for Beanie (MongoDB ODM).
 Replaces SQLAlchemy setup.
 """
 
+import asyncio
+
+import redis.asyncio as redis
 from motor.motor_asyncio import AsyncIOMotorClient
 from beanie import init_beanie
 from core.config import settings
@@ -12,12 +15,27 @@ from core.models.mongo_models import (
 )
 
 client: AsyncIOMotorClient = None
+_client_loop: asyncio.AbstractEventLoop = None
+
+redis_pool: redis.ConnectionPool = None
+_redis_loop: asyncio.AbstractEventLoop = None
 
 
-async def init_db():
-    """Initialize Beanie with MongoDB connection"""
-    global client
+async def init_db(force: bool = False):
+    """
+    Initialize Beanie with MongoDB connection.
+
+    Motor clients are bound to the loop they first run on, so the client is
+    reused for every call made on the same loop and only rebuilt (with a new
+    init_beanie pass) when the loop changes or `force` is set.
+    """
+    global client, _client_loop
+    loop = asyncio.get_running_loop()
+    if client is not None and _client_loop is loop and not force:
+        return
+
     client = AsyncIOMotorClient(settings.MONGO_URI)
+    _client_loop = loop
     
     await init_beanie(
         database=client[settings.MONGO_DB_NAME],
@@ -27,8 +45,36 @@ async def init_db():
 
 async def close_db():
     """Close MongoDB connection"""
+    global client, _client_loop
     if client:
         client.close()
+    client = None
+    _client_loop = None
+
+
+def get_redis() -> redis.Redis:
+    """
+    Return a Redis client backed by the process-wide connection pool.
+
+    Like the Motor client, the pool belongs to the running loop; a new one is
+    created only when called from a different loop. Clients share the pool and
+    do not need to be closed.
+    """
+    global redis_pool, _redis_loop
+    loop = asyncio.get_running_loop()
+    if redis_pool is None or _redis_loop is not loop:
+        redis_pool = redis.ConnectionPool.from_url(settings.REDIS_URL)
+        _redis_loop = loop
+    return redis.Redis(connection_pool=redis_pool)
+
+
+async def close_redis():
+    """Disconnect the Redis connection pool"""
+    global redis_pool, _redis_loop
+    if redis_pool:
+        await redis_pool.disconnect()
+    redis_pool = None
+    _redis_loop = None
 
 
 async def get_db():
@@ -7,6 +7,7 @@ from beanie import Document, Indexed
 from datetime import datetime
 from typing import Optional, List
 from pydantic import Field, BaseModel
+from pymongo import ASCENDING, DESCENDING, IndexModel
 import uuid
 from core.utils.date_utils import get_now
 
@@ -43,6 +44,10 @@ class Workspace(Document):
     
     class Settings:
         name = "workspaces"
+        indexes = [
+            # Keyset pagination of listings
+            IndexModel([("created_at", DESCENDING), ("_id", DESCENDING)]),
+        ]
 
 
 class InboxIntegration(Document):
@@ -87,11 +92,18 @@ class Credential(Document):
     metadata: dict = {}
     carteira: Optional[str] = None
     enable_processing: bool = False
+    session_limit: Optional[int] = None  # Max concurrent Selenium sessions logged in with it
     created_at: datetime = Field(default_factory=get_now)
     updated_at: datetime = Field(default_factory=get_now)
 
     class Settings:
         name = "credentials"
+        indexes = [
+            # Legacy jobs without credential_id are linked by username (scrape_task)
+            IndexModel([("workspace_id", ASCENDING), ("username", ASCENDING)]),
+            IndexModel([("created_at", DESCENDING), ("_id", DESCENDING)]),
+            IndexModel([("workspace_id", ASCENDING), ("created_at", DESCENDING), ("_id", DESCENDING)]),
+        ]
 
 
 class FileProcessor(Document):
@@ -108,6 +120,10 @@ class FileProcessor(Document):
 
     class Settings:
         name = "file_processors"
+        indexes = [
+            # Active processor of a credential (FileProcessorService)
+            IndexModel([("credential_id", ASCENDING), ("is_active", ASCENDING)]),
+        ]
 
 
 class Job(Document):
@@ -120,6 +136,7 @@ class Job(Document):
     params: dict = {}  # Job-specific parameters
     schedule: Optional[str] = None  # Cron expression for periodic execution
     status: str = "active"  # active, paused, deleted
+    connector_session_limit: Optional[int] = None  # Max concurrent Selenium sessions of this connector while its runs wait
     
     # Export options
     export_holdings: bool = True  # Export portfolio report
@@ -140,6 +157,10 @@ class Job(Document):
     
     class Settings:
         name = "jobs"
+        indexes = [
+            IndexModel([("created_at", DESCENDING), ("_id", DESCENDING)]),
+            IndexModel([("workspace_id", ASCENDING), ("created_at", DESCENDING), ("_id", DESCENDING)]),
+        ]
 
 
 class RunFile(BaseModel):
@@ -148,9 +169,17 @@ class RunFile(BaseModel):
     filename: str
     path: str
     size_bytes: Optional[int] = None
+    sha256: Optional[str] = None  # content digest; the file is a link into artifacts/.blobs
+    compression: Optional[str] = None  # "gzip" once past the hot window (path ends in .gz)
+    compress_error: Optional[str] = None  # Last retention compression failure
+    compress_attempted_at: Optional[datetime] = None  # When it failed; retried after a back-off
     status: str = "ready"
 
 
+# Non-empty files array; queries must use this exact predicate to hit the partial indexes
+RUNS_WITH_FILES = {"files.0": {"$exists": True}}
+
+
 class Run(Document):
     """Individual execution of a job"""
     id: str = Field(default_factory=generate_uuid)
@@ -161,7 +190,9 @@ class Run(Document):
     attempt: int = 1
     celery_task_id: Optional[str] = None  # For task cancellation
     error_summary: Optional[str] = None
-    logs: List[str] = []
+    log_seq: int = 0  # Last sequence number allocated in run_logs
+    queue_position: Optional[int] = None  # Place in the Selenium slot queue while waiting
+    queue_eta_seconds: Optional[int] = None  # Estimated wait for a slot
     vnc_url: Optional[str] = None
     report_date: Optional[str] = None  # Position Date (DD/MM/YYYY)
     history_date: Optional[str] = None  # History Date (DD/MM/YYYY)
@@ -173,6 +204,65 @@ class Run(Document):
     
     class Settings:
         name = "runs"
+        indexes = [
+            # Dashboard fallback counters (covered scan), stuck queued runs and
+            # /runs?status= pages; _id is the keyset tie-breaker
+            IndexModel([("status", ASCENDING), ("created_at", ASCENDING), ("_id", ASCENDING)]),
+            # Zombie detection: running runs without a recent heartbeat
+            IndexModel([("status", ASCENDING), ("updated_at", ASCENDING)]),
+            # /runs and recent runs, newest first
+            IndexModel([("created_at", DESCENDING), ("_id", DESCENDING)]),
+            IndexModel([("job_id", ASCENDING), ("created_at", DESCENDING), ("_id", DESCENDING)]),
+            # /downloads: only runs with files, optionally by connector
+            IndexModel(
+                [("created_at", DESCENDING), ("_id", DESCENDING)],
+                name="files_created_at_-1__id_-1",
+                partialFilterExpression=RUNS_WITH_FILES,
+            ),
+            IndexModel(
+                [("connector", ASCENDING), ("created_at", DESCENDING), ("_id", DESCENDING)],
+                name="files_connector_1_created_at_-1__id_-1",
+                partialFilterExpression=RUNS_WITH_FILES,
+            ),
+        ]
+
+
+class RunLog(Document):
+    """Single run log line; lines of a run are ordered by seq"""
+    id: str = Field(default_factory=generate_uuid)
+    run_id: str
+    seq: int
+    message: str
+    created_at: datetime = Field(default_factory=get_now)
+
+    class Settings:
+        name = "run_logs"
+        indexes = [
+            IndexModel([("run_id", ASCENDING), ("seq", ASCENDING)], unique=True),
+            IndexModel([("created_at", ASCENDING)]),
+        ]
+
+
+class RunStat(Document):
+    """
+    Run counter bucket per (day, connector, workspace, status).
+    day is YYYY-MM-DD of the run's created_at in settings.TIMEZONE, or "all"
+    for the all-time bucket. id is "day|connector|workspace_id|status".
+    """
+    id: str
+    day: str
+    connector: str
+    workspace_id: str
+    status: str
+    count: int = 0
+    duration_ms_sum: int = 0  # Sum of finished_at - started_at over timed runs
+    duration_count: int = 0  # Runs in this bucket with both timestamps
+
+    class Settings:
+        name = "run_stats"
+        indexes = [
+            IndexModel([("day", ASCENDING), ("status", ASCENDING)]),
+        ]
 
 
 class OtpAudit(Document):
@@ -191,5 +281,5 @@ class OtpAudit(Document):
         name = "otp_audit"
 
 MONGO_MODELS = [
-    User, Workspace, Job, Run, InboxIntegration, OtpRule, OtpAudit, Credential, FileProcessor
+    User, Workspace, Job, Run, RunLog, RunStat, InboxIntegration, OtpRule, OtpAudit, Credential, FileProcessor
 ]
@@ -3,24 +3,37 @@ Repository for Run-related operations using Beanie ODM.
 Replaces SQLAlchemy/raw SQL implementation.
 """
 
+import json
+import logging
 import os
-from motor.motor_asyncio import AsyncIOMotorClient
-from core.config import settings
+from core.db import get_redis
+from core.services import run_stats
+from core.services.dashboard_stats import invalidate_dashboard_stats
+from core.services.job_lookup import resolve_job_info
+from core.services.run_log_buffer import format_log_line, write_reserved_run_logs
 from core.models.mongo_models import Run
 from datetime import datetime
+from typing import Any, Dict, List
+
+logger = logging.getLogger(__name__)
+
+# Runs failed per update_many in fail_runs_matching
+FAIL_BATCH_SIZE = 500
 
 
 class RunRepository:
-    """Repository for managing Run documents and raw data"""
-    
-    def __init__(self):
-        self.mongo_client = AsyncIOMotorClient(settings.MONGO_URI)
-        self.mongo_db = self.mongo_client[settings.MONGO_DB_NAME]
+    """
+    Repository for managing Run documents and raw data.
+
+    Holds no connections of its own: Mongo goes through the Beanie-initialized
+    client and Redis through the shared pool from core.db.
+    """
 
     async def save_run_status(self, run_id: str, status: str, error: str = None):
         """
         Update run status in MongoDB using atomic updates.
-        Also publishes the update to Redis for real-time WebSocket clients.
+        Moves the run between run_stats buckets and publishes the update to
+        Redis for real-time WebSocket clients.
         
         Args:
             run_id: Run document ID
@@ -32,7 +45,11 @@ class RunRepository:
         if error is not None:
             update_dict["error_summary"] = error
             
-        if status == "running":
+        if status == "queued":
+            # Re-queued (retry): timings of the previous attempt no longer apply
+            update_dict.update({"started_at": None, "finished_at": None})
+            update_dict.setdefault("error_summary", None)
+        elif status == "running":
             update_dict["started_at"] = datetime.utcnow()
         elif status in ["success", "failed"]:
             update_dict["finished_at"] = datetime.utcnow()
@@ -44,27 +61,33 @@ class RunRepository:
             # Explicitly force string ID just in case
             query_id = str(run_id) 
             
-            result = await Run.get_motor_collection().update_one(
+            run_doc = await Run.get_motor_collection().find_one_and_update(
                 {"_id": query_id},
-                {"$set": update_dict}
+                {"$set": update_dict},
+                projection=run_stats.STATS_PROJECTION,
             )
             
-            if result.matched_count > 0:
+            if run_doc:
+                job_id = run_doc.get("job_id")
+                workspace_id = await self.job_workspace(job_id)
+                await run_stats.apply_transition(
+                    run_doc, {**run_doc, **update_dict}, workspace_id
+                )
+                await invalidate_dashboard_stats()
+
                 # Publish to Redis for WebSockets
                 try:
-                    import redis.asyncio as redis
                     import json
-                    from core.config import settings
                     
-                    redis_client = redis.from_url(settings.REDIS_URL)
                     message = {
                         "run_id": run_id,
+                        "job_id": job_id,
+                        "workspace_id": workspace_id,
                         "status": status,
                         "node": os.getenv("HOSTNAME", "worker"),
                         "timestamp": datetime.utcnow().isoformat()
                     }
-                    await redis_client.publish("run_updates", json.dumps(message))
-                    await redis_client.close()
+                    await get_redis().publish("run_updates", json.dumps(message))
                 except Exception as redis_error:
                     # Don't fail the job if Redis publishing fails
                     import logging
@@ -80,6 +103,108 @@ class RunRepository:
             logger = logging.getLogger(__name__)
             logger.error(f"Error updating run {run_id[:8]}: {e}")
 
+    async def fail_runs_matching(self, query: Dict[str, Any], error: str, log_message: str) -> List[Dict[str, Any]]:
+        """
+        save_run_status(run_id, "failed", error) plus one log line for every
+        run matching query (e.g. zombies), in bulk: the runs are read through
+        a cursor and each batch costs one update_many, one run_stats bulk
+        write and one log insert. Publishing is left to the caller
+        (publish_status_batch), so a whole sweep goes out as one message.
+
+        Returns {run_id, job_id, workspace_id} of the runs failed.
+        """
+        collection = Run.get_motor_collection()
+        failed: List[Dict[str, Any]] = []
+        batch: List[Dict[str, Any]] = []
+        async for run_doc in collection.find(
+            query, projection=run_stats.STATS_PROJECTION, batch_size=FAIL_BATCH_SIZE
+        ):
+            batch.append(run_doc)
+            if len(batch) >= FAIL_BATCH_SIZE:
+                failed.extend(await self._fail_batch(batch, query, error, log_message))
+                batch = []
+        if batch:
+            failed.extend(await self._fail_batch(batch, query, error, log_message))
+        if failed:
+            await invalidate_dashboard_stats()
+        return failed
+
+    async def _fail_batch(
+        self, batch: List[Dict[str, Any]], query: Dict[str, Any], error: str, log_message: str
+    ) -> List[Dict[str, Any]]:
+        collection = Run.get_motor_collection()
+        # Mongo keeps milliseconds; the exact value identifies the runs failed here
+        now = datetime.utcnow()
+        now = now.replace(microsecond=now.microsecond // 1000 * 1000)
+        update_dict = {
+            "status": "failed",
+            "error_summary": error,
+            "finished_at": now,
+            "queue_position": None,
+            "queue_eta_seconds": None,
+        }
+        ids = [run_doc["_id"] for run_doc in batch]
+        # Re-checking query skips runs that recovered (heartbeat) since they were read
+        await collection.update_many(
+            {**query, "_id": {"$in": ids}},
+            {"$set": update_dict, "$inc": {"log_seq": 1}},
+        )
+        log_seqs = {
+            doc["_id"]: doc["log_seq"]
+            async for doc in collection.find(
+                {"_id": {"$in": ids}, "status": "failed", "finished_at": now},
+                projection={"log_seq": 1},
+            )
+        }
+
+        failed, transitions, log_entries = [], [], []
+        line = format_log_line(log_message)
+        for run_doc in batch:
+            if run_doc["_id"] not in log_seqs:
+                continue
+            job_id = run_doc.get("job_id")
+            workspace_id = await self.job_workspace(job_id)
+            transitions.append((run_doc, {**run_doc, **update_dict}, workspace_id))
+            log_entries.append((run_doc["_id"], log_seqs[run_doc["_id"]], [line]))
+            failed.append({"run_id": run_doc["_id"], "job_id": job_id, "workspace_id": workspace_id})
+        await run_stats.apply_transitions(transitions)
+        await write_reserved_run_logs(log_entries)
+        return failed
+
+    async def publish_status_batch(self, runs: List[Dict[str, Any]], status: str):
+        """One run_updates message for many runs that moved to the same status."""
+        if not runs:
+            return
+        try:
+            await get_redis().publish("run_updates", json.dumps({
+                "type": "status_batch",
+                "status": status,
+                "runs": runs,
+                "node": os.getenv("HOSTNAME", "worker"),
+                "timestamp": datetime.utcnow().isoformat(),
+            }))
+        except Exception as redis_error:
+            logger.error(f"Redis publish failed: {redis_error}")
+
+    async def record_run_created(self, run: Run):
+        """Count a freshly inserted run in its run_stats buckets."""
+        run_doc = {
+            "connector": run.connector,
+            "status": run.status,
+            "created_at": run.created_at,
+            "started_at": run.started_at,
+            "finished_at": run.finished_at,
+        }
+        await run_stats.apply_transition(None, run_doc, await self.job_workspace(run.job_id))
+        await invalidate_dashboard_stats()
+
+    async def job_workspace(self, job_id: str):
+        """Workspace of a job, from the bounded per-process job cache (core.services.job_lookup)."""
+        if not job_id:
+            return None
+        info = (await resolve_job_info([job_id])).get(str(job_id))
+        return info.workspace_id if info else None
+
     async def save_raw_payload(self, run_id: str, url: str, content: str):
         """
         Save raw scraping payload to MongoDB.
@@ -96,7 +221,7 @@ class RunRepository:
             screenshot_path: Path to screenshot file
             html_path: Path to HTML dump file
         """
-        await self.mongo_db.evidences.insert_one({
+        await Run.get_motor_collection().database.evidences.insert_one({
             "run_id": run_id,
             "screenshot_path": screenshot_path,
             "html_path": html_path,
@@ -0,0 +1,253 @@
+"""
+Tiered retention for run artifacts (`ARTIFACTS_DIR/{run_id}/...`).
+
+- Hot: runs younger than ARTIFACTS_HOT_DAYS keep their files as captured.
+- Cold: files of older runs are gzip-compressed in place (`name.xlsx` ->
+  `name.xlsx.gz`) and their `Run.files` entries get `compression="gzip"`;
+  the downloads router decompresses them on the fly. Content with a recorded
+  sha256 is compressed once, into the blob store next to the raw blob
+  (`<digest>.gz`), and every cold run shares it.
+  A file that fails to compress records `compress_error` and is retried
+  only after COMPRESS_RETRY_DAYS, so failing runs do not fill every batch.
+- Orphaned: run directories whose run document is gone (cleanup_old_runs_task
+  deletes runs, not files) are removed.
+
+Each pass handles at most ARTIFACTS_RETENTION_BATCH runs per tier and reports
+the bytes reclaimed per run; blobs left unreferenced are collected at the end.
+"""
+
+import asyncio
+import gzip
+import logging
+import os
+import shutil
+import stat
+import time
+from datetime import timedelta
+from pathlib import Path
+from typing import Any, BinaryIO, Dict, List, Optional, Set, Tuple
+
+from core.config import settings
+from core.models.mongo_models import RUNS_WITH_FILES, Run
+from core.services import artifact_store
+from core.utils.date_utils import get_now
+
+logger = logging.getLogger(__name__)
+
+COMPRESSION_GZIP = "gzip"
+COMPRESS_LEVEL = 6
+# A directory this recent may belong to a run whose document is still being written
+ORPHAN_GRACE_SECONDS = 3600
+# Back-off before retrying a file whose compression failed
+COMPRESS_RETRY_DAYS = 7
+
+
+def open_artifact(path: Path, compression: Optional[str]) -> BinaryIO:
+    """Open a run file for reading its original content."""
+    if compression == COMPRESSION_GZIP:
+        return gzip.open(path, "rb")
+    return open(path, "rb")
+
+
+def _gzip_to(source: Path, target: Path) -> None:
+    tmp = target.with_name(f".{target.name}.tmp")
+    try:
+        with open(source, "rb") as src, gzip.open(tmp, "wb", compresslevel=COMPRESS_LEVEL) as dst:
+            shutil.copyfileobj(src, dst, artifact_store.HASH_CHUNK_BYTES)
+        shutil.copystat(source, tmp)
+        os.replace(tmp, target)
+    except BaseException:
+        tmp.unlink(missing_ok=True)
+        raise
+
+
+def _compress_file(source: Path, digest: Optional[str]) -> Tuple[Path, int]:
+    """Replace source by its .gz; returns the new path and the bytes reclaimed."""
+    info = source.stat()
+    target = source.with_name(source.name + ".gz")
+    raw_blob = artifact_store.blob_path(digest) if digest else None
+    in_store = raw_blob is not None and raw_blob.exists()
+    linked = in_store and os.path.samefile(raw_blob, source)
+    added = 0
+
+    if in_store:
+        gz_blob = raw_blob.with_name(raw_blob.name + ".gz")
+        if not gz_blob.exists():
+            _gzip_to(raw_blob, gz_blob)
+            os.chmod(gz_blob, stat.S_IRUSR | stat.S_IRGRP | stat.S_IROTH)
+            added = gz_blob.stat().st_size
+        artifact_store.share(str(gz_blob), str(target))
+    else:
+        _gzip_to(source, target)
+        added = target.stat().st_size
+    source.unlink()
+
+    # The raw bytes are gone once nothing but the blob store links them (GC removes that one)
+    freed = info.st_size if info.st_nlink - 1 <= int(linked) else 0
+    return target, freed - added
+
+
+def compress_run_files(files: List[Dict[str, Any]]) -> Tuple[List[Dict[str, Any]], int]:
+    """
+    Compress a run's uncompressed files. Returns the updated `Run.files`
+    entries and the bytes reclaimed. Blocking: call it from a worker thread.
+    """
+    root = artifact_store.artifacts_dir()
+    reclaimed = 0
+    updated = []
+    for entry in files:
+        entry = dict(entry)
+        if not entry.get("compression") and entry.get("path"):
+            source = root / entry["path"]
+            if not source.is_file():
+                # Nothing left to compress; keeps the run out of the next passes
+                entry["status"] = "missing"
+            else:
+                try:
+                    target, freed = _compress_file(source, entry.get("sha256"))
+                    entry["path"] = target.relative_to(root).as_posix()
+                    entry["compression"] = COMPRESSION_GZIP
+                    entry["compress_error"] = entry["compress_attempted_at"] = None
+                    reclaimed += freed
+                except OSError as e:
+                    logger.warning(f"Could not compress artifact {entry['path']}: {e}")
+                    entry["compress_error"] = str(e)
+                    entry["compress_attempted_at"] = get_now()
+        updated.append(entry)
+    return updated, reclaimed
+
+
+def _dir_reclaimable_bytes(directory: Path) -> int:
+    """Bytes freed by deleting directory, counting hard links shared with other runs as kept."""
+    links: Dict[int, List[os.stat_result]] = {}
+    for path in directory.rglob("*"):
+        try:
+            info = path.lstat()
+        except OSError:
+            continue
+        if stat.S_ISREG(info.st_mode):
+            links.setdefault(info.st_ino, []).append(info)
+    freed = 0
+    for infos in links.values():
+        # One extra link may be the blob store's own; GC drops it afterwards
+        if infos[0].st_nlink - len(infos) <= 1:
+            freed += infos[0].st_size
+    return freed
+
+
+def _remove_dir(directory: Path) -> int:
+    freed = _dir_reclaimable_bytes(directory)
+    shutil.rmtree(directory, ignore_errors=True)
+    return freed
+
+
+def _run_dir_candidates() -> List[str]:
+    """Names of run directories old enough to be checked for orphans."""
+    root = artifact_store.artifacts_dir()
+    if not root.is_dir():
+        return []
+    cutoff = time.time() - ORPHAN_GRACE_SECONDS
+    names = []
+    with os.scandir(root) as entries:
+        for entry in entries:
+            try:
+                if (
+                    not entry.name.startswith(".")
+                    and entry.is_dir(follow_symlinks=False)
+                    and entry.stat(follow_symlinks=False).st_mtime < cutoff
+                ):
+                    names.append(entry.name)
+            except OSError:
+                continue
+    return names
+
+
+async def compress_cold_runs(batch_size: int) -> Dict[str, int]:
+    """Compress the artifacts of up to batch_size runs past the hot window, oldest first."""
+    now = get_now()
+    cutoff = now - timedelta(days=settings.ARTIFACTS_HOT_DAYS)
+    retry_cutoff = now - timedelta(days=COMPRESS_RETRY_DAYS)
+    collection = Run.get_motor_collection()
+    cursor = collection.find(
+        {
+            **RUNS_WITH_FILES,
+            "created_at": {"$lt": cutoff},
+            "files": {
+                "$elemMatch": {
+                    "compression": None,
+                    "status": {"$ne": "missing"},
+                    "$or": [
+                        {"compress_attempted_at": None},
+                        {"compress_attempted_at": {"$lt": retry_cutoff}},
+                    ],
+                }
+            },
+        },
+        {"files": 1},
+    ).sort([("created_at", 1), ("_id", 1)]).limit(batch_size)
+
+    reclaimed: Dict[str, int] = {}
+    async for doc in cursor:
+        files, freed = await asyncio.to_thread(compress_run_files, doc.get("files") or [])
+        await collection.update_one({"_id": doc["_id"]}, {"$set": {"files": files}})
+        reclaimed[doc["_id"]] = freed
+    return reclaimed
+
+
+async def delete_orphan_dirs(batch_size: int) -> Dict[str, int]:
+    """Delete up to batch_size artifact directories whose run no longer exists."""
+    names = await asyncio.to_thread(_run_dir_candidates)
+    collection = Run.get_motor_collection()
+    reclaimed: Dict[str, int] = {}
+    for start in range(0, len(names), batch_size):
+        chunk = names[start:start + batch_size]
+        existing = set(await collection.distinct("_id", {"_id": {"$in": chunk}}))
+        for name in chunk:
+            if name in existing:
+                continue
+            directory = artifact_store.artifacts_dir() / name
+            reclaimed[name] = await asyncio.to_thread(_remove_dir, directory)
+            if len(reclaimed) >= batch_size:
+                return reclaimed
+    return reclaimed
+
+
+async def referenced_blob_names() -> Set[str]:
+    """Blob names (`<digest>`, `<digest>.gz`) some `Run.files` entry still records."""
+    cursor = Run.get_motor_collection().aggregate([
+        {"$match": {"files.sha256": {"$ne": None}}},
+        {"$unwind": "$files"},
+        {"$match": {"files.sha256": {"$ne": None}}},
+        {"$group": {"_id": {"sha256": "$files.sha256", "compression": "$files.compression"}}},
+    ])
+    names = set()
+    async for doc in cursor:
+        digest = doc["_id"]["sha256"]
+        names.add(f"{digest}.gz" if doc["_id"].get("compression") == COMPRESSION_GZIP else digest)
+    return names
+
+
+async def apply_retention() -> Dict[str, Any]:
+    """One retention pass; returns the bytes reclaimed per run and in total."""
+    batch_size = max(1, settings.ARTIFACTS_RETENTION_BATCH)
+    compressed = await compress_cold_runs(batch_size)
+    deleted = await delete_orphan_dirs(batch_size)
+    referenced = await referenced_blob_names()
+    blobs_removed, blobs_freed = await asyncio.to_thread(artifact_store.collect_garbage, referenced)
+
+    for run_id, freed in compressed.items():
+        logger.info(f"🗜️  Compressed artifacts of run {run_id}: {freed} bytes reclaimed")
+    for run_id, freed in deleted.items():
+        logger.info(f"🗑️  Deleted orphaned artifacts of run {run_id}: {freed} bytes reclaimed")
+    total = sum(compressed.values()) + sum(deleted.values())
+    logger.info(
+        f"📦 Artifact retention: {len(compressed)} run(s) compressed, {len(deleted)} orphaned dir(s) "
+        f"deleted, {blobs_removed} blob(s) collected ({blobs_freed} bytes); {total} bytes reclaimed"
+    )
+    return {
+        "compressed": compressed,
+        "deleted": deleted,
+        "blobs_removed": blobs_removed,
+        "blobs_freed_bytes": blobs_freed,
+        "reclaimed_bytes": total,
+    }
@@ -0,0 +1,180 @@
+"""
+Content-addressed store for run artifacts.
+
+Every file captured or produced by a run is hashed (sha256) and stored as
+`ARTIFACTS_DIR/.blobs/<ab>/<cd>/<digest>`. When a blob with the same digest
+already exists, the run's file is replaced by a copy-on-write clone of it
+(reflink, on btrfs/XFS), so a bank statement downloaded identically every day
+occupies the disk once and a write to one run's file never reaches another's.
+Where the filesystem cannot clone, the file is hard-linked to the blob
+instead: those entries share one inode, so nothing may write to run files in
+place (processors get a private copy of the originals, see file_processor).
+The per-run paths (`{run_id}/original/...`, `{run_id}/processed/...`) stay
+regular directory entries: downloads, processors and backups read them
+unchanged.
+
+`collect_garbage` removes the blobs no run references any more: not linked
+by any run file and whose digest no `Run.files` entry records.
+
+If the filesystem refuses both clones and hard links the file is left as an
+independent copy and only its digest is recorded.
+"""
+
+import hashlib
+import logging
+import os
+import shutil
+import stat
+import time
+import uuid
+from pathlib import Path
+from typing import AbstractSet, Optional, Tuple
+
+try:
+    import fcntl
+except ImportError:  # not POSIX: no reflinks
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+BLOBS_DIR_NAME = ".blobs"
+HASH_CHUNK_BYTES = 1024 * 1024
+# ioctl(dest_fd, FICLONE, src_fd): share src's extents copy-on-write (linux/fs.h)
+FICLONE = 0x40049409
+# A blob this recent may belong to a run whose files are not recorded yet
+BLOB_GRACE_SECONDS = 3600
+
+
+def artifacts_dir() -> Path:
+    return Path(os.getenv("ARTIFACTS_DIR", "/app/artifacts"))
+
+
+def blobs_dir() -> Path:
+    return artifacts_dir() / BLOBS_DIR_NAME
+
+
+def blob_path(digest: str) -> Path:
+    return blobs_dir() / digest[:2] / digest[2:4] / digest
+
+
+def file_digest(path: str) -> str:
+    """sha256 hex digest of a file's content."""
+    sha256 = hashlib.sha256()
+    with open(path, "rb") as fh:
+        for chunk in iter(lambda: fh.read(HASH_CHUNK_BYTES), b""):
+            sha256.update(chunk)
+    return sha256.hexdigest()
+
+
+def _clone(source: Path, destination: Path) -> bool:
+    """Create destination as a copy-on-write clone of source; False if unsupported."""
+    if fcntl is None:
+        return False
+    with open(source, "rb") as src, open(destination, "xb") as dst:
+        try:
+            fcntl.ioctl(dst.fileno(), FICLONE, src.fileno())
+            cloned = True
+        except OSError:
+            cloned = False
+    if not cloned:
+        destination.unlink(missing_ok=True)
+        return False
+    shutil.copystat(source, destination)
+    return True
+
+
+def _clone_or_link(source: Path, destination: Path) -> None:
+    if not _clone(source, destination):
+        os.link(source, destination)
+
+
+def _replace_with_blob(blob: Path, path: Path) -> None:
+    """Atomically make path share the blob's content."""
+    tmp = path.with_name(f".{path.name}.{uuid.uuid4().hex}.link")
+    _clone_or_link(blob, tmp)
+    try:
+        os.replace(tmp, path)
+    except BaseException:
+        tmp.unlink(missing_ok=True)
+        raise
+
+
+def _add_blob(file: Path, blob: Path) -> None:
+    """Store file's content as blob; FileExistsError if the blob appeared meanwhile."""
+    tmp = blob.with_name(f".{blob.name}.{uuid.uuid4().hex}.tmp")
+    _clone_or_link(file, tmp)
+    try:
+        os.link(tmp, blob)
+    finally:
+        tmp.unlink(missing_ok=True)
+
+
+def ingest(path: str) -> Optional[str]:
+    """
+    Hash a run file and share its content with identical blobs.
+    Returns the digest, or None if the file cannot be read.
+    """
+    file = Path(path)
+    try:
+        digest = file_digest(path)
+    except OSError as e:
+        logger.warning(f"Could not hash artifact {path}: {e}")
+        return None
+
+    blob = blob_path(digest)
+    try:
+        blob.parent.mkdir(parents=True, exist_ok=True)
+        if blob.exists():
+            if not os.path.samefile(blob, file):
+                _replace_with_blob(blob, file)
+                logger.info(f"♻️ Deduplicated {file.name} ({digest[:12]})")
+        else:
+            try:
+                _add_blob(file, blob)
+            except FileExistsError:
+                # Another run stored the same content meanwhile
+                _replace_with_blob(blob, file)
+            os.chmod(blob, stat.S_IRUSR | stat.S_IRGRP | stat.S_IROTH)
+    except OSError as e:
+        logger.warning(f"Artifact {file.name} kept outside the blob store: {e}")
+    return digest
+
+
+def share(source: str, destination: str) -> None:
+    """Give destination the content of source: a clone, else a hard link, else a copy."""
+    try:
+        _clone_or_link(Path(source), Path(destination))
+    except OSError:
+        shutil.copy2(source, destination)
+
+
+def verify(path: str, digest: str) -> bool:
+    """Whether a file still has the content it was recorded with."""
+    try:
+        return file_digest(path) == digest
+    except OSError:
+        return False
+
+
+def collect_garbage(referenced: AbstractSet[str]) -> Tuple[int, int]:
+    """
+    Delete blobs no run file links to and whose name (`<digest>` or
+    `<digest>.gz`) is not in referenced. Returns (blobs removed, bytes freed).
+    """
+    removed = freed = 0
+    root = blobs_dir()
+    if not root.exists():
+        return removed, freed
+    cutoff = time.time() - BLOB_GRACE_SECONDS
+    for blob in root.glob("*/*/*"):
+        if blob.name in referenced:
+            continue
+        try:
+            info = blob.stat()
+            if blob.is_file() and info.st_nlink <= 1 and info.st_ctime < cutoff:
+                blob.unlink()
+                removed += 1
+                freed += info.st_size
+        except OSError as e:
+            logger.warning(f"Could not collect blob {blob.name}: {e}")
+    return removed, freed
@@ -0,0 +1,145 @@
+"""
+Dashboard counters.
+
+Run counters are read from the precomputed `run_stats` buckets (see
+core.services.run_stats); the aggregation over `runs` is only a fallback for
+when the buckets were never built. The result is cached in Redis for a few
+seconds and invalidated by `RunRepository.save_run_status` whenever a run
+changes status.
+"""
+
+import asyncio
+import json
+import logging
+from datetime import timedelta
+from typing import Any, Dict, Optional, Tuple
+
+from core.db import get_redis
+from core.models.mongo_models import Job, Run
+from core.services import run_stats
+from core.utils.date_utils import get_now
+
+logger = logging.getLogger(__name__)
+
+DASHBOARD_STATS_KEY = "dashboard:stats"
+DASHBOARD_STATS_TTL = 10
+
+
+def _run_counters_pipeline(week_ago, two_weeks_ago) -> list:
+    return [
+        # Sorting on the (status, created_at, _id) index and projecting only its fields
+        # lets the planner answer the whole pipeline from the index (covered scan).
+        {"$sort": {"status": 1, "created_at": 1}},
+        {"$project": {"_id": 0, "status": 1, "created_at": 1}},
+        {
+            "$facet": {
+                "by_status": [
+                    {"$group": {"_id": "$status", "count": {"$sum": 1}}},
+                ],
+                "success_windows": [
+                    {"$match": {"status": "success", "created_at": {"$gte": two_weeks_ago}}},
+                    {
+                        "$group": {
+                            "_id": {"$gte": ["$created_at", week_ago]},
+                            "count": {"$sum": 1},
+                        }
+                    },
+                ],
+            }
+        },
+    ]
+
+
+async def _aggregate_run_counters(now) -> Tuple[Dict[str, int], Dict[bool, int]]:
+    """Fallback: status totals and success windows from the runs collection."""
+    week_ago = now - timedelta(days=7)
+    two_weeks_ago = now - timedelta(days=14)
+    facets = await (
+        Run.get_motor_collection()
+        .aggregate(_run_counters_pipeline(week_ago, two_weeks_ago))
+        .to_list(length=1)
+    )
+    facet = facets[0] if facets else {"by_status": [], "success_windows": []}
+    by_status = {row["_id"]: row["count"] for row in facet["by_status"]}
+    windows = {row["_id"]: row["count"] for row in facet["success_windows"]}
+    return by_status, windows
+
+
+async def _read_run_counters(now) -> Optional[Tuple[Dict[str, int], Dict[bool, int]]]:
+    """Status totals and success windows from run_stats (day granularity)."""
+    by_status = await run_stats.read_status_totals()
+    if by_status is None:
+        return None
+    week_start = run_stats.stats_day(now - timedelta(days=6))
+    buckets = await run_stats.read_daily_buckets(
+        run_stats.stats_day(now - timedelta(days=13)), status="success"
+    )
+    windows: Dict[bool, int] = {}
+    for bucket in buckets:
+        recent = bucket.day >= week_start
+        windows[recent] = windows.get(recent, 0) + bucket.count
+    return by_status, windows
+
+
+async def compute_dashboard_stats() -> Dict[str, Any]:
+    """Compute dashboard counters from run_stats plus one count on jobs."""
+    now = get_now()
+    counters, active_jobs = await asyncio.gather(
+        _read_run_counters(now),
+        Job.find(Job.status == "active").count(),
+    )
+    if counters is None:
+        counters = await _aggregate_run_counters(now)
+    by_status, windows = counters
+
+    successful_runs = by_status.get("success", 0)
+    failed_runs = by_status.get("failed", 0)
+    running_runs = by_status.get("running", 0)
+    queued_runs = by_status.get("queued", 0)
+
+    # Calculate trend (last 7 days vs previous 7 days)
+    recent_success = windows.get(True, 0)
+    previous_success = windows.get(False, 0)
+    success_trend = 0
+    if previous_success > 0:
+        success_trend = round(((recent_success - previous_success) / previous_success) * 100, 1)
+
+    return {
+        "successful_runs": successful_runs,
+        "failed_runs": failed_runs,
+        "running_runs": running_runs,
+        "queued_runs": queued_runs,
+        # Active includes running and queued
+        "active_workers": running_runs + queued_runs,
+        "browser_sessions": running_runs,  # Only running jobs use browser
+        "success_trend": success_trend,
+        "total_runs": sum(by_status.values()),
+        "active_jobs": active_jobs,
+    }
+
+
+async def get_dashboard_stats() -> Dict[str, Any]:
+    """Return cached counters, recomputing them when the cache is cold."""
+    redis_client = get_redis()
+    cached: Optional[bytes] = None
+    try:
+        cached = await redis_client.get(DASHBOARD_STATS_KEY)
+    except Exception as e:
+        logger.warning(f"Dashboard cache read failed: {e}")
+    if cached:
+        return json.loads(cached)
+
+    stats = await compute_dashboard_stats()
+    try:
+        await redis_client.set(DASHBOARD_STATS_KEY, json.dumps(stats), ex=DASHBOARD_STATS_TTL)
+    except Exception as e:
+        logger.warning(f"Dashboard cache write failed: {e}")
+    return stats
+
+
+async def invalidate_dashboard_stats() -> None:
+    """Drop cached counters after a run changes status."""
+    try:
+        await get_redis().delete(DASHBOARD_STATS_KEY)
+    except Exception as e:
+        logger.warning(f"Dashboard cache invalidation failed: {e}")
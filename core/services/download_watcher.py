@@ -0,0 +1,399 @@
+"""
+Download capture engine shared by the worker and the connectors.
+
+A DownloadWatcher waits until the browser has finished writing the files of a
+download to one of its directories. On Linux it is woken by inotify the
+moment a file is closed after writing (IN_CLOSE_WRITE) or renamed into place
+(IN_MOVED_TO, i.e. Chrome's `.crdownload` -> final name); elsewhere, or if
+inotify is unavailable, it rescans every POLL_SECONDS. In both modes a rescan
+also runs at least every RESCAN_SECONDS, so an event that never arrives (e.g.
+a network filesystem) only delays capture.
+
+A file counts once it has a final name (no temporary suffix), is new for this
+watcher (see `is_new`) and is complete: confirmed by an event, unchanged
+between two scans, or untouched for SETTLE_SECONDS. The wait ends when
+`count` files are complete and no new temporary file is still being written.
+
+"New" is decided against a snapshot of the download index (DownloadIndex):
+the shared downloads root is indexed once per worker process by (inode, size,
+mtime_ns) and kept current by inotify, so a run never re-reads the leftovers
+of earlier runs to tell them apart from its own files.
+
+Typical use in a connector: create the watcher before clicking "export", then
+`await watcher.wait_async(count=1)`.
+"""
+
+import asyncio
+import ctypes
+import ctypes.util
+import glob
+import logging
+import os
+import select
+import struct
+import threading
+import time
+from pathlib import Path
+from stat import S_ISREG
+from typing import Callable, Dict, List, Optional, Sequence, Set, Tuple
+
+logger = logging.getLogger(__name__)
+
+TEMP_SUFFIXES = (".crdownload", ".part", ".tmp")
+POLL_SECONDS = 1.0
+RESCAN_SECONDS = 5.0
+SETTLE_SECONDS = 2.0
+# A temporary file untouched for this long is an abandoned download, not a pending one
+STALLED_SECONDS = 15.0
+
+_IN_ATTRIB = 0x00000004
+_IN_CLOSE_WRITE = 0x00000008
+_IN_MOVED_FROM = 0x00000040
+_IN_MOVED_TO = 0x00000080
+_IN_CREATE = 0x00000100
+_IN_DELETE = 0x00000200
+_IN_Q_OVERFLOW = 0x00004000
+_EVENT_HEADER = struct.Struct("iIII")
+
+
+def run_download_dirs(run_id: Optional[str]) -> List[str]:
+    """Directories a run's downloads can land in: its own folder, then the shared root."""
+    root = os.getenv("DOWNLOADS_DIR", "/downloads")
+    if not run_id:
+        return [root]
+    return [os.path.join(root, run_id), root]
+
+
+def _stat_key(path: str) -> Optional[Tuple[int, int]]:
+    try:
+        stat = os.stat(path)
+        return (int(stat.st_size), int(stat.st_mtime_ns))
+    except OSError:
+        return None
+
+
+class _Inotify:
+    """Minimal inotify reader (ctypes, no dependency)."""
+
+    def __init__(self, directories: Sequence[str], mask: int = _IN_CLOSE_WRITE | _IN_MOVED_TO):
+        libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+        self.fd = libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        self.mask = mask
+        # Set when the kernel dropped events; the reader must rescan
+        self.overflowed = False
+        self._dirs: Dict[int, str] = {}
+        try:
+            for directory in directories:
+                wd = libc.inotify_add_watch(self.fd, os.fsencode(directory), mask)
+                if wd < 0:
+                    raise OSError(ctypes.get_errno(), f"inotify_add_watch failed for {directory}")
+                self._dirs[wd] = directory
+        except Exception:
+            os.close(self.fd)
+            raise
+
+    def read(self, timeout: float) -> Set[str]:
+        """Wait up to timeout for events; returns the paths they concern."""
+        ready, _, _ = select.select([self.fd], [], [], max(0.0, timeout))
+        if not ready:
+            return set()
+        try:
+            data = os.read(self.fd, 64 * 1024)
+        except BlockingIOError:
+            return set()
+        completed: Set[str] = set()
+        offset = 0
+        while offset + _EVENT_HEADER.size <= len(data):
+            wd, mask, _cookie, length = _EVENT_HEADER.unpack_from(data, offset)
+            offset += _EVENT_HEADER.size
+            name = data[offset:offset + length].rstrip(b"\0").decode(errors="replace")
+            offset += length
+            if mask & _IN_Q_OVERFLOW:
+                self.overflowed = True
+            directory = self._dirs.get(wd)
+            if directory and name and mask & self.mask:
+                completed.add(os.path.abspath(os.path.join(directory, name)))
+        return completed
+
+    def close(self) -> None:
+        try:
+            os.close(self.fd)
+        except OSError:
+            pass
+
+
+def _inode_key(path: str) -> Optional[Tuple[int, int, int]]:
+    """(inode, size, mtime_ns) of a regular file, or None."""
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    if not S_ISREG(stat.st_mode):
+        return None
+    return (int(stat.st_ino), int(stat.st_size), int(stat.st_mtime_ns))
+
+
+class DownloadSnapshot:
+    """State of the download directories at one instant (see DownloadIndex.snapshot)."""
+
+    def __init__(
+        self,
+        index: "DownloadIndex",
+        generation: Optional[int],
+        baseline: Dict[str, Tuple[int, int, int]],
+    ):
+        self._index = index
+        self._generation = generation
+        self._baseline = baseline
+
+    def is_new(self, path: str) -> bool:
+        """Whether path appeared or changed since the snapshot (one stat, no reads)."""
+        path = os.path.abspath(path)
+        key = _inode_key(path)
+        if key is None:
+            return False
+        if self._generation is not None and os.path.dirname(path) == self._index.root:
+            return self._index.changed_since(self._generation, path, key)
+        return self._baseline.get(path) != key
+
+
+class DownloadIndex:
+    """
+    Per-process index of the shared downloads root: path -> (inode, size,
+    mtime_ns), built with one stat-only scan and then kept current by
+    inotify events, each change stamped with a generation number. A snapshot
+    is just the current generation, so telling a run's downloads apart from
+    the leftovers of earlier runs costs nothing up front and one stat per
+    candidate file. Without inotify, a snapshot rescans (stat only).
+    """
+
+    _MASK = _IN_ATTRIB | _IN_CLOSE_WRITE | _IN_CREATE | _IN_DELETE | _IN_MOVED_FROM | _IN_MOVED_TO
+
+    def __init__(self):
+        self.root: Optional[str] = None
+        self._entries: Dict[str, Tuple[int, int, int, int]] = {}  # key + generation
+        self._generation = 0
+        self._lock = threading.Lock()
+        self._start_lock = threading.Lock()
+        self._inotify: Optional[_Inotify] = None
+
+    def start(self) -> None:
+        """Scan the downloads root and follow it (once per process; blocking)."""
+        with self._start_lock:
+            root = os.path.abspath(run_download_dirs(None)[0])
+            if self.root == root or not os.path.isdir(root):
+                return
+            self.root = root
+            try:
+                self._inotify = _Inotify([root], self._MASK)
+            except (OSError, AttributeError) as e:
+                logger.info(f"inotify unavailable ({e}); download index rescans per snapshot")
+            self._rescan()
+            if self._inotify:
+                threading.Thread(target=self._follow, name="download-index", daemon=True).start()
+            logger.info(f"Download index: {len(self._entries)} file(s) in {root}")
+
+    def _follow(self) -> None:
+        inotify = self._inotify
+        while inotify is self._inotify:
+            try:
+                paths = inotify.read(RESCAN_SECONDS * 12)
+            except OSError as e:
+                logger.warning(f"inotify read failed ({e}); download index rescans per snapshot")
+                self._inotify = None
+                inotify.close()
+                return
+            if inotify.overflowed:
+                inotify.overflowed = False
+                self._rescan()
+            else:
+                for path in paths:
+                    self._update(path, _inode_key(path))
+
+    def _update(self, path: str, key: Optional[Tuple[int, int, int]]) -> None:
+        with self._lock:
+            entry = self._entries.get(path)
+            if key is None:
+                if entry is not None:
+                    del self._entries[path]
+                    self._generation += 1
+            elif entry is None or entry[:3] != key:
+                self._generation += 1
+                self._entries[path] = (*key, self._generation)
+
+    def _rescan(self) -> None:
+        seen: Dict[str, Tuple[int, int, int]] = {}
+        with os.scandir(self.root) as entries:
+            for entry in entries:
+                try:
+                    if entry.is_file(follow_symlinks=False):
+                        stat = entry.stat(follow_symlinks=False)
+                        seen[os.path.join(self.root, entry.name)] = (
+                            int(stat.st_ino), int(stat.st_size), int(stat.st_mtime_ns)
+                        )
+                except OSError:
+                    continue
+        for path in set(self._entries) - set(seen):
+            self._update(path, None)
+        for path, key in seen.items():
+            self._update(path, key)
+
+    def changed_since(self, generation: int, path: str, key: Tuple[int, int, int]) -> bool:
+        with self._lock:
+            entry = self._entries.get(path)
+        # Events not processed yet show up as a key mismatch
+        return entry is None or entry[3] > generation or entry[:3] != key
+
+    def snapshot(self, directories: Sequence[str] = ()) -> DownloadSnapshot:
+        """
+        Mark "now" for the downloads root; other directories (e.g. a run's
+        own folder, usually empty) get a plain stat baseline.
+        """
+        self.start()
+        generation = None
+        if self.root:
+            if not self._inotify:
+                self._rescan()
+            with self._lock:
+                generation = self._generation
+        baseline: Dict[str, Tuple[int, int, int]] = {}
+        for directory in directories:
+            directory = os.path.abspath(directory)
+            if (generation is not None and directory == self.root) or not os.path.isdir(directory):
+                continue
+            for name in os.listdir(directory):
+                path = os.path.join(directory, name)
+                key = _inode_key(path)
+                if key:
+                    baseline[path] = key
+        return DownloadSnapshot(self, generation, baseline)
+
+
+download_index = DownloadIndex()
+
+
+class DownloadWatcher:
+    """Waits for completed downloads in a directory (with fallback directories)."""
+
+    def __init__(
+        self,
+        directories: Sequence[str],
+        pattern: str = "*",
+        is_new: Optional[Callable[[str], bool]] = None,
+    ):
+        """
+        Args:
+            directories: Where to look, in order of preference; files are
+                taken from the first directory that has any.
+            pattern: Glob pattern of the expected files.
+            is_new: Whether an existing path belongs to this download. By
+                default anything not present (or changed) since the watcher
+                was created (a download_index snapshot).
+        """
+        self.directories = [str(d) for d in directories if d and os.path.isdir(d)]
+        self.pattern = pattern
+        self._confirmed: Set[str] = set()
+        self._last_seen: Dict[str, Tuple[int, int]] = {}
+        if is_new is None:
+            is_new = download_index.snapshot(self.directories).is_new
+        self.is_new = is_new
+        self._inotify: Optional[_Inotify] = None
+        try:
+            if self.directories:
+                self._inotify = _Inotify(self.directories)
+        except (OSError, AttributeError) as e:
+            logger.info(f"inotify unavailable ({e}); polling for downloads")
+
+    def __enter__(self) -> "DownloadWatcher":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def close(self) -> None:
+        if self._inotify:
+            self._inotify.close()
+            self._inotify = None
+
+    def _scan(self, directory: str, now: float) -> Tuple[List[str], bool]:
+        """(complete new files, whether a new download is still being written)."""
+        complete: List[str] = []
+        pending = False
+        candidates = set(glob.glob(str(Path(directory) / self.pattern)))
+        for suffix in TEMP_SUFFIXES:
+            candidates.update(glob.glob(str(Path(directory) / f"*{suffix}")))
+        for path in candidates:
+            path = os.path.abspath(path)
+            if not os.path.isfile(path) or not self.is_new(path):
+                continue
+            key = _stat_key(path)
+            if key is None:
+                continue
+            if path.endswith(TEMP_SUFFIXES):
+                if now - key[1] / 1e9 < STALLED_SECONDS:
+                    pending = True
+                continue
+            stable = self._last_seen.get(path) == key
+            self._last_seen[path] = key
+            if path in self._confirmed or stable or now - key[1] / 1e9 >= SETTLE_SECONDS:
+                complete.append(path)
+        return complete, pending
+
+    def wait(self, count: int = 1, timeout_seconds: float = 30.0) -> List[str]:
+        """
+        Block until `count` complete files are in one directory and nothing
+        is still downloading there, or until the timeout. Returns the complete
+        files found (possibly fewer than count), oldest first.
+        """
+        deadline = time.monotonic() + timeout_seconds
+        best: List[str] = []
+        while True:
+            now = time.time()
+            best = []
+            for directory in self.directories:
+                complete, pending = self._scan(directory, now)
+                if complete:
+                    if len(complete) >= count and not pending:
+                        return self._ordered(complete)
+                    best = complete
+                    break
+
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return self._ordered(best)
+            self._sleep(remaining)
+
+    def wait_idle(self, timeout_seconds: float = 30.0) -> bool:
+        """
+        Block until no new download is still being written in any directory
+        (e.g. before closing the browser). Returns False on timeout.
+        """
+        deadline = time.monotonic() + timeout_seconds
+        while True:
+            now = time.time()
+            if not any(self._scan(directory, now)[1] for directory in self.directories):
+                return True
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return False
+            self._sleep(remaining)
+
+    def _sleep(self, remaining: float) -> None:
+        """Wait for the next inotify event, rescan interval or poll tick."""
+        if self._inotify:
+            try:
+                self._confirmed |= self._inotify.read(min(remaining, RESCAN_SECONDS))
+                return
+            except OSError as e:
+                logger.warning(f"inotify read failed ({e}); polling for downloads")
+                self.close()
+        time.sleep(min(remaining, POLL_SECONDS))
+
+    async def wait_async(self, count: int = 1, timeout_seconds: float = 30.0) -> List[str]:
+        return await asyncio.to_thread(self.wait, count, timeout_seconds)
+
+    @staticmethod
+    def _ordered(paths: List[str]) -> List[str]:
+        return sorted(paths, key=lambda p: (_stat_key(p) or (0, 0))[1])
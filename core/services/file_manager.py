@@ -3,15 +3,16 @@ File management service for downloaded and processed files.
 Handles capture, renaming, and processing of files from Selenium downloads.
 """
 
-import glob
-import hashlib
 import logging
 import os
 import re
 import shutil
 from datetime import datetime
 from pathlib import Path
-from typing import Dict, List, Optional
+from typing import Any, Callable, Dict, List, Optional
+
+from core.services import artifact_store
+from core.services.download_watcher import DownloadSnapshot, DownloadWatcher
 
 logger = logging.getLogger(__name__)
 
@@ -37,36 +38,6 @@ class FileManager:
         clean = re.sub(r"[^A-Za-z0-9._-]", "", (value or "").replace(" ", ""))
         return clean or fallback
 
-    @staticmethod
-    def _file_signature(file_path: str, hash_bytes: int = 65536) -> Optional[tuple[int, int, str]]:
-        """
-        Build a lightweight signature for change detection.
-        Returns (size_bytes, mtime_ns, sha1_prefix) or None if unavailable.
-        """
-        try:
-            stat = os.stat(file_path)
-            size = int(stat.st_size)
-            mtime_ns = int(stat.st_mtime_ns)
-            sha1 = hashlib.sha1()
-            with open(file_path, "rb") as fh:
-                sha1.update(fh.read(hash_bytes))
-            return (size, mtime_ns, sha1.hexdigest())
-        except Exception:
-            return None
-
-    @staticmethod
-    def build_file_signatures(
-        absolute_paths: set[str],
-        hash_bytes: int = 65536,
-    ) -> dict[str, tuple[int, int, str]]:
-        """Build signatures map for a set of absolute file paths."""
-        signatures: dict[str, tuple[int, int, str]] = {}
-        for path in absolute_paths:
-            sig = FileManager._file_signature(path, hash_bytes=hash_bytes)
-            if sig:
-                signatures[os.path.abspath(path)] = sig
-        return signatures
-
     @staticmethod
     def to_artifact_relative(file_path: str) -> str:
         """
@@ -81,6 +52,60 @@ class FileManager:
             # Fallback keeps behavior predictable if path is outside artifacts.
             return path.name
 
+    @staticmethod
+    def new_download_filter(
+        exclude_paths: Optional[set[str]] = None,
+        min_modified_time: Optional[float] = None,
+        snapshot: Optional[DownloadSnapshot] = None,
+    ) -> Callable[[str], bool]:
+        """
+        Filter for DownloadWatcher: files written by this run only. With a
+        snapshot taken at run start, anything that appeared or changed since;
+        otherwise by modification time or exclusion list.
+        """
+        if snapshot is not None:
+            return snapshot.is_new
+        excluded = exclude_paths or set()
+
+        def is_new(path: str) -> bool:
+            try:
+                mtime = os.path.getmtime(path)
+            except OSError:
+                return False
+            if min_modified_time is not None:
+                return mtime >= min_modified_time
+            return path not in excluded
+
+        return is_new
+
+    @staticmethod
+    def _wait_for_downloads(
+        pattern: str,
+        timeout_seconds: int,
+        source_dir: Optional[str],
+        exclude_paths: Optional[set[str]],
+        min_modified_time: Optional[float],
+        snapshot: Optional[DownloadSnapshot],
+    ) -> List[str]:
+        """Completed downloads of this run, from source_dir or (fallback) the shared root."""
+        downloads_dir = Path(source_dir) if source_dir else FileManager._downloads_dir()
+        # Fallback for remote Selenium nodes that ignore run-specific folder.
+        directories = [str(downloads_dir), str(FileManager._downloads_dir())]
+        if downloads_dir.resolve() == FileManager._downloads_dir().resolve():
+            directories = directories[:1]
+
+        with DownloadWatcher(
+            directories,
+            pattern=pattern,
+            is_new=FileManager.new_download_filter(
+                exclude_paths, min_modified_time, snapshot
+            ),
+        ) as watcher:
+            found = watcher.wait(count=1, timeout_seconds=timeout_seconds)
+        if not found:
+            logger.warning(f"No file matching '{pattern}' found in {downloads_dir} after {timeout_seconds}s")
+        return found
+
     @staticmethod
     def capture_download(
         run_id: str,
@@ -89,7 +114,7 @@ class FileManager:
         source_dir: Optional[str] = None,
         exclude_paths: Optional[set[str]] = None,
         min_modified_time: Optional[float] = None,
-        preexisting_signatures: Optional[dict[str, tuple[int, int, str]]] = None,
+        snapshot: Optional[DownloadSnapshot] = None,
     ) -> Optional[str]:
         """
         Capture a downloaded file from the downloads directory.
@@ -102,62 +127,12 @@ class FileManager:
         Returns:
             Path to captured file in artifacts directory, or None if not found
         """
-        import time
-
-        start_time = time.time()
-        found_file = None
-        downloads_dir = Path(source_dir) if source_dir else FileManager._downloads_dir()
-        default_downloads_dir = FileManager._downloads_dir()
-
-        def _list_complete_files(base_dir: Path) -> List[str]:
-            files = glob.glob(str(base_dir / pattern))
-            excluded = exclude_paths or set()
-            return [
-                f for f in files
-                if (
-                    os.path.isfile(f)
-                    and not f.endswith((".crdownload", ".tmp", ".part"))
-                    and (
-                        os.path.abspath(f) not in excluded
-                        or (
-                            min_modified_time is not None
-                            and os.path.getmtime(f) >= min_modified_time
-                        )
-                        or (
-                            preexisting_signatures is not None
-                            and (
-                                FileManager._file_signature(f)
-                                != preexisting_signatures.get(os.path.abspath(f))
-                            )
-                        )
-                    )
-                    and (
-                        min_modified_time is None
-                        or os.path.getmtime(f) >= min_modified_time
-                    )
-                )
-            ]
-
-        while time.time() - start_time < timeout_seconds:
-            complete_files = _list_complete_files(downloads_dir)
-
-            # Fallback for remote Selenium nodes that ignore run-specific folder.
-            if (
-                not complete_files
-                and source_dir
-                and downloads_dir.resolve() != default_downloads_dir.resolve()
-            ):
-                complete_files = _list_complete_files(default_downloads_dir)
-
-            if complete_files:
-                found_file = max(complete_files, key=os.path.getmtime)
-                break
-
-            time.sleep(1)
-
-        if not found_file:
-            logger.warning(f"No file matching '{pattern}' found in {downloads_dir} after {timeout_seconds}s")
+        found_files = FileManager._wait_for_downloads(
+            pattern, timeout_seconds, source_dir, exclude_paths, min_modified_time, snapshot
+        )
+        if not found_files:
             return None
+        found_file = found_files[-1]  # newest
 
         run_dir = FileManager._artifacts_dir() / run_id / "original"
         run_dir.mkdir(parents=True, exist_ok=True)
@@ -181,7 +156,7 @@ class FileManager:
         source_dir: Optional[str] = None,
         exclude_paths: Optional[set[str]] = None,
         min_modified_time: Optional[float] = None,
-        preexisting_signatures: Optional[dict[str, tuple[int, int, str]]] = None,
+        snapshot: Optional[DownloadSnapshot] = None,
     ) -> List[str]:
         """
         Capture all downloaded files from the downloads directory.
@@ -189,75 +164,78 @@ class FileManager:
         Returns:
             List of captured file paths in artifacts directory.
         """
-        import time
-
-        start_time = time.time()
         captured: List[str] = []
-        downloads_dir = Path(source_dir) if source_dir else FileManager._downloads_dir()
-        default_downloads_dir = FileManager._downloads_dir()
-
-        def _list_complete_files(base_dir: Path) -> List[str]:
-            files = glob.glob(str(base_dir / pattern))
-            excluded = exclude_paths or set()
-            return [
-                f for f in files
-                if (
-                    os.path.isfile(f)
-                    and not f.endswith((".crdownload", ".tmp", ".part"))
-                    and (
-                        os.path.abspath(f) not in excluded
-                        or (
-                            min_modified_time is not None
-                            and os.path.getmtime(f) >= min_modified_time
-                        )
-                        or (
-                            preexisting_signatures is not None
-                            and (
-                                FileManager._file_signature(f)
-                                != preexisting_signatures.get(os.path.abspath(f))
-                            )
-                        )
-                    )
-                    and (
-                        min_modified_time is None
-                        or os.path.getmtime(f) >= min_modified_time
-                    )
-                )
-            ]
-
-        while time.time() - start_time < timeout_seconds:
-            complete_files = _list_complete_files(downloads_dir)
-
-            # Fallback for remote Selenium nodes that ignore run-specific folder.
-            if (
-                not complete_files
-                and source_dir
-                and downloads_dir.resolve() != default_downloads_dir.resolve()
-            ):
-                complete_files = _list_complete_files(default_downloads_dir)
-
-            if complete_files:
-                run_dir = FileManager._artifacts_dir() / run_id / "original"
-                run_dir.mkdir(parents=True, exist_ok=True)
-
-                for found_file in sorted(complete_files):
-                    filename = os.path.basename(found_file)
-                    dest_path = run_dir / filename
-                    try:
-                        shutil.move(found_file, dest_path)
-                        captured.append(str(dest_path))
-                        logger.info(f"Captured file: {filename} -> {dest_path}")
-                    except Exception as e:
-                        logger.error(f"Failed to move file {found_file}: {e}")
-                break
-
-            time.sleep(1)
-
-        if not captured:
-            logger.warning(f"No files matching '{pattern}' found in {downloads_dir} after {timeout_seconds}s")
+        found_files = FileManager._wait_for_downloads(
+            pattern, timeout_seconds, source_dir, exclude_paths, min_modified_time, snapshot
+        )
+        if not found_files:
+            return captured
+
+        run_dir = FileManager._artifacts_dir() / run_id / "original"
+        run_dir.mkdir(parents=True, exist_ok=True)
+
+        for found_file in sorted(found_files):
+            filename = os.path.basename(found_file)
+            dest_path = run_dir / filename
+            try:
+                shutil.move(found_file, dest_path)
+                captured.append(str(dest_path))
+                logger.info(f"Captured file: {filename} -> {dest_path}")
+            except Exception as e:
+                logger.error(f"Failed to move file {found_file}: {e}")
 
         return captured
 
+    @staticmethod
+    def collect_run_downloads(
+        run_id: str,
+        metadata: Dict[str, str],
+        timeout_seconds: int = 30,
+        source_dir: Optional[str] = None,
+        exclude_paths: Optional[set[str]] = None,
+        min_modified_time: Optional[float] = None,
+        snapshot: Optional[DownloadSnapshot] = None,
+    ) -> List[Dict[str, Any]]:
+        """
+        Capture a run's downloads into its artifacts, rename them to the
+        standard convention and return their `Run.files` entries. Blocking
+        (waits, moves, stats): call it from a worker thread.
+        """
+        original_paths = FileManager.capture_downloads(
+            run_id,
+            pattern="*",
+            timeout_seconds=timeout_seconds,
+            source_dir=source_dir,
+            exclude_paths=exclude_paths,
+            min_modified_time=min_modified_time,
+            snapshot=snapshot,
+        )
+
+        files_metadata = []
+        for idx, original_path in enumerate(original_paths, start=1):
+            suffix = str(idx) if len(original_paths) > 1 else ""
+            renamed_original = (
+                FileManager.rename_file(original_path, metadata, suffix=suffix)
+                or original_path
+            )
+            files_metadata.append(FileManager.artifact_entry(renamed_original, "original"))
+        return files_metadata
+
+    @staticmethod
+    def artifact_entry(file_path: str, file_type: str) -> Dict[str, Any]:
+        """
+        Store a run file in the content-addressed blob store and build its
+        `Run.files` entry (with the sha256 digest). Blocking: hashes the file.
+        """
+        return {
+            "file_type": file_type,
+            "filename": os.path.basename(file_path),
+            "path": FileManager.to_artifact_relative(file_path),
+            "size_bytes": FileManager.get_file_size(file_path),
+            "sha256": artifact_store.ingest(file_path),
+            "status": "ready",
+        }
+
     @staticmethod
     def rename_file(file_path: str, metadata: Dict[str, str], suffix: str = "") -> Optional[str]:
         """
@@ -306,7 +284,7 @@ class FileManager:
     def process_file(original_path: str, run_id: str, metadata: Dict[str, str], suffix: str = "") -> Optional[str]:
         """
         Process file into standardized format.
-        Currently a placeholder - copies file to processed directory with standardized name.
+        Currently a placeholder - links file into processed directory with standardized name.
 
         Args:
             original_path: Path to original file
@@ -340,7 +318,8 @@ class FileManager:
                 processed_path = processed_dir / f"{base_name}-{counter}{extension}"
                 counter += 1
 
-            shutil.copy2(original, processed_path)
+            # Same content as the original: share its extents instead of copying the bytes
+            artifact_store.share(str(original), str(processed_path))
 
             logger.info(f"Processed file: {original.name} -> {processed_path}")
             return str(processed_path)
@@ -5,6 +5,7 @@ Executes Python scripts associated with credentials.
 
 import logging
 import os
+import shutil
 import subprocess
 import sys
 import tempfile
@@ -50,15 +51,6 @@ class FileProcessorService:
             processed_dir = Path(artifacts_root) / run_id / "processed"
             processed_dir.mkdir(parents=True, exist_ok=True)
 
-            context = {
-                "original_dir": str(original_dir),
-                "processed_dir": str(processed_dir),
-                "carteira": credential.carteira or "",
-                "metadata": credential.metadata or {},
-                "run_id": run_id,
-                "credential_label": credential.label,
-            }
-
             logger.info(
                 "Executing processor '%s' (v%s) for run %s",
                 processor.name,
@@ -66,10 +58,28 @@ class FileProcessorService:
                 run_id,
             )
 
-            processed_files = await FileProcessorService._execute_processor(
-                processor.script_content,
-                context,
-            )
+            # Originals may share their inode with other runs (artifact_store):
+            # the script gets independent copies, so saving in place stays private
+            with tempfile.TemporaryDirectory(prefix=f"originals-{run_id}-") as scratch:
+                private_originals = Path(scratch) / "original"
+                if original_dir.is_dir():
+                    shutil.copytree(original_dir, private_originals)
+                else:
+                    private_originals.mkdir()
+
+                context = {
+                    "original_dir": str(private_originals),
+                    "processed_dir": str(processed_dir),
+                    "carteira": credential.carteira or "",
+                    "metadata": credential.metadata or {},
+                    "run_id": run_id,
+                    "credential_label": credential.label,
+                }
+
+                processed_files = await FileProcessorService._execute_processor(
+                    processor.script_content,
+                    context,
+                )
 
             logger.info("Processor completed: %s file(s) generated", len(processed_files))
             return processed_files
@@ -0,0 +1,93 @@
+"""
+Batched job name/connector/workspace lookup for run listings and the run
+repository's per-workspace counters.
+
+Listings resolve the jobs of a whole page at once: cached entries come from a
+small per-process LRU, the rest from a single `$in` query. Entries expire
+after CACHE_TTL seconds so renames made through another console process show
+up without explicit invalidation; this process drops entries itself on job
+update/delete via `forget_job`.
+"""
+
+import time
+from collections import OrderedDict
+from typing import Dict, Iterable, NamedTuple, Optional, Tuple
+
+from core.models.mongo_models import Job
+
+CACHE_SIZE = 1024
+CACHE_TTL = 60.0
+
+
+class JobInfo(NamedTuple):
+    name: Optional[str]
+    connector: Optional[str]
+    workspace_id: Optional[str] = None
+
+
+class JobInfoResolver:
+    """LRU of job id -> JobInfo, filled in batches."""
+
+    def __init__(self, max_size: int = CACHE_SIZE, ttl: float = CACHE_TTL):
+        self.max_size = max_size
+        self.ttl = ttl
+        self._cache: "OrderedDict[str, Tuple[float, Optional[JobInfo]]]" = OrderedDict()
+
+    def _get_cached(self, job_id: str, now: float):
+        entry = self._cache.get(job_id)
+        if entry is None:
+            return False, None
+        stored_at, info = entry
+        if now - stored_at > self.ttl:
+            del self._cache[job_id]
+            return False, None
+        self._cache.move_to_end(job_id)
+        return True, info
+
+    def _store(self, job_id: str, info: Optional[JobInfo], now: float):
+        self._cache[job_id] = (now, info)
+        self._cache.move_to_end(job_id)
+        while len(self._cache) > self.max_size:
+            self._cache.popitem(last=False)
+
+    async def resolve(self, job_ids: Iterable[str]) -> Dict[str, JobInfo]:
+        """Return JobInfo for every existing job in job_ids with at most one query."""
+        now = time.monotonic()
+        found: Dict[str, JobInfo] = {}
+        missing = set()
+        for job_id in {str(j) for j in job_ids if j}:
+            hit, info = self._get_cached(job_id, now)
+            if not hit:
+                missing.add(job_id)
+            elif info is not None:
+                found[job_id] = info
+
+        if missing:
+            cursor = Job.get_motor_collection().find(
+                {"_id": {"$in": list(missing)}},
+                projection={"name": 1, "connector": 1, "workspace_id": 1},
+            )
+            async for doc in cursor:
+                info = JobInfo(doc.get("name"), doc.get("connector"), doc.get("workspace_id"))
+                found[doc["_id"]] = info
+                self._store(doc["_id"], info, now)
+                missing.discard(doc["_id"])
+            # Remember deleted/placeholder ids too, so they are not queried every page
+            for job_id in missing:
+                self._store(job_id, None, now)
+        return found
+
+    def forget(self, job_id: str):
+        self._cache.pop(str(job_id), None)
+
+
+job_info_resolver = JobInfoResolver()
+
+
+async def resolve_job_info(job_ids: Iterable[str]) -> Dict[str, JobInfo]:
+    return await job_info_resolver.resolve(job_ids)
+
+
+def forget_job(job_id: str):
+    """Drop a job from this process' cache after it is renamed or deleted."""
+    job_info_resolver.forget(job_id)
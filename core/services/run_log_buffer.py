@@ -0,0 +1,169 @@
+"""
+Buffered writer for run logs.
+
+Log lines live in the `run_logs` collection, one document per line ordered by
+a per-run `seq`, so run documents stay small. Connectors emit hundreds of
+lines per run; RunLogBuffer collects them in memory and writes them with one
+`insert_many` once MAX_LINES are pending or FLUSH_INTERVAL seconds after the
+first pending line, plus a final flush when the run ends (success, failure or
+cancellation).
+
+All writers of a run share one buffer through `RunLogBuffer.for_run(run_id)`,
+so task and connector lines keep their relative order.
+
+Every batch is also published on RUN_LOGS_CHANNEL so the console can stream
+lines to WebSocket clients subscribed to the run.
+"""
+
+import asyncio
+import json
+import logging
+from typing import Dict, List, Optional, Tuple
+
+from pymongo import ReturnDocument
+
+from core.db import get_redis
+from core.models.mongo_models import Run, RunLog
+from core.utils.date_utils import get_now
+
+logger = logging.getLogger(__name__)
+
+RUN_LOGS_CHANNEL = "run_logs"
+
+
+def format_log_line(msg: str) -> str:
+    """Prefix a message with the time of day, as shown in the run log views."""
+    return f"[{get_now().time()}] {msg}"
+
+
+async def write_run_logs(run_id: str, lines: List[str]) -> int:
+    """
+    Append already formatted lines to a run's log.
+
+    Allocates a contiguous seq range with an atomic `$inc` on `Run.log_seq`
+    and inserts the lines in one round-trip. Returns the last seq written,
+    or 0 if the run does not exist.
+    """
+    if not lines:
+        return 0
+    run_doc = await Run.get_motor_collection().find_one_and_update(
+        {"_id": str(run_id)},
+        {"$inc": {"log_seq": len(lines)}},
+        projection={"log_seq": 1},
+        return_document=ReturnDocument.AFTER,
+    )
+    if not run_doc:
+        return 0
+    last_seq = run_doc["log_seq"]
+    await write_reserved_run_logs([(str(run_id), last_seq, lines)])
+    return last_seq
+
+
+async def write_reserved_run_logs(entries: List[Tuple[str, int, List[str]]]) -> None:
+    """
+    Write the lines of many runs in one `insert_many`, for callers that
+    already reserved each seq range with an `$inc` of `Run.log_seq` in their
+    own update (e.g. a bulk status change). Entries are (run_id, log_seq
+    after the increment, lines).
+    """
+    now = get_now()
+    documents = []
+    batches = []
+    for run_id, last_seq, lines in entries:
+        if not lines:
+            continue
+        first_seq = last_seq - len(lines) + 1
+        documents.extend(
+            RunLog(run_id=str(run_id), seq=first_seq + i, message=line, created_at=now)
+            for i, line in enumerate(lines)
+        )
+        batches.append((str(run_id), first_seq, lines))
+    if not documents:
+        return
+    await RunLog.insert_many(documents)
+    await _publish_lines(batches, now)
+
+
+async def _publish_lines(batches: List[Tuple[str, int, List[str]]], created_at) -> None:
+    """Publish written batches (run_id, first seq, lines) for live WebSocket streaming."""
+    pipe = get_redis().pipeline(transaction=False)
+    for run_id, first_seq, lines in batches:
+        pipe.publish(RUN_LOGS_CHANNEL, json.dumps({
+            "type": "log",
+            "run_id": run_id,
+            "lines": [
+                {"seq": first_seq + i, "message": line, "created_at": created_at.isoformat()}
+                for i, line in enumerate(lines)
+            ],
+        }))
+    try:
+        await pipe.execute()
+    except Exception as e:
+        # Lines are already in Mongo; clients catch up by resuming from their last seq
+        logger.error(f"Redis publish of run logs failed: {e}")
+
+
+class RunLogBuffer:
+    """Per-run log line buffer flushed in batches."""
+
+    MAX_LINES = 50
+    FLUSH_INTERVAL = 2.0
+
+    _buffers: Dict[str, "RunLogBuffer"] = {}
+
+    def __init__(self, run_id: str, max_lines: int = MAX_LINES, flush_interval: float = FLUSH_INTERVAL):
+        self.run_id = str(run_id)
+        self.max_lines = max_lines
+        self.flush_interval = flush_interval
+        self._pending: List[str] = []
+        self._lock = asyncio.Lock()
+        self._timer: Optional[asyncio.Task] = None
+
+    @classmethod
+    def for_run(cls, run_id: str) -> "RunLogBuffer":
+        """Return the shared buffer for a run, creating it on first use."""
+        key = str(run_id)
+        buffer = cls._buffers.get(key)
+        if buffer is None:
+            buffer = cls(key)
+            cls._buffers[key] = buffer
+        return buffer
+
+    @classmethod
+    async def close_run(cls, run_id: str) -> None:
+        """Flush and drop the buffer of a finished run."""
+        buffer = cls._buffers.pop(str(run_id), None)
+        if buffer:
+            await buffer.close()
+
+    async def append(self, msg: str) -> None:
+        """Queue a message, timestamped like the rest of the run logs."""
+        self._pending.append(format_log_line(msg))
+        if len(self._pending) >= self.max_lines:
+            await self.flush()
+        elif self._timer is None or self._timer.done():
+            self._timer = asyncio.create_task(self._flush_later())
+
+    async def _flush_later(self) -> None:
+        await asyncio.sleep(self.flush_interval)
+        await self.flush()
+
+    async def flush(self) -> None:
+        """Write pending lines in one batch."""
+        async with self._lock:
+            if not self._pending:
+                return
+            lines, self._pending = self._pending, []
+            try:
+                await write_run_logs(self.run_id, lines)
+            except Exception as e:
+                # Never fail a run because its logs could not be written
+                logger.error(f"Failed to flush {len(lines)} log line(s) for run {self.run_id}: {e}")
+
+    async def close(self) -> None:
+        """Flush what is left and stop the pending timer."""
+        # Flush first: a timer already mid-write holds the lock and must not be cut off
+        await self.flush()
+        timer, self._timer = self._timer, None
+        if timer and not timer.done():
+            timer.cancel()
@@ -0,0 +1,318 @@
+"""
+Incremental run counters.
+
+Every run contributes count 1 (and its duration, once it has both started_at
+and finished_at) to two `run_stats` buckets keyed by connector, workspace and
+status: its created_at day and the all-time bucket. A status transition
+subtracts the old contribution and adds the new one in a single bulk write, so
+dashboards read a handful of small documents instead of aggregating `runs`.
+
+`rebuild_run_stats` recomputes every bucket from the runs collection; it is
+the reconciliation path after manual edits, deletions or a missed transition.
+Readers ignore the counters until a first rebuild has run (see
+BUILT_MARKER_ID), so incremental updates applied before it never show up as
+partial totals.
+"""
+
+import logging
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+from zoneinfo import ZoneInfo
+
+from pymongo import ASCENDING, IndexModel, UpdateOne
+
+from core.config import settings
+from core.models.mongo_models import Run, RunStat
+
+logger = logging.getLogger(__name__)
+
+ALL_TIME_DAY = "all"
+UNKNOWN = "unknown"
+REBUILD_COLLECTION = "run_stats_rebuild"
+# Written by every rebuild: counters are only trusted once a full count has run
+BUILT_MARKER_ID = f"{ALL_TIME_DAY}|-|-|_built"
+
+# Run fields needed to compute a run's contribution
+STATS_PROJECTION = {
+    "job_id": 1,
+    "connector": 1,
+    "status": 1,
+    "created_at": 1,
+    "started_at": 1,
+    "finished_at": 1,
+}
+
+
+def _as_utc(value: Optional[datetime]) -> Optional[datetime]:
+    if value is None:
+        return None
+    if value.tzinfo is None:
+        # Mongo hands back naive UTC datetimes
+        return value.replace(tzinfo=timezone.utc)
+    return value.astimezone(timezone.utc)
+
+
+def stats_day(created_at: Optional[datetime]) -> str:
+    created = _as_utc(created_at)
+    if created is None:
+        return UNKNOWN
+    return created.astimezone(ZoneInfo(settings.TIMEZONE)).date().isoformat()
+
+
+def run_duration_ms(run_doc: Dict[str, Any]) -> Optional[int]:
+    started = _as_utc(run_doc.get("started_at"))
+    finished = _as_utc(run_doc.get("finished_at"))
+    if not started or not finished:
+        return None
+    return int((finished - started).total_seconds() * 1000)
+
+
+def bucket_id(day: str, connector: str, workspace_id: str, status: str) -> str:
+    return f"{day}|{connector}|{workspace_id}|{status}"
+
+
+def _contribution_ops(run_doc: Dict[str, Any], workspace_id: Optional[str], sign: int) -> List[UpdateOne]:
+    connector = run_doc.get("connector") or UNKNOWN
+    workspace = workspace_id or UNKNOWN
+    status = run_doc.get("status") or UNKNOWN
+    duration = run_duration_ms(run_doc)
+
+    inc = {"count": sign}
+    if duration is not None:
+        inc["duration_ms_sum"] = sign * duration
+        inc["duration_count"] = sign
+
+    ops = []
+    for day in (stats_day(run_doc.get("created_at")), ALL_TIME_DAY):
+        ops.append(
+            UpdateOne(
+                {"_id": bucket_id(day, connector, workspace, status)},
+                {
+                    "$inc": inc,
+                    "$setOnInsert": {
+                        "day": day,
+                        "connector": connector,
+                        "workspace_id": workspace,
+                        "status": status,
+                    },
+                },
+                upsert=True,
+            )
+        )
+    return ops
+
+
+def _contribution_key(run_doc: Optional[Dict[str, Any]]):
+    if not run_doc:
+        return None
+    return (
+        stats_day(run_doc.get("created_at")),
+        run_doc.get("connector"),
+        run_doc.get("status"),
+        run_duration_ms(run_doc),
+    )
+
+
+def _transition_ops(
+    before: Optional[Dict[str, Any]],
+    after: Optional[Dict[str, Any]],
+    workspace_id: Optional[str],
+) -> List[UpdateOne]:
+    if _contribution_key(before) == _contribution_key(after):
+        return []
+    ops: List[UpdateOne] = []
+    if before:
+        ops.extend(_contribution_ops(before, workspace_id, -1))
+    if after:
+        ops.extend(_contribution_ops(after, workspace_id, +1))
+    return ops
+
+
+async def apply_transition(
+    before: Optional[Dict[str, Any]],
+    after: Optional[Dict[str, Any]],
+    workspace_id: Optional[str],
+) -> None:
+    """
+    Move a run's contribution from its old state to its new one.
+    `before` is None for a new run; `after` is None for a removed run.
+    """
+    await apply_transitions([(before, after, workspace_id)])
+
+
+async def apply_transitions(
+    transitions: Iterable[Tuple[Optional[Dict[str, Any]], Optional[Dict[str, Any]], Optional[str]]],
+) -> None:
+    """apply_transition for many runs at once, in a single bulk write."""
+    ops = [op for before, after, workspace_id in transitions for op in _transition_ops(before, after, workspace_id)]
+    if not ops:
+        return
+    try:
+        await RunStat.get_motor_collection().bulk_write(ops, ordered=False)
+    except Exception as e:
+        # Counters are repairable with rebuild_run_stats; never fail the run
+        logger.error(f"Failed to update run stats: {e}")
+
+
+async def read_status_totals() -> Optional[Dict[str, int]]:
+    """All-time run count per status, or None if counters were never built."""
+    buckets = await RunStat.find(RunStat.day == ALL_TIME_DAY).to_list()
+    if not any(bucket.id == BUILT_MARKER_ID for bucket in buckets):
+        return None
+    totals: Dict[str, int] = {}
+    for bucket in buckets:
+        if bucket.id != BUILT_MARKER_ID:
+            totals[bucket.status] = totals.get(bucket.status, 0) + bucket.count
+    return totals
+
+
+async def read_daily_buckets(
+    since_day: str,
+    status: Optional[str] = None,
+    connector: Optional[str] = None,
+    workspace_id: Optional[str] = None,
+    until_day: Optional[str] = None,
+) -> List[RunStat]:
+    """Daily buckets from since_day to until_day (today), both inclusive."""
+    # An upper bound also keeps the "all" and "unknown" days out of the range
+    until_day = until_day or stats_day(datetime.now(timezone.utc))
+    query: Dict[str, Any] = {"day": {"$gte": since_day, "$lte": until_day}}
+    if status:
+        query["status"] = status
+    if connector:
+        query["connector"] = connector
+    if workspace_id:
+        query["workspace_id"] = workspace_id
+    return await RunStat.find(query).sort("day").to_list()
+
+
+async def rebuild_run_stats() -> int:
+    """Recompute every bucket from the runs collection. Returns bucket count."""
+    db = Run.get_motor_collection().database
+    duration = {
+        "$cond": [
+            {"$and": ["$started_at", "$finished_at"]},
+            {"$subtract": ["$finished_at", "$started_at"]},
+            None,
+        ]
+    }
+
+    # 1. Daily buckets
+    await Run.get_motor_collection().aggregate([
+        {"$project": STATS_PROJECTION},
+        {
+            "$lookup": {
+                "from": "jobs",
+                "localField": "job_id",
+                "foreignField": "_id",
+                "pipeline": [{"$project": {"workspace_id": 1}}],
+                "as": "job",
+            }
+        },
+        {
+            "$project": {
+                "day": {
+                    "$ifNull": [
+                        {
+                            "$dateToString": {
+                                "format": "%Y-%m-%d",
+                                "date": "$created_at",
+                                "timezone": settings.TIMEZONE,
+                            }
+                        },
+                        UNKNOWN,
+                    ]
+                },
+                "connector": {"$ifNull": ["$connector", UNKNOWN]},
+                "workspace_id": {
+                    "$ifNull": [{"$arrayElemAt": ["$job.workspace_id", 0]}, UNKNOWN]
+                },
+                "status": {"$ifNull": ["$status", UNKNOWN]},
+                "duration": duration,
+            }
+        },
+        {
+            "$group": {
+                "_id": {
+                    "day": "$day",
+                    "connector": "$connector",
+                    "workspace_id": "$workspace_id",
+                    "status": "$status",
+                },
+                "count": {"$sum": 1},
+                "duration_ms_sum": {"$sum": {"$ifNull": ["$duration", 0]}},
+                "duration_count": {"$sum": {"$cond": [{"$eq": ["$duration", None]}, 0, 1]}},
+            }
+        },
+        {
+            "$project": {
+                "_id": {
+                    "$concat": [
+                        "$_id.day", "|", "$_id.connector", "|",
+                        "$_id.workspace_id", "|", "$_id.status",
+                    ]
+                },
+                "day": "$_id.day",
+                "connector": "$_id.connector",
+                "workspace_id": "$_id.workspace_id",
+                "status": "$_id.status",
+                "count": 1,
+                "duration_ms_sum": {"$toLong": "$duration_ms_sum"},
+                "duration_count": 1,
+            }
+        },
+        {"$out": REBUILD_COLLECTION},
+    ]).to_list(length=None)
+
+    # 2. All-time buckets folded from the daily ones
+    await db[REBUILD_COLLECTION].aggregate([
+        {
+            "$group": {
+                "_id": {
+                    "connector": "$connector",
+                    "workspace_id": "$workspace_id",
+                    "status": "$status",
+                },
+                "count": {"$sum": "$count"},
+                "duration_ms_sum": {"$sum": "$duration_ms_sum"},
+                "duration_count": {"$sum": "$duration_count"},
+            }
+        },
+        {
+            "$project": {
+                "_id": {
+                    "$concat": [
+                        ALL_TIME_DAY, "|", "$_id.connector", "|",
+                        "$_id.workspace_id", "|", "$_id.status",
+                    ]
+                },
+                "day": ALL_TIME_DAY,
+                "connector": "$_id.connector",
+                "workspace_id": "$_id.workspace_id",
+                "status": "$_id.status",
+                "count": 1,
+                "duration_ms_sum": 1,
+                "duration_count": 1,
+            }
+        },
+        {"$merge": {"into": REBUILD_COLLECTION, "whenMatched": "replace"}},
+    ]).to_list(length=None)
+
+    # 3. Swap in; transitions applied during the rebuild window are overwritten
+    bucket_count = await db[REBUILD_COLLECTION].count_documents({})
+    await db[REBUILD_COLLECTION].insert_one({
+        "_id": BUILT_MARKER_ID,
+        "day": ALL_TIME_DAY,
+        "connector": "-",
+        "workspace_id": "-",
+        "status": "_built",
+        "count": 0,
+        "duration_ms_sum": 0,
+        "duration_count": 0,
+    })
+    await db[REBUILD_COLLECTION].create_indexes(
+        [IndexModel([("day", ASCENDING), ("status", ASCENDING)])]
+    )
+    await db[REBUILD_COLLECTION].rename(RunStat.get_motor_collection().name, dropTarget=True)
+    logger.info(f"📊 Rebuilt run stats: {bucket_count} bucket(s)")
+    return bucket_count
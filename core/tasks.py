@@ -4,118 +4,91 @@ Replaces the custom aio_pika worker implementation.
 """
 
 from celery import Task
+from celery.signals import worker_process_init, worker_process_shutdown, worker_shutdown
 from django_config import celery_app
-from core.worker.executor import SeleniumExecutor
+from core.worker.run_supervisor import get_supervisor
+from core.worker.runtime import worker_runtime
+from core.worker.grid_topology import grid_topology
+from core.worker.session_pool import session_pool
+from core.worker import selenium_slots
 from core.connectors.registry import ConnectorRegistry
 from core.repositories import repo
-from core.models.mongo_models import Job, Run, Credential
-from core.db import init_db
+from core.services import artifact_retention, run_stats
+from core.services.download_watcher import DownloadWatcher, download_index, run_download_dirs
+from core.services.run_log_buffer import RunLogBuffer, write_run_logs
+from core.models.mongo_models import Job, Run, RunLog, Credential
+from core.db import get_redis
 from core.security import decrypt_value
 from core.config import settings
 import os
 import shutil
 import asyncio
+import threading
 import logging
 from datetime import datetime
 from core.utils.date_utils import get_now
 
 logger = logging.getLogger(__name__)
 
-SELENIUM_SLOT_KEY = "selenium:slots"
-SELENIUM_SLOT_INIT_KEY = "selenium:slots:initialized"
-SELENIUM_MAX_SLOTS = max(
-    1,
-    settings.SELENIUM_MAX_SLOTS,
-    settings.SELENIUM_NODE_COUNT * settings.SELENIUM_NODE_MAX_SESSIONS,
-)
-
-
-async def _ensure_selenium_slots(redis_client) -> None:
-    """Ensure the Selenium slot pool exists in Redis."""
-    # Use SETNX to avoid re-initializing the slot pool
-    initialized = await redis_client.setnx(SELENIUM_SLOT_INIT_KEY, "1")
-    if initialized:
-        # Pre-fill the slot pool with N tokens
-        tokens = [f"slot-{i}" for i in range(SELENIUM_MAX_SLOTS)]
-        await redis_client.delete(SELENIUM_SLOT_KEY)
-        if tokens:
-            await redis_client.rpush(SELENIUM_SLOT_KEY, *tokens)
-
-
-async def _acquire_selenium_slot(run_id: str, timeout_seconds: int = 300) -> str | None:
-    """Acquire a Selenium slot token to limit concurrent sessions."""
-    try:
-        import redis.asyncio as redis
-    except Exception as e:
-        logger.error(f"Redis client not available for slot control: {e}")
-        return None
-
-    redis_client = redis.from_url(settings.REDIS_URL)
-    try:
-        await _ensure_selenium_slots(redis_client)
-        start = get_now()
-        while True:
-            result = await redis_client.brpop(SELENIUM_SLOT_KEY, timeout=5)
-            if result:
-                _, token = result
-                token_str = token.decode() if isinstance(token, (bytes, bytearray)) else str(token)
-                logger.info(f"✅ Acquired Selenium slot {token_str} for run {run_id}")
-                return token_str
-            waited = (get_now() - start).total_seconds()
-            if waited >= timeout_seconds:
-                logger.error(f"⏳ Timed out waiting for Selenium slot after {timeout_seconds}s")
-                return None
-            logger.info("⏳ Waiting for Selenium slot...")
-    finally:
-        await redis_client.close()
-
-
-async def _release_selenium_slot(token: str) -> None:
-    """Release a Selenium slot token back to the pool."""
-    if not token:
-        return
-    try:
-        import redis.asyncio as redis
-    except Exception as e:
-        logger.error(f"Redis client not available for slot release: {e}")
-        return
-
-    redis_client = redis.from_url(settings.REDIS_URL)
-    try:
-        await redis_client.lpush(SELENIUM_SLOT_KEY, token)
-        logger.info(f"🔓 Released Selenium slot {token}")
-    finally:
-        await redis_client.close()
+SCRAPE_TIME_LIMIT = 1800
+
+
+@worker_process_init.connect
+def _start_worker_runtime(**kwargs):
+    """Open the per-process loop, Motor client and Redis pool in each child."""
+    worker_runtime.start()
+    worker_runtime.loop.call_soon_threadsafe(grid_topology.start)
+    # Index the shared downloads root up front so the first run does not pay the scan
+    threading.Thread(target=download_index.start, name="download-index-scan", daemon=True).start()
+    if session_pool.enabled:
+        worker_runtime.loop.call_soon_threadsafe(session_pool.start)
+
+
+@worker_process_shutdown.connect
+@worker_shutdown.connect
+def _stop_worker_runtime(**kwargs):
+    """Close per-process connections when the worker (or child) exits."""
+    session_pool.shutdown()
+    worker_runtime.stop()
+
+
+def _run_async(coro):
+    """Run a task coroutine on the per-process worker loop."""
+    return worker_runtime.run(coro)
 
 
 class DatabaseTask(Task):
     """Base task that ensures Beanie is initialized"""
-    _db_initialized = False
     
     def __call__(self, *args, **kwargs):
-        """Initialize the database once per worker process before running the task."""
-        # Initialize Beanie once per worker process
-        if not self._db_initialized:
-            asyncio.run(init_db())
-            self.__class__._db_initialized = True
-            logger.info("✅ Beanie initialized for Celery worker")
-        
+        """Make sure the worker runtime (Beanie + Redis pool) is up before running the task."""
+        # No-op after worker_process_init; covers threads/solo pools and eager calls
+        worker_runtime.start()
         return super().__call__(*args, **kwargs)
 
 
-@celery_app.task(bind=True, max_retries=3, time_limit=1800)
-def scrape_task(self, job_id: str, run_id: str, workspace_id: str, connector_name: str, params: dict):
+@celery_app.task(bind=True, max_retries=3, time_limit=SCRAPE_TIME_LIMIT)
+def scrape_task(
+    self,
+    job_id: str,
+    run_id: str,
+    workspace_id: str,
+    connector_name: str,
+    params: dict,
+    priority: str = selenium_slots.PRIORITY_SCHEDULED,
+):
     """
     Main scraping task - executes a connector with Selenium.
+    `priority` (manual/retry/scheduled) orders the run in the Selenium slot queue.
     """
+    supervisor = get_supervisor()
+
     async def _async_scrape():
         """Async implementation of the scraping task."""
-        await init_db()
         job = None
         run_download_dir = None
-        download_exclude_paths: set[str] = set()
         download_scan_start_ts: float | None = None
-        download_exclude_signatures: dict[str, tuple[int, int, str]] = {}
+        download_snapshot = None
 
         try:
             # Get run document
@@ -128,9 +101,8 @@ def scrape_task(self, job_id: str, run_id: str, workspace_id: str, connector_nam
                 """Write a message to logs and the run document."""
                 logger.info(msg)
                 if run:
-                    # Atomic push to logs to avoid overwriting status
-                    timestamped_msg = f"[{get_now().time()}] {msg}"
-                    await run.update({"$push": {"logs": timestamped_msg}})
+                    # Batched atomic push to logs (shared with the connector's logger)
+                    await RunLogBuffer.for_run(run_id).append(msg)
             
             # Fetch job to check for credentials
             job = await Job.get(job_id)
@@ -207,15 +179,26 @@ def scrape_task(self, job_id: str, run_id: str, workspace_id: str, connector_nam
             else:
                 await log("ℹ️ No credential metadata injected for this run")
 
+            slot_token = None
+            scrape_future = None
+            slot_lost = False
+
             # Heartbeat loop
             async def heartbeat_loop():
-                """Keep the run updated while the task is active."""
+                """Keep the run updated (and its Selenium slot leased) while the task is active."""
+                nonlocal slot_lost
                 while True:
                     try:
-                        await asyncio.sleep(60)
+                        await asyncio.sleep(selenium_slots.heartbeat_seconds())
                         if run:
                             # Atomic update of updated_at
                             await run.update({"$set": {"updated_at": get_now()}})
+                        if slot_token and not slot_lost:
+                            if not await selenium_slots.renew_slot(slot_token, run_id):
+                                # The slot may already drive another run's browser: stop ours
+                                slot_lost = True
+                                if scrape_future and not scrape_future.done():
+                                    scrape_future.cancel()
                     except asyncio.CancelledError:
                         break
                     except Exception as e:
@@ -244,9 +227,17 @@ def scrape_task(self, job_id: str, run_id: str, workspace_id: str, connector_nam
             # - Else, Use Remote Selenium Grid (Port 7900)
             use_local = "jpmorgan" in connector_name.lower()
             
-            slot_token = None
             if not use_local:
-                slot_token = await _acquire_selenium_slot(run_id)
+                slot_token = await selenium_slots.acquire_slot(
+                    selenium_slots.SlotRequest(
+                        run_id=run_id,
+                        priority=priority,
+                        connector=connector_name,
+                        credential_id=credential.id if credential else None,
+                        connector_limit=job.connector_session_limit if job else None,
+                        credential_limit=credential.session_limit if credential else None,
+                    )
+                )
                 if not slot_token:
                     msg = "No Selenium slot available within timeout"
                     await log(f"❌ {msg}")
@@ -254,54 +245,46 @@ def scrape_task(self, job_id: str, run_id: str, workspace_id: str, connector_nam
                     heartbeat_task.cancel()
                     return {"success": False, "error": msg}
 
-            download_root = os.getenv("DOWNLOADS_DIR", "/downloads")
-            run_download_dir = os.path.join(download_root, run_id)
-            os.makedirs(run_download_dir, exist_ok=True)
-            try:
-                # Shared folder may be created by root in worker while browser runs as seluser.
-                # Keep it writable to avoid Chrome fallback to profile downloads and Save As flows.
-                os.chmod(run_download_dir, 0o777)
-            except Exception as chmod_error:
-                logger.warning("Could not chmod run download dir %s: %s", run_download_dir, chmod_error)
-            # Use run start timestamp so overwritten files with same name are still captured.
-            download_scan_start_ts = get_now().timestamp()
-            try:
-                # Snapshot files that already existed before this run starts.
-                preexisting_run_files = set()
-                if os.path.isdir(run_download_dir):
-                    for name in os.listdir(run_download_dir):
-                        candidate = os.path.join(run_download_dir, name)
-                        if os.path.isfile(candidate):
-                            preexisting_run_files.add(os.path.abspath(candidate))
-
-                preexisting_root_files = set()
-                if os.path.isdir(download_root):
-                    for name in os.listdir(download_root):
-                        candidate = os.path.join(download_root, name)
-                        if os.path.isfile(candidate):
-                            preexisting_root_files.add(os.path.abspath(candidate))
-
-                download_exclude_paths = preexisting_run_files | preexisting_root_files
-                from core.services.file_manager import FileManager
-                download_exclude_signatures = FileManager.build_file_signatures(
-                    download_exclude_paths
-                )
-            except Exception as snapshot_error:
-                logger.warning("Failed to snapshot preexisting downloads: %s", snapshot_error)
-            await log(f"Session download dir: {run_download_dir}")
-
-            # Strong isolation: each run gets its own browser download directory.
-            chrome_download_dir = run_download_dir
-            
-            executor = SeleniumExecutor(use_local=use_local, download_dir=chrome_download_dir)
-            executor.start()
-            await log(f"🔌 Connected to Selenium Grid: {executor.driver.session_id}")
-            if run:
-                if executor.vnc_url:
-                    await run.update({"$set": {"vnc_url": executor.vnc_url}})
-            
+            executor = None
             result_payload = None
             try:
+                download_root = os.getenv("DOWNLOADS_DIR", "/downloads")
+                run_download_dir = os.path.join(download_root, run_id)
+                os.makedirs(run_download_dir, exist_ok=True)
+                try:
+                    # Shared folder may be created by root in worker while browser runs as seluser.
+                    # Keep it writable to avoid Chrome fallback to profile downloads and Save As flows.
+                    os.chmod(run_download_dir, 0o777)
+                except Exception as chmod_error:
+                    logger.warning("Could not chmod run download dir %s: %s", run_download_dir, chmod_error)
+                # Fallback if the snapshot fails: anything modified after the run started.
+                download_scan_start_ts = get_now().timestamp()
+                try:
+                    # Files already there (leftovers of earlier runs) are not this run's downloads
+                    download_snapshot = await asyncio.to_thread(
+                        download_index.snapshot, run_download_dirs(run_id)
+                    )
+                except Exception as snapshot_error:
+                    logger.warning("Failed to snapshot preexisting downloads: %s", snapshot_error)
+                await log(f"Session download dir: {run_download_dir}")
+
+                # Strong isolation: each run gets its own browser download directory.
+                chrome_download_dir = run_download_dir
+
+                # A ready session from the pool, or a new one (opened off the loop;
+                # closed again if the run is cancelled while it opens)
+                executor = await session_pool.lease(use_local, chrome_download_dir)
+                if executor.uses:
+                    await log(
+                        f"♻️ Reusing warm Selenium session: {executor.driver.session_id}"
+                        f" (run #{executor.uses + 1} on it)"
+                    )
+                else:
+                    await log(f"🔌 Connected to Selenium Grid: {executor.driver.session_id}")
+                if run:
+                    if executor.vnc_url:
+                        await run.update({"$set": {"vnc_url": executor.vnc_url}})
+
                 # Add context to params
                 params_with_context = {
                     **execution_params,
@@ -312,7 +295,13 @@ def scrape_task(self, job_id: str, run_id: str, workspace_id: str, connector_nam
 
                 # Execute connector
                 await log("🚀 Executing connector logic...")
-                result = await connector.scrape(executor.driver, params_with_context)
+                scrape_future = asyncio.ensure_future(connector.scrape(executor.driver, params_with_context))
+                try:
+                    result = await scrape_future
+                except asyncio.CancelledError:
+                    if not slot_lost:
+                        raise
+                    raise RuntimeError("Selenium slot lease expired and was reclaimed during the run")
 
                 # Save results
                 if result.success:
@@ -329,22 +318,53 @@ def scrape_task(self, job_id: str, run_id: str, workspace_id: str, connector_nam
                     await repo.save_run_status(run_id, "failed", result.error)
                     await log(f"❌ Scrape failed: {result.error}")
 
+                result_payload = (
+                    result.dict()
+                    if hasattr(result, "dict")
+                    else {"success": result.success, "data": result.data}
+                )
+
+                # Let in-flight downloads finish while the browser is still open
+                try:
+                    from core.services.file_manager import FileManager
+
+                    with DownloadWatcher(
+                        run_download_dirs(run_id),
+                        is_new=FileManager.new_download_filter(
+                            min_modified_time=download_scan_start_ts, snapshot=download_snapshot
+                        ),
+                    ) as download_watcher:
+                        if not await asyncio.to_thread(download_watcher.wait_idle, 30):
+                            await log("⚠️ Downloads still in progress after 30s; closing browser anyway")
+                except Exception as drain_error:
+                    logger.warning("Could not check in-flight downloads: %s", drain_error)
+
+            finally:
+                heartbeat_task.cancel()
+                try:
+                    await heartbeat_task
+                except asyncio.CancelledError:
+                    pass
+                
+                if executor:
+                    # Reused only if the connector finished without raising
+                    await session_pool.give_back(executor, reusable=result_payload is not None)
+                if slot_token:
+                    await selenium_slots.release_slot(slot_token, run_id)
+                await log("Selenium session ended")
+
+            # -------------------------------------------------------------------------
+            # File Capture (Selenium Released): wait, move, rename, size in a worker thread
+            # -------------------------------------------------------------------------
+            if result_payload is not None:
                 await log("Checking for downloaded files...")
                 try:
                     from core.services.file_manager import FileManager
 
-                    original_paths = FileManager.capture_downloads(
+                    files_metadata = await asyncio.to_thread(
+                        FileManager.collect_run_downloads,
                         run_id,
-                        pattern="*",
-                        timeout_seconds=30,
-                        source_dir=run_download_dir,
-                        exclude_paths=download_exclude_paths,
-                        min_modified_time=download_scan_start_ts,
-                        preexisting_signatures=download_exclude_signatures,
-                    )
-
-                    if original_paths:
-                        metadata = {
+                        {
                             "bank": connector_name.replace("conn_", "").replace("_", " ").title(),
                             "account": (
                                 params_with_context.get("conta")
@@ -353,61 +373,22 @@ def scrape_task(self, job_id: str, run_id: str, workspace_id: str, connector_nam
                                 or "0000"
                             ),
                             "date": datetime.now().strftime("%d%m%Y"),
-                        }
-
-                        files_metadata = []
-                        for idx, original_path in enumerate(original_paths, start=1):
-                            suffix = str(idx) if len(original_paths) > 1 else ""
-
-                            renamed_original = (
-                                FileManager.rename_file(original_path, metadata, suffix=suffix)
-                                or original_path
-                            )
-
-                            files_metadata.append(
-                                {
-                                    "file_type": "original",
-                                    "filename": os.path.basename(renamed_original),
-                                    "path": FileManager.to_artifact_relative(renamed_original),
-                                    "size_bytes": FileManager.get_file_size(renamed_original),
-                                    "status": "ready",
-                                }
-                            )
+                        },
+                        timeout_seconds=30,
+                        source_dir=run_download_dir,
+                        min_modified_time=download_scan_start_ts,
+                        snapshot=download_snapshot,
+                    )
 
-                        if files_metadata:
-                            await run.update({"$set": {"files": files_metadata}})
-                            await log(f"Files captured: {len(files_metadata)} original file(s)")
+                    if files_metadata:
+                        await run.update({"$set": {"files": files_metadata}})
+                        await log(f"Files captured: {len(files_metadata)} original file(s)")
                     else:
                         await log("No files downloaded")
 
                 except Exception as file_error:
                     await log(f"File capture error: {file_error}")
 
-                result_payload = (
-                    result.dict()
-                    if hasattr(result, "dict")
-                    else {"success": result.success, "data": result.data}
-                )
-
-            finally:
-                heartbeat_task.cancel()
-                try:
-                    await heartbeat_task
-                except asyncio.CancelledError:
-                    pass
-                
-                executor.stop()
-                if slot_token:
-                    await _release_selenium_slot(slot_token)
-                await log("Selenium session ended")
-
-                if run_download_dir and os.path.isdir(run_download_dir):
-                    try:
-                        shutil.rmtree(run_download_dir, ignore_errors=True)
-                        logger.info("Removed run download dir: %s", run_download_dir)
-                    except Exception as cleanup_error:
-                        logger.warning("Could not remove run download dir %s: %s", run_download_dir, cleanup_error)
-
             # -------------------------------------------------------------------------
             # Post-Processing (Selenium Released)
             # -------------------------------------------------------------------------
@@ -436,13 +417,9 @@ def scrape_task(self, job_id: str, run_id: str, workspace_id: str, connector_nam
 
                             for processed_path in processed_paths:
                                 current_files.append(
-                                    {
-                                        "file_type": "processed",
-                                        "filename": os.path.basename(processed_path),
-                                        "path": FileManager.to_artifact_relative(processed_path),
-                                        "size_bytes": FileManager.get_file_size(processed_path),
-                                        "status": "ready",
-                                    }
+                                    await asyncio.to_thread(
+                                        FileManager.artifact_entry, processed_path, "processed"
+                                    )
                                 )
 
                             await current_run.update({"$set": {"files": current_files}})
@@ -461,15 +438,21 @@ def scrape_task(self, job_id: str, run_id: str, workspace_id: str, connector_nam
             logger.exception(f"❌ Scrape task exception: {e}")
             await repo.save_run_status(run_id, "failed", str(e))
             raise
+        finally:
+            if run_download_dir and os.path.isdir(run_download_dir):
+                try:
+                    await asyncio.to_thread(shutil.rmtree, run_download_dir, True)
+                    logger.info("Removed run download dir: %s", run_download_dir)
+                except Exception as cleanup_error:
+                    logger.warning("Could not remove run download dir %s: %s", run_download_dir, cleanup_error)
+            # Final flush on success, failure or cancellation
+            await RunLogBuffer.close_run(run_id)
     
-    # Use existing event loop or create new one if needed
-    try:
-        loop = asyncio.get_event_loop()
-    except RuntimeError:
-        loop = asyncio.new_event_loop()
-        asyncio.set_event_loop(loop)
-    
-    return loop.run_until_complete(_async_scrape())
+    if supervisor:
+        # Threads pool: drive the run as one of several tasks on the worker loop.
+        return supervisor.run(run_id, _async_scrape, timeout_seconds=SCRAPE_TIME_LIMIT)
+
+    return _run_async(_async_scrape())
 
 
 @celery_app.task(base=DatabaseTask, bind=True)
@@ -478,6 +461,8 @@ def cleanup_stale_runs(self):
     Periodic task to cleanup stale/zombie runs.
     - Fails 'running' jobs with no heartbeat for > 5 mins
     - Fails 'queued' jobs older than > 1 hour
+    Runs are failed in bulk batches; their Selenium slots are released and
+    the whole sweep is announced in one run_updates message.
     """
     async def _cleanup():
         """Async implementation of stale run cleanup."""
@@ -485,37 +470,36 @@ def cleanup_stale_runs(self):
         
         # 1. Handle Zombie Running Jobs (No heartbeat)
         zombie_cutoff = get_now() - timedelta(minutes=5)
-        zombies = await Run.find(
-            Run.status == "running",
-            Run.updated_at < zombie_cutoff
-        ).to_list()
-        
-        for run in zombies:
-            logger.warning(f"🧟 Found zombie run {run.id}. Marking failed.")
-            run.status = "failed"
-            run.error_summary = "Zombie execution detected (Heartbeat lost)"
-            run.logs.append(f"[{get_now().time()}] 💀 System: Marked as zombie (no heartbeat > 5m)")
-            run.finished_at = get_now()
-            await run.save()
-            
+        zombies = await repo.fail_runs_matching(
+            {"status": "running", "updated_at": {"$lt": zombie_cutoff}},
+            "Zombie execution detected (Heartbeat lost)",
+            "💀 System: Marked as zombie (no heartbeat > 5m)",
+        )
+        if zombies:
+            logger.warning(f"🧟 Marked {len(zombies)} zombie run(s) failed")
+
         # 2. Handle Stuck Queued Jobs
         queue_cutoff = get_now() - timedelta(hours=1)
-        stuck_queued = await Run.find(
-            Run.status == "queued",
-            Run.created_at < queue_cutoff
-        ).to_list()
-        
-        for run in stuck_queued:
-            logger.warning(f"⏳ Found stuck queued run {run.id}. Marking failed.")
-            run.status = "failed"
-            run.error_summary = "Stuck in queue > 1h"
-            run.logs.append(f"[{get_now().time()}] 💀 System: Timeout in queue")
-            run.finished_at = get_now()
-            await run.save()
-            
+        stuck_queued = await repo.fail_runs_matching(
+            {"status": "queued", "created_at": {"$lt": queue_cutoff}},
+            "Stuck in queue > 1h",
+            "💀 System: Timeout in queue",
+        )
+        if stuck_queued:
+            logger.warning(f"⏳ Marked {len(stuck_queued)} stuck queued run(s) failed")
+
+        reaped = zombies + stuck_queued
+        if reaped:
+            # Dead holders would otherwise keep their slots until the leases expire
+            try:
+                await selenium_slots.release_runs([r["run_id"] for r in reaped])
+            except Exception as slot_error:
+                logger.error(f"Could not release Selenium slots of reaped runs: {slot_error}")
+            await repo.publish_status_batch(reaped, "failed")
+
         return f"Cleaned {len(zombies)} zombies and {len(stuck_queued)} stuck runs"
     
-    return asyncio.run(_cleanup())
+    return _run_async(_cleanup())
 
 
 @celery_app.task(base=DatabaseTask, bind=True)
@@ -537,11 +521,38 @@ def cleanup_old_runs_task(self, days_old: int = 90):
         # Delete old runs
         result = await Run.find(Run.created_at < cutoff).delete()
         deleted_count = result.deleted_count if hasattr(result, 'deleted_count') else 0
+
+        # Lines of runs created right before the cutoff may be newer; a later pass gets them
+        await RunLog.find(RunLog.created_at < cutoff).delete()
         
         logger.info(f"🗑️  Deleted {deleted_count} runs older than {days_old} days")
+        if deleted_count:
+            # Counters track the retained runs; recount instead of decrementing per run
+            await run_stats.rebuild_run_stats()
         return deleted_count
     
-    return asyncio.run(_cleanup())
+    return _run_async(_cleanup())
+
+
+@celery_app.task(base=DatabaseTask, bind=True)
+def artifact_retention_task(self):
+    """
+    Scheduled task: compress the artifacts of runs past ARTIFACTS_HOT_DAYS and
+    delete artifact directories of runs that no longer exist.
+
+    Returns:
+        dict: Bytes reclaimed per run (compressed / deleted) and in total
+    """
+    return _run_async(artifact_retention.apply_retention())
+
+
+@celery_app.task(base=DatabaseTask, bind=True)
+def rebuild_run_stats_task(self):
+    """
+    Reconciliation task: recompute the run_stats counters from the runs collection.
+    Repairs drift from manual edits or transitions that failed to update the counters.
+    """
+    return _run_async(run_stats.rebuild_run_stats())
 
 
 @celery_app.task(base=DatabaseTask, bind=True, max_retries=5, time_limit=300)
@@ -576,7 +587,6 @@ def scheduled_job_runner(self, job_id: str):
     """
     async def _run_scheduled():
         """Async implementation of scheduled job runner."""
-        await init_db()
         from core.models.mongo_models import Job, Run
         
         # Get job details
@@ -591,9 +601,10 @@ def scheduled_job_runner(self, job_id: str):
             job_name=job.name,
             connector=job.connector,
             status="queued",
-            logs=["[System] Scheduled execution"],
         )
         await run.save()
+        await repo.record_run_created(run)
+        await write_run_logs(run.id, ["[System] Scheduled execution"])
         
         logger.info(f"📅 Scheduled job triggered: {job_id}, run: {run.id}")
         
@@ -603,9 +614,10 @@ def scheduled_job_runner(self, job_id: str):
             run_id=str(run.id),
             workspace_id=job.workspace_id,
             connector_name=job.connector,
-            params=job.params
+            params=job.params,
+            priority=selenium_slots.PRIORITY_SCHEDULED,
         )
         
         return {"job_id": job_id, "run_id": str(run.id)}
     
-    return asyncio.run(_run_scheduled())
+    return _run_async(_run_scheduled())
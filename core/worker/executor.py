@@ -1,12 +1,12 @@
 import logging
 import os
 import re
-import time
 
-import requests
 from selenium import webdriver
 from selenium.webdriver.chrome.options import Options
 from core.config import settings
+from core.connectors.helpers.async_driver import AsyncDriver
+from core.worker.grid_topology import vnc_url_for
 
 logger = logging.getLogger(__name__)
 
@@ -26,6 +26,8 @@ class SeleniumExecutor:
         self.vnc_url = None
         self.use_local = use_local
         self.download_dir = download_dir
+        self.uses = 0  # Runs served by this session (see core.worker.session_pool)
+        self.browser_context_id = None  # CDP context of a reused session's windows
 
     def start(self):
         """Initializes the webdriver connection based on mode."""
@@ -109,12 +111,8 @@ class SeleniumExecutor:
                 self._enable_auto_download()
                 logger.info(f"✅ Created remote driver session: {self.driver.session_id}")
                 
-                # Try to get node info
-                self._resolve_vnc_url()
-                if self.vnc_url:
-                    logger.info(f"📺 VNC: {self.vnc_url}")
-                else:
-                    logger.warning("⚠️ VNC URL not resolved for this session")
+                # Otherwise the node/VNC comes from the Grid topology map (session_pool)
+                self._vnc_from_capabilities()
             except Exception as e:
                 logger.error(f"❌ Failed to connect to Selenium Grid: {e}")
                 raise
@@ -129,14 +127,14 @@ class SeleniumExecutor:
             "Page.setDownloadBehavior",
             {"behavior": "allow", "downloadPath": self.download_dir},
         )
-        browser_ok = self._execute_cdp_command(
-            "Browser.setDownloadBehavior",
-            {
-                "behavior": "allow",
-                "downloadPath": self.download_dir,
-                "eventsEnabled": False,
-            },
-        )
+        browser_params = {
+            "behavior": "allow",
+            "downloadPath": self.download_dir,
+            "eventsEnabled": False,
+        }
+        if self.browser_context_id:
+            browser_params["browserContextId"] = self.browser_context_id
+        browser_ok = self._execute_cdp_command("Browser.setDownloadBehavior", browser_params)
 
         if page_ok or browser_ok:
             logger.info(
@@ -149,15 +147,18 @@ class SeleniumExecutor:
 
     def _execute_cdp_command(self, cmd: str, params: dict) -> bool:
         """Execute CDP command across local and remote driver implementations."""
+        return self._cdp_call(cmd, params) is not None
+
+    def _cdp_call(self, cmd: str, params: dict) -> dict | None:
+        """Execute a CDP command and return its result, or None if it failed."""
         if not self.driver:
-            return False
+            return None
 
         # Local Chrome and some Selenium bindings expose execute_cdp_cmd directly.
         try:
             execute_cdp = getattr(self.driver, "execute_cdp_cmd", None)
             if callable(execute_cdp):
-                execute_cdp(cmd, params)
-                return True
+                return execute_cdp(cmd, params) or {}
         except Exception as e:
             logger.debug("CDP via execute_cdp_cmd failed for %s: %s", cmd, e)
 
@@ -172,164 +173,97 @@ class SeleniumExecutor:
                         "executeCdpCommand",
                         ("POST", "/session/$sessionId/goog/cdp/execute"),
                     )
-                execute("executeCdpCommand", {"cmd": cmd, "params": params})
-                return True
+                response = execute("executeCdpCommand", {"cmd": cmd, "params": params})
+                return (response or {}).get("value") or {}
         except Exception as e:
             logger.debug("CDP via execute() failed for %s: %s", cmd, e)
 
-        return False
+        return None
 
-    def _resolve_vnc_url(self, retries: int = 5, delay_seconds: float = 1.0) -> None:
-        """Resolve and set the VNC URL for the current session."""
-        # First try capabilities (Grid may expose nodeId)
-        caps = getattr(self.driver, "capabilities", {}) or {}
-        node_id = caps.get("se:nodeId") or caps.get("nodeId")
-        if node_id:
-            self.node_id = node_id
-            self.vnc_url = self._build_vnc_url(self.node_id, self.node_uri)
-            if self.vnc_url:
-                return
+    def set_download_dir(self, download_dir: str) -> None:
+        """Point browser downloads of a (reused) session at a new directory."""
+        self.download_dir = download_dir
+        self._enable_auto_download()
 
-        # Retry Grid session endpoint while session is still live
-        for _ in range(retries):
-            self.node_id = self.get_node_info()
-            # Prefer nodeUri when available (more reliable for mapping VNC ports)
-            if self.node_uri:
-                self.vnc_url = self._build_vnc_url(self.node_id or "", self.node_uri)
-                if self.vnc_url:
-                    return
-            if self.node_id:
-                self.vnc_url = self._build_vnc_url(self.node_id, self.node_uri)
-                if self.vnc_url:
-                    return
-            time.sleep(delay_seconds)
+    def is_alive(self) -> bool:
+        """True if the Grid still answers for this session."""
+        if not self.driver:
+            return False
+        try:
+            self.driver.current_url
+            return True
+        except Exception:
+            return False
 
-    def _build_vnc_url(self, node_id: str, node_uri: str | None) -> str | None:
-        """Build a VNC URL from the node ID or URI."""
-        candidates = [node_id or "", node_uri or ""]
-        for value in candidates:
-            match = re.search(r"chrome-node-(\d+)", value)
-            if match:
-                node_num = int(match.group(1))
-                return f"{settings.VNC_URL_BASE}:{7901 + node_num}"
-        return None
+    def reset_session(self) -> None:
+        """
+        Make the session safe for another run: move it into a fresh CDP
+        browser context and dispose of the one the run used. Cookies, cache,
+        storage and service workers of every origin the run reached (SSO
+        redirects and iframes included) belong to that context and go with
+        it. A session's first run uses the default context, which cannot be
+        disposed: its windows are closed and later contexts never see its
+        data. Raises if the context cannot be rotated (the pool then closes
+        the session instead of reusing it).
+        """
+        driver = self.driver
+        try:
+            driver.switch_to.alert.dismiss()
+        except Exception:
+            pass
+
+        self._open_browser_context()
 
-    def get_node_info(self):
-        """Attempt to retrieve the node ID from Selenium Grid."""
         try:
-            if not self.driver or not self.driver.session_id:
-                return None
-            
-            # Query Grid status endpoint
-            grid_url = settings.SELENIUM_REMOTE_URL.replace('/wd/hub', '')
-            session_url = f"{grid_url}/se/grid/session/{self.driver.session_id}"
-            status_url = f"{grid_url}/status"
+            driver.set_window_rect(x=0, y=0, width=1920, height=1080)
+            driver.maximize_window()
+        except Exception as e:
+            logger.debug("Could not reset window state: %s", e)
 
-            # Prefer session lookup (more reliable for node mapping)
-            try:
-                response = requests.get(session_url, timeout=5)
-                if response.status_code == 200:
-                    data = response.json().get("value", {})
-                    node_id = data.get("nodeId")
-                    node_uri = data.get("nodeUri") or data.get("uri")
-                    logger.info(
-                        "Grid session lookup: status=200 nodeId=%s nodeUri=%s",
-                        node_id,
-                        node_uri,
-                    )
-                    if node_uri:
-                        self.node_uri = node_uri
-                    if node_id:
-                        return node_id
-                else:
-                    logger.warning(
-                        "Grid session lookup: status=%s body=%s",
-                        response.status_code,
-                        response.text[:500],
-                    )
-            except Exception as e:
-                logger.warning(f"Could not query session endpoint: {e}")
+    def _open_browser_context(self) -> None:
+        """Switch to a blank window in a new browser context and drop the previous one."""
+        driver = self.driver
+        created = self._cdp_call("Target.createBrowserContext", {}) or {}
+        context_id = created.get("browserContextId")
+        if not context_id:
+            # A session still logged in must never serve another run
+            raise RuntimeError("Could not create a browser context over CDP")
+        target = self._cdp_call(
+            "Target.createTarget", {"url": "about:blank", "browserContextId": context_id}
+        ) or {}
+        target_id = target.get("targetId")
+        if not target_id:
+            self._execute_cdp_command("Target.disposeBrowserContext", {"browserContextId": context_id})
+            raise RuntimeError("Could not open a window in the new browser context")
 
-            # Try alternate session endpoint (older grid versions)
-            try:
-                alt_session_url = f"{grid_url}/session/{self.driver.session_id}"
-                alt_res = requests.get(alt_session_url, timeout=5)
-                if alt_res.status_code == 200:
-                    data = alt_res.json().get("value", {})
-                    node_id = data.get("nodeId")
-                    node_uri = data.get("nodeUri") or data.get("uri")
-                    logger.info(
-                        "Grid alt session lookup: status=200 nodeId=%s nodeUri=%s",
-                        node_id,
-                        node_uri,
-                    )
-                    if node_uri:
-                        self.node_uri = node_uri
-                    if node_id:
-                        return node_id
-                else:
-                    logger.warning(
-                        "Grid alt session lookup: status=%s body=%s",
-                        alt_res.status_code,
-                        alt_res.text[:500],
-                    )
-            except Exception as e:
-                logger.warning(f"Could not query alternate session endpoint: {e}")
-            
-            # Try GraphQL session lookup (Selenium 4)
-            try:
-                gql_url = f"{grid_url}/graphql"
-                query = {
-                    "query": (
-                        "query { "
-                        f"session(id: \"{self.driver.session_id}\") {{ id, nodeId, nodeUri }} "
-                        "}"
-                    )
-                }
-                gql_res = requests.post(gql_url, json=query, timeout=5)
-                if gql_res.status_code == 200:
-                    gql_data = gql_res.json()
-                    session = (gql_data.get("data") or {}).get("session") or {}
-                    node_id = session.get("nodeId")
-                    node_uri = session.get("nodeUri")
-                    logger.info(
-                        "Grid GraphQL session lookup: status=200 nodeId=%s nodeUri=%s",
-                        node_id,
-                        node_uri,
-                    )
-                    if node_uri:
-                        self.node_uri = node_uri
-                    if node_id:
-                        return node_id
-                else:
-                    logger.warning(
-                        "Grid GraphQL session lookup: status=%s body=%s",
-                        gql_res.status_code,
-                        gql_res.text[:500],
-                    )
-            except Exception as e:
-                logger.warning(f"Could not query GraphQL session: {e}")
+        # ChromeDriver window handles are the DevTools target ids
+        previous_handles = [handle for handle in driver.window_handles if handle != target_id]
+        driver.switch_to.window(target_id)
+        previous_context, self.browser_context_id = self.browser_context_id, context_id
+        if previous_context and not self._execute_cdp_command(
+            "Target.disposeBrowserContext", {"browserContextId": previous_context}
+        ):
+            raise RuntimeError("Could not dispose the previous browser context over CDP")
 
-            response = requests.get(status_url, timeout=5)
-            if response.status_code == 200:
-                data = response.json()
-                # Try to find which node has our session
-                nodes = data.get('value', {}).get('nodes', [])
-                for node in nodes:
-                    node_id = node.get('nodeId') or node.get('id')
-                    node_uri = node.get('uri')
-                    if node_id:
-                        self.node_uri = node_uri
-                        return node_id
-            
-            return None
-        except Exception as e:
-            logger.warning(f"Could not determine node ID: {e}")
-            return None
+        # Default-context windows (first run) or leftovers the disposal did not close
+        for handle in previous_handles:
+            if handle in driver.window_handles:
+                driver.switch_to.window(handle)
+                driver.close()
+        driver.switch_to.window(target_id)
+
+    def _vnc_from_capabilities(self) -> None:
+        """Use the node reported in the session capabilities, when the Grid sends it."""
+        caps = getattr(self.driver, "capabilities", {}) or {}
+        node_id = caps.get("se:nodeId") or caps.get("nodeId")
+        if node_id:
+            self.node_id = node_id
+            self.vnc_url = vnc_url_for(node_id, None)
 
     def stop(self):
         """Quits the webdriver session."""
         if self.driver:
+            AsyncDriver.discard(self.driver)
             try:
                 logger.info("🛑 Quitting webdriver session...")
                 self.driver.quit()
@@ -337,4 +271,5 @@ class SeleniumExecutor:
                 logger.warning(f"Error quitting driver: {e}")
             finally:
                 self.driver = None
+                self.browser_context_id = None
                 self.node_id = None
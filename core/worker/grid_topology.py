@@ -0,0 +1,119 @@
+"""
+Selenium Grid topology watcher.
+
+Keeps an in-memory map of Grid session -> node -> VNC URL for the worker
+process, built from the hub's `/status` endpoint (one request lists every
+node and the session in each of its slots). A background task refreshes it
+every SELENIUM_GRID_POLL_SECONDS; a lookup for a session the map does not know
+yet (it was created after the last poll) triggers an immediate refresh that
+concurrent lookups share, so opening N sessions at once costs one request.
+"""
+
+import asyncio
+import logging
+import re
+import time
+from typing import Dict, NamedTuple, Optional
+
+import httpx
+
+from core.config import settings
+
+logger = logging.getLogger(__name__)
+
+REQUEST_TIMEOUT_SECONDS = 5
+LOOKUP_WAIT_SECONDS = 5.0
+LOOKUP_RETRY_SECONDS = 0.5
+
+
+class GridNode(NamedTuple):
+    node_id: Optional[str]
+    node_uri: Optional[str]
+    vnc_url: Optional[str]
+
+
+def grid_base_url() -> str:
+    return settings.SELENIUM_REMOTE_URL.replace("/wd/hub", "").rstrip("/")
+
+
+def vnc_url_for(node_id: Optional[str], node_uri: Optional[str]) -> Optional[str]:
+    """noVNC URL of a `chrome-node-N` container (published on port 7901 + N)."""
+    for value in (node_id or "", node_uri or ""):
+        match = re.search(r"chrome-node-(\d+)", value)
+        if match:
+            return f"{settings.VNC_URL_BASE}:{7901 + int(match.group(1))}"
+    return None
+
+
+def parse_status(payload: dict) -> Dict[str, GridNode]:
+    """Map session id -> GridNode from a Grid 4 `/status` response."""
+    sessions: Dict[str, GridNode] = {}
+    for node in (payload.get("value") or {}).get("nodes") or []:
+        node_id = node.get("id") or node.get("nodeId")
+        node_uri = node.get("uri")
+        grid_node = GridNode(node_id, node_uri, vnc_url_for(node_id, node_uri))
+        for slot in node.get("slots") or []:
+            session = slot.get("session") or {}
+            session_id = session.get("sessionId")
+            if session_id:
+                sessions[session_id] = grid_node
+    return sessions
+
+
+class GridTopology:
+    """Per-process session -> node map, refreshed in the background."""
+
+    def __init__(self):
+        self._sessions: Dict[str, GridNode] = {}
+        self._refreshing: Optional[asyncio.Future] = None
+        self._poller: Optional[asyncio.Task] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self.refreshed_at: Optional[float] = None
+
+    def start(self) -> None:
+        """Start the background poll on the running loop (once per loop)."""
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop or self._poller is None or self._poller.done():
+            self._loop = loop
+            self._refreshing = None
+            self._poller = asyncio.create_task(self._poll())
+
+    async def _poll(self) -> None:
+        while True:
+            await self.refresh()
+            await asyncio.sleep(max(5, settings.SELENIUM_GRID_POLL_SECONDS))
+
+    async def refresh(self) -> None:
+        """Re-read the Grid status; callers arriving meanwhile share the request."""
+        if self._refreshing is None or self._refreshing.done():
+            self._refreshing = asyncio.ensure_future(self._fetch())
+        await asyncio.shield(self._refreshing)
+
+    async def _fetch(self) -> None:
+        try:
+            async with httpx.AsyncClient(timeout=REQUEST_TIMEOUT_SECONDS) as client:
+                response = await client.get(f"{grid_base_url()}/status")
+                response.raise_for_status()
+                self._sessions = parse_status(response.json())
+                self.refreshed_at = time.time()
+        except Exception as e:
+            # Keep the last known map; VNC links are best effort
+            logger.warning(f"Could not read Selenium Grid status: {e}")
+
+    async def lookup(self, session_id: str, wait_seconds: float = LOOKUP_WAIT_SECONDS) -> Optional[GridNode]:
+        """Node of a session, refreshing the map if the session is new to it."""
+        self.start()
+        deadline = time.monotonic() + wait_seconds
+        while True:
+            node = self._sessions.get(session_id)
+            if node or time.monotonic() >= deadline:
+                return node
+            await self.refresh()
+            if session_id not in self._sessions:
+                await asyncio.sleep(LOOKUP_RETRY_SECONDS)
+
+    def sessions(self) -> Dict[str, GridNode]:
+        return dict(self._sessions)
+
+
+grid_topology = GridTopology()
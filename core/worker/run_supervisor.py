@@ -0,0 +1,182 @@
+"""
+Multi-run supervisor for Celery workers.
+
+With `WORKER_MAX_CONCURRENT_RUNS > 1` the worker runs with `--pool=threads`
+and every Celery thread hands its coroutine to the process event loop owned
+by WorkerRuntime. Scrapes are I/O bound (Grid HTTP, Mongo, Redis), so a single
+process can drive several SeleniumExecutor sessions as asyncio tasks while the
+leased Selenium slot pool (core.worker.selenium_slots) keeps the global
+session count in check.
+
+Runs can be cancelled individually: the console publishes a cancel message on
+RUN_CONTROL_CHANNEL and the worker owning the run cancels its task, which
+unwinds the scrape `finally` blocks (browser stop, slot release).
+"""
+
+import asyncio
+import json
+import logging
+import threading
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+from core.config import settings
+from core.db import get_redis
+from core.worker.runtime import worker_runtime
+
+logger = logging.getLogger(__name__)
+
+RUN_CONTROL_CHANNEL = "run_control"
+
+
+async def publish_run_cancel(run_id: str) -> None:
+    """Ask whichever worker owns the run to cancel it."""
+    await get_redis().publish(
+        RUN_CONTROL_CHANNEL,
+        json.dumps({"action": "cancel", "run_id": run_id}),
+    )
+
+
+class RunSupervisor:
+    """Tracks the asyncio task of every run driven by this worker process."""
+
+    def __init__(self, max_concurrent_runs: int):
+        self.max_concurrent_runs = max(1, max_concurrent_runs)
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._start_lock = threading.Lock()
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._tasks: Dict[str, asyncio.Task] = {}
+        self._cancel_requested: set[str] = set()
+        self._control_task: Optional[asyncio.Task] = None
+
+    # ========== LIFECYCLE ==========
+
+    def start(self) -> None:
+        """Attach to the worker loop once (again after a runtime restart)."""
+        with self._start_lock:
+            loop = worker_runtime.loop
+            if self._loop is loop:
+                return
+            self._loop = loop
+            asyncio.run_coroutine_threadsafe(self._bootstrap(), loop).result()
+            logger.info(
+                f"✅ Run supervisor started (max {self.max_concurrent_runs} concurrent runs)"
+            )
+
+    async def _bootstrap(self) -> None:
+        """Create loop-bound state on the worker loop."""
+        self._semaphore = asyncio.Semaphore(self.max_concurrent_runs)
+        self._control_task = asyncio.create_task(self._listen_for_control())
+
+    # ========== RUNS ==========
+
+    def run(
+        self,
+        run_id: str,
+        coro_factory: Callable[[], Awaitable[Any]],
+        timeout_seconds: Optional[float] = None,
+    ) -> Any:
+        """
+        Execute a run on the worker loop, blocking the calling thread.
+
+        Waits for a free run slot, enforces the time limit (the threads pool
+        does not honour Celery's `time_limit`) and returns None if the run
+        was cancelled.
+        """
+        self.start()
+        future = asyncio.run_coroutine_threadsafe(
+            self._supervise(run_id, coro_factory, timeout_seconds), self._loop
+        )
+        return future.result()
+
+    async def _supervise(
+        self,
+        run_id: str,
+        coro_factory: Callable[[], Awaitable[Any]],
+        timeout_seconds: Optional[float],
+    ) -> Any:
+        async def _guarded():
+            async with self._semaphore:
+                return await coro_factory()
+
+        # Register before waiting on the semaphore so queued runs are cancellable.
+        task = asyncio.create_task(_guarded(), name=f"run-{run_id}")
+        self._tasks[run_id] = task
+        try:
+            return await asyncio.wait_for(task, timeout=timeout_seconds)
+        except asyncio.TimeoutError:
+            from core.repositories import repo
+
+            msg = f"Time limit exceeded ({int(timeout_seconds)}s)"
+            logger.error(f"⏱️ Run {run_id}: {msg}")
+            await repo.save_run_status(run_id, "failed", msg)
+            raise
+        except asyncio.CancelledError:
+            if run_id in self._cancel_requested:
+                logger.info(f"🛑 Run {run_id} cancelled")
+                return None
+            raise
+        finally:
+            self._tasks.pop(run_id, None)
+            self._cancel_requested.discard(run_id)
+
+    def cancel(self, run_id: str) -> bool:
+        """Cancel a local run from any thread. Returns False if not owned here."""
+        if not self._loop or run_id not in self._tasks:
+            return False
+        self._loop.call_soon_threadsafe(self._cancel_local, run_id)
+        return True
+
+    def _cancel_local(self, run_id: str) -> bool:
+        task = self._tasks.get(run_id)
+        if not task or task.done():
+            return False
+        self._cancel_requested.add(run_id)
+        task.cancel()
+        return True
+
+    @property
+    def active_runs(self) -> list[str]:
+        return list(self._tasks)
+
+    async def _listen_for_control(self) -> None:
+        """Apply cancel requests published by the console."""
+        while True:
+            pubsub = get_redis().pubsub()
+            try:
+                await pubsub.subscribe(RUN_CONTROL_CHANNEL)
+                async for message in pubsub.listen():
+                    if message.get("type") != "message":
+                        continue
+                    try:
+                        data = json.loads(message["data"])
+                    except (TypeError, ValueError):
+                        continue
+                    if data.get("action") == "cancel" and self._cancel_local(
+                        str(data.get("run_id"))
+                    ):
+                        logger.info(f"🛑 Cancel requested for run {data.get('run_id')}")
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Run control listener error: {e}")
+                await asyncio.sleep(5)
+            finally:
+                try:
+                    await pubsub.close()
+                except Exception:
+                    pass
+
+
+_supervisor: Optional[RunSupervisor] = None
+_supervisor_lock = threading.Lock()
+
+
+def get_supervisor() -> Optional[RunSupervisor]:
+    """Return the process supervisor, or None in single-run mode."""
+    global _supervisor
+    if settings.WORKER_MAX_CONCURRENT_RUNS <= 1:
+        return None
+    with _supervisor_lock:
+        if _supervisor is None:
+            _supervisor = RunSupervisor(settings.WORKER_MAX_CONCURRENT_RUNS)
+    return _supervisor
@@ -0,0 +1,89 @@
+"""
+Per-process resources for Celery workers.
+
+Each worker process owns one long-lived event loop running in a background
+thread, plus the Motor client (Beanie) and the Redis connection pool bound to
+it. Tasks submit their coroutines to this loop instead of creating a loop,
+a Mongo client and Redis connections per invocation.
+
+The runtime starts on `worker_process_init` (prefork children) or lazily on
+first use (threads/solo pools) and is torn down on worker shutdown.
+"""
+
+import asyncio
+import logging
+import threading
+from typing import Any, Awaitable, Optional
+
+from core.db import init_db, close_db, get_redis, close_redis
+
+logger = logging.getLogger(__name__)
+
+
+class WorkerRuntime:
+    """Owns the worker event loop and its loop-bound connections."""
+
+    def __init__(self):
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+
+    @property
+    def loop(self) -> asyncio.AbstractEventLoop:
+        self.start()
+        return self._loop
+
+    def start(self) -> None:
+        """Start the loop thread and open connections, once per process."""
+        with self._lock:
+            if self._loop and self._loop.is_running():
+                return
+            self._loop = asyncio.new_event_loop()
+            self._thread = threading.Thread(
+                target=self._loop.run_forever,
+                name="worker-loop",
+                daemon=True,
+            )
+            self._thread.start()
+            try:
+                asyncio.run_coroutine_threadsafe(self._open(), self._loop).result()
+            except BaseException:
+                # e.g. Mongo/Redis not up yet: tear down so the next start() retries
+                self._loop.call_soon_threadsafe(self._loop.stop)
+                self._thread.join(timeout=10)
+                self._loop.close()
+                self._loop = None
+                self._thread = None
+                raise
+            logger.info("✅ Worker runtime started (Beanie + Redis pool)")
+
+    async def _open(self) -> None:
+        await init_db()
+        await get_redis().ping()
+
+    def run(self, coro: Awaitable[Any]) -> Any:
+        """Run a coroutine on the worker loop and block for its result."""
+        return asyncio.run_coroutine_threadsafe(coro, self.loop).result()
+
+    def stop(self) -> None:
+        """Close connections and stop the loop thread."""
+        with self._lock:
+            if not self._loop or not self._loop.is_running():
+                return
+            try:
+                asyncio.run_coroutine_threadsafe(self._close(), self._loop).result(timeout=10)
+            except Exception as e:
+                logger.warning(f"Error closing worker connections: {e}")
+            self._loop.call_soon_threadsafe(self._loop.stop)
+            self._thread.join(timeout=10)
+            self._loop = None
+            self._thread = None
+            logger.info("🛑 Worker runtime stopped")
+
+    async def _close(self) -> None:
+        await close_redis()
+        await close_db()
+
+
+# Global singleton instance
+worker_runtime = WorkerRuntime()
@@ -0,0 +1,747 @@
+"""
+Lease-based Selenium slot pool with a priority wait queue and concurrency caps.
+
+Grid capacity is modelled as SELENIUM_MAX_SLOTS named slots (`slot-0`..).
+A run holds a slot through a lease that expires after
+SELENIUM_SLOT_LEASE_SECONDS unless the run heartbeat renews it. A worker that
+dies without releasing (OOM, `revoke(terminate=True)`, container restart)
+therefore only keeps its slot until the lease runs out; it is then reclaimed.
+
+Runs that find no free slot join a wait queue and park on a local future.
+Whoever frees a slot (release or reclaim) hands it straight to the first
+eligible waiter inside the same Lua script and announces the grant on
+SLOT_EVENTS_CHANNEL; each worker process keeps one subscription to that
+channel and wakes its own parked runs. A parked run makes no Redis calls of
+its own. The process that changed the queue also writes the new queue
+position and estimated wait of every waiter to its run document and to
+`run_updates`.
+
+Queue order is by enqueue time, credited with a head start per priority class
+(PRIORITY_WEIGHTS x SELENIUM_PRIORITY_STEP_SECONDS): a manual run overtakes
+scheduled runs queued up to two steps before it, a retry up to one step, and
+a scheduled run that waited longer than that still goes first, so no class
+starves. A waiter is skipped (but keeps its place) while its connector or its
+credential already holds as many slots as the limit it was queued with
+(`Job.connector_session_limit`, `Credential.session_limit`).
+
+Redis layout:
+- `selenium:slots:leases`   ZSET slot -> lease expiry (unix seconds)
+- `selenium:slots:holders`  HASH slot -> JSON {run_id, worker, acquired_at, renewed_at, connector, credential_id}
+- `selenium:slots:waiters`  ZSET run_id -> queue score (enqueue time minus priority head start)
+- `selenium:slots:requests` HASH run_id -> JSON {priority, connector, credential_id, *_limit} of waiters
+- `selenium:slots:avg_hold` moving average of slot hold time (seconds), for ETAs
+
+Every state change is a Lua script, so acquire/renew/release are atomic across
+workers and a reclaimed slot can never be released or renewed by its old holder.
+"""
+
+import asyncio
+import json
+import logging
+import math
+import os
+import socket
+import time
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+from pymongo import UpdateOne
+
+from core.config import settings
+from core.db import get_redis
+from core.models.mongo_models import Run
+
+logger = logging.getLogger(__name__)
+
+SLOT_LEASES_KEY = "selenium:slots:leases"
+SLOT_HOLDERS_KEY = "selenium:slots:holders"
+SLOT_WAITERS_KEY = "selenium:slots:waiters"
+SLOT_REQUESTS_KEY = "selenium:slots:requests"
+SLOT_AVG_HOLD_KEY = "selenium:slots:avg_hold"
+SLOT_EVENTS_CHANNEL = "selenium:slots:events"
+RUN_UPDATES_CHANNEL = "run_updates"
+
+# Initial hold-time guess for ETAs until real runs have been measured
+DEFAULT_AVG_HOLD_SECONDS = 300
+
+PRIORITY_MANUAL = "manual"
+PRIORITY_RETRY = "retry"
+PRIORITY_SCHEDULED = "scheduled"
+# Head start in SELENIUM_PRIORITY_STEP_SECONDS units
+PRIORITY_WEIGHTS = {
+    PRIORITY_MANUAL: 2,
+    PRIORITY_RETRY: 1,
+    PRIORITY_SCHEDULED: 0,
+}
+
+WORKER_ID = f"{socket.gethostname()}:{os.getpid()}"
+
+SELENIUM_MAX_SLOTS = max(
+    1,
+    settings.SELENIUM_MAX_SLOTS,
+    settings.SELENIUM_NODE_COUNT * settings.SELENIUM_NODE_MAX_SESSIONS,
+)
+
+
+class SlotRequest(NamedTuple):
+    """What a run asks the pool for: its priority class and concurrency caps."""
+    run_id: str
+    priority: str = PRIORITY_SCHEDULED
+    connector: Optional[str] = None
+    credential_id: Optional[str] = None
+    # Max slots held at once by runs of this connector / credential (None = no cap)
+    connector_limit: Optional[int] = None
+    credential_limit: Optional[int] = None
+
+
+# Shared by the scripts below: reclaim expired leases, then give free slots to
+# waiters in queue order, skipping those whose connector/credential is at its
+# cap. Appends {run_id, slot} pairs to `grants`.
+_LUA_GRANT_FREE = """
+local leases, holders, waiters, requests = KEYS[1], KEYS[2], KEYS[3], KEYS[4]
+local function at_limit(counts, key, limit)
+    if not key or not limit then
+        return false
+    end
+    return (counts[key] or 0) >= limit
+end
+local function count_key(prefix, value)
+    return value and (prefix .. value)
+end
+local function reclaim_and_grant(now, expires_at, max_slots, grants)
+    local expired = redis.call('ZRANGEBYSCORE', leases, '-inf', now)
+    for _, slot in ipairs(expired) do
+        redis.call('ZREM', leases, slot)
+        redis.call('HDEL', holders, slot)
+    end
+    local free = {}
+    for i = 0, max_slots - 1 do
+        local slot = 'slot-' .. i
+        if not redis.call('ZSCORE', leases, slot) then
+            table.insert(free, slot)
+        end
+    end
+    if #free == 0 then
+        return
+    end
+    local queued = redis.call('ZRANGE', waiters, 0, -1)
+    if #queued == 0 then
+        return
+    end
+    -- Slots currently held per connector and per credential
+    local counts = {}
+    local all = redis.call('HGETALL', holders)
+    for i = 2, #all, 2 do
+        local held = cjson.decode(all[i])
+        local connector_key = count_key('connector:', held['connector'])
+        local credential_key = count_key('credential:', held['credential_id'])
+        if connector_key then
+            counts[connector_key] = (counts[connector_key] or 0) + 1
+        end
+        if credential_key then
+            counts[credential_key] = (counts[credential_key] or 0) + 1
+        end
+    end
+    local next_free = 1
+    for _, run_id in ipairs(queued) do
+        if next_free > #free then
+            return
+        end
+        local raw = redis.call('HGET', requests, run_id)
+        local request = raw and cjson.decode(raw) or {}
+        local connector_key = count_key('connector:', request['connector'])
+        local credential_key = count_key('credential:', request['credential_id'])
+        if not at_limit(counts, connector_key, request['connector_limit'])
+            and not at_limit(counts, credential_key, request['credential_limit']) then
+            local slot = free[next_free]
+            next_free = next_free + 1
+            redis.call('ZREM', waiters, run_id)
+            redis.call('HDEL', requests, run_id)
+            redis.call('ZADD', leases, expires_at, slot)
+            redis.call('HSET', holders, slot, cjson.encode({
+                run_id = run_id, worker = 'granted', acquired_at = now, renewed_at = now,
+                connector = request['connector'], credential_id = request['credential_id']
+            }))
+            if connector_key then
+                counts[connector_key] = (counts[connector_key] or 0) + 1
+            end
+            if credential_key then
+                counts[credential_key] = (counts[credential_key] or 0) + 1
+            end
+            table.insert(grants, run_id)
+            table.insert(grants, slot)
+        end
+    end
+end
+local function find_held(run_id)
+    local all = redis.call('HGETALL', holders)
+    for i = 1, #all, 2 do
+        if cjson.decode(all[i + 1])['run_id'] == run_id then
+            return all[i]
+        end
+    end
+    return false
+end
+"""
+
+# Join the queue (unless already holding a slot) and run a grant pass, so a
+# run can take a free slot that capped waiters ahead of it cannot use.
+# Reply: {slot or '', queue position (0 when leased), grants to other runs...}
+_ACQUIRE_SCRIPT = _LUA_GRANT_FREE + """
+local run_id, now, expires_at = ARGV[1], tonumber(ARGV[2]), ARGV[3]
+local max_slots, worker, score, request = tonumber(ARGV[4]), ARGV[5], ARGV[6], ARGV[7]
+local grants = {}
+reclaim_and_grant(now, expires_at, max_slots, grants)
+if not find_held(run_id) then
+    redis.call('ZADD', waiters, 'NX', score, run_id)
+    redis.call('HSETNX', requests, run_id, request)
+    reclaim_and_grant(now, expires_at, max_slots, grants)
+end
+local reply = {'', 0}
+local held = find_held(run_id)
+if held then
+    local holder = cjson.decode(redis.call('HGET', holders, held))
+    holder['worker'] = worker
+    redis.call('HSET', holders, held, cjson.encode(holder))
+    reply[1] = held
+else
+    reply[2] = redis.call('ZRANK', waiters, run_id) + 1
+end
+for i = 1, #grants, 2 do
+    if grants[i] ~= run_id then
+        table.insert(reply, grants[i])
+        table.insert(reply, grants[i + 1])
+    end
+end
+return reply
+"""
+
+# Extend a lease if (and only if) the run still holds it. Returns 1 or 0.
+_RENEW_SCRIPT = """
+local leases, holders = KEYS[1], KEYS[2]
+local slot, run_id, expires_at = ARGV[1], ARGV[2], ARGV[3]
+local now, worker = tonumber(ARGV[4]), ARGV[5]
+local current = redis.call('HGET', holders, slot)
+if not current or cjson.decode(current)['run_id'] ~= run_id then
+    return 0
+end
+local holder = cjson.decode(current)
+holder['renewed_at'] = now
+holder['worker'] = worker
+redis.call('ZADD', leases, 'XX', expires_at, slot)
+redis.call('HSET', holders, slot, cjson.encode(holder))
+return 1
+"""
+
+# Release a lease held by the run and hand free slots to waiters.
+# Reply: {1 if released else 0, grants...}
+_RELEASE_SCRIPT = _LUA_GRANT_FREE + """
+local avg_key = KEYS[5]
+local slot, run_id, now, expires_at = ARGV[1], ARGV[2], tonumber(ARGV[3]), ARGV[4]
+local max_slots = tonumber(ARGV[5])
+local reply = {0}
+local current = redis.call('HGET', holders, slot)
+if current and cjson.decode(current)['run_id'] == run_id then
+    local held_for = now - tonumber(cjson.decode(current)['acquired_at'])
+    local avg = tonumber(redis.call('GET', avg_key) or held_for)
+    redis.call('SET', avg_key, tostring(avg * 0.8 + held_for * 0.2))
+    redis.call('ZREM', leases, slot)
+    redis.call('HDEL', holders, slot)
+    reply[1] = 1
+end
+local grants = {}
+reclaim_and_grant(now, expires_at, max_slots, grants)
+for _, v in ipairs(grants) do
+    table.insert(reply, v)
+end
+return reply
+"""
+
+# Leave the queue, after a last grant pass (an expired lease nobody reclaimed
+# may be free for this run). Reply: {slot if this run holds one else '', grants to other runs...}
+_CANCEL_WAIT_SCRIPT = _LUA_GRANT_FREE + """
+local run_id, now, expires_at, max_slots = ARGV[1], tonumber(ARGV[2]), ARGV[3], tonumber(ARGV[4])
+local grants = {}
+reclaim_and_grant(now, expires_at, max_slots, grants)
+redis.call('HDEL', requests, run_id)
+redis.call('ZREM', waiters, run_id)
+local reply = {find_held(run_id) or ''}
+for i = 1, #grants, 2 do
+    if grants[i] ~= run_id then
+        table.insert(reply, grants[i])
+        table.insert(reply, grants[i + 1])
+    end
+end
+return reply
+"""
+
+# Reclaim expired leases and hand them to waiters. Reply: {grants...}
+_RECLAIM_SCRIPT = _LUA_GRANT_FREE + """
+local now, expires_at, max_slots = tonumber(ARGV[1]), ARGV[2], tonumber(ARGV[3])
+local grants = {}
+reclaim_and_grant(now, expires_at, max_slots, grants)
+return grants
+"""
+
+# Drop every lease and queue entry of the given runs (reaped as dead) and hand
+# the freed slots to waiters. Reply: {leases released, grants...}
+_RELEASE_RUNS_SCRIPT = _LUA_GRANT_FREE + """
+local now, expires_at, max_slots = tonumber(ARGV[1]), ARGV[2], tonumber(ARGV[3])
+local reaped = {}
+for i = 4, #ARGV do
+    reaped[ARGV[i]] = true
+    redis.call('ZREM', waiters, ARGV[i])
+    redis.call('HDEL', requests, ARGV[i])
+end
+local released = 0
+local all = redis.call('HGETALL', holders)
+for i = 1, #all, 2 do
+    if reaped[cjson.decode(all[i + 1])['run_id']] then
+        redis.call('ZREM', leases, all[i])
+        redis.call('HDEL', holders, all[i])
+        released = released + 1
+    end
+end
+local reply = {released}
+local grants = {}
+reclaim_and_grant(now, expires_at, max_slots, grants)
+for _, v in ipairs(grants) do
+    table.insert(reply, v)
+end
+return reply
+"""
+
+# Runs per _RELEASE_RUNS_SCRIPT call
+RELEASE_RUNS_CHUNK = 500
+
+
+def lease_seconds() -> int:
+    return max(30, settings.SELENIUM_SLOT_LEASE_SECONDS)
+
+
+def heartbeat_seconds() -> float:
+    """Renewal interval of a held lease: three renewals fit in one lease."""
+    return min(60.0, lease_seconds() / 3)
+
+
+def _decode(value) -> str:
+    return value.decode() if isinstance(value, (bytes, bytearray)) else str(value)
+
+
+def _queue_score(priority: str, now: float) -> float:
+    """Enqueue time minus the head start of the run's priority class."""
+    weight = PRIORITY_WEIGHTS.get(priority, PRIORITY_WEIGHTS[PRIORITY_SCHEDULED])
+    return now - weight * max(0, settings.SELENIUM_PRIORITY_STEP_SECONDS)
+
+
+def _request_json(request: SlotRequest) -> str:
+    # None fields are left out: Lua would decode JSON null as a truthy value
+    return json.dumps({
+        key: value for key, value in request._asdict().items()
+        if key != "run_id" and value is not None
+    })
+
+
+def _pairs(flat: list) -> List[Tuple[str, str]]:
+    items = [_decode(v) for v in flat]
+    return list(zip(items[0::2], items[1::2]))
+
+
+class SlotScheduler:
+    """
+    Per-process side of the wait queue: one pub/sub subscription that wakes
+    the runs parked by this process when a slot is handed to them, and a
+    reclaim tick that hands on the slots of holders that died without
+    releasing (parked runs make no Redis calls of their own).
+    """
+
+    def __init__(self):
+        self._parked: Dict[str, asyncio.Future] = {}
+        self._listener: Optional[asyncio.Task] = None
+        self._reclaimer: Optional[asyncio.Task] = None
+        self._ready: Optional[asyncio.Event] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+    async def _ensure_listener(self) -> None:
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop or self._listener is None or self._listener.done():
+            self._loop = loop
+            self._ready = asyncio.Event()
+            self._listener = asyncio.create_task(self._listen())
+        if self._reclaimer is None or self._reclaimer.done() or self._reclaimer.get_loop() is not loop:
+            self._reclaimer = asyncio.create_task(self._reclaim_loop())
+        try:
+            await asyncio.wait_for(self._ready.wait(), 10)
+        except asyncio.TimeoutError:
+            # Grants are recovered from the holders hash once the listener connects
+            logger.warning("Selenium slot listener not subscribed yet; continuing")
+
+    async def _listen(self) -> None:
+        backoff = 1
+        while True:
+            pubsub = get_redis().pubsub()
+            try:
+                await pubsub.subscribe(SLOT_EVENTS_CHANNEL)
+                backoff = 1
+                # Grants announced while we were not subscribed are found in the holders hash
+                await self._recover_grants()
+                self._ready.set()
+                async for message in pubsub.listen():
+                    if message["type"] != "message":
+                        continue
+                    try:
+                        payload = json.loads(message["data"])
+                    except (TypeError, ValueError):
+                        continue
+                    for grant in payload.get("grants", []):
+                        self._wake(grant["run_id"], grant["slot"])
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Selenium slot listener error, reconnecting in {backoff}s: {e}")
+                await asyncio.sleep(backoff)
+                backoff = min(backoff * 2, 30)
+            finally:
+                try:
+                    await pubsub.close()
+                except Exception:
+                    pass
+
+    async def _reclaim_loop(self) -> None:
+        while True:
+            await asyncio.sleep(max(1.0, lease_seconds() / 2))
+            if not self._parked:
+                continue
+            try:
+                await reclaim_expired()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(f"Selenium slot reclaim tick failed: {e}")
+
+    async def _recover_grants(self) -> None:
+        if not self._parked:
+            return
+        holders = await get_redis().hgetall(SLOT_HOLDERS_KEY)
+        for slot, raw in holders.items():
+            self._wake(json.loads(raw).get("run_id"), _decode(slot))
+
+    def _wake(self, run_id: str, slot: str) -> None:
+        future = self._parked.get(run_id)
+        if future and not future.done():
+            future.set_result(slot)
+
+    async def acquire(self, request: SlotRequest, timeout_seconds: int) -> Optional[str]:
+        run_id = request.run_id
+        await self._ensure_listener()
+        future = asyncio.get_running_loop().create_future()
+        # Park before asking, so a grant racing with the reply is not missed
+        self._parked[run_id] = future
+        try:
+            slot, position = await _try_acquire(request)
+            if slot:
+                return slot
+            logger.info(f"⏳ Run {run_id} waiting for Selenium slot (position {position})")
+            try:
+                slot = await asyncio.wait_for(asyncio.shield(future), timeout_seconds)
+            except asyncio.TimeoutError:
+                slot = await _cancel_wait(run_id)
+                if not slot:
+                    logger.error(f"⏳ Timed out waiting for Selenium slot after {timeout_seconds}s")
+                    return None
+            except asyncio.CancelledError:
+                # Run cancelled while parked: leave the queue, give back a late grant
+                slot = await _cancel_wait(run_id)
+                if slot:
+                    await release_slot(slot, run_id)
+                raise
+            await _publish_positions([(run_id, None)])
+            return slot
+        finally:
+            self._parked.pop(run_id, None)
+
+
+slot_scheduler = SlotScheduler()
+
+
+async def _try_acquire(request: SlotRequest) -> Tuple[Optional[str], int]:
+    """One atomic attempt: lease a slot, or join the queue. Returns (slot, position)."""
+    run_id = request.run_id
+    now = time.time()
+    reply = await get_redis().eval(
+        _ACQUIRE_SCRIPT,
+        4,
+        SLOT_LEASES_KEY,
+        SLOT_HOLDERS_KEY,
+        SLOT_WAITERS_KEY,
+        SLOT_REQUESTS_KEY,
+        run_id,
+        now,
+        now + lease_seconds(),
+        SELENIUM_MAX_SLOTS,
+        WORKER_ID,
+        _queue_score(request.priority, now),
+        _request_json(request),
+    )
+    slot = _decode(reply[0]) or None
+    position = int(reply[1])
+    grants = _pairs(reply[2:])
+    if grants:
+        await _announce_grants(grants)
+    elif position:
+        await _publish_positions([(run_id, position)])
+    return slot, position
+
+
+async def acquire_slot(request: SlotRequest, timeout_seconds: int = 300) -> Optional[str]:
+    """Lease a slot, waiting in queue order (within its caps) for up to timeout_seconds."""
+    slot = await slot_scheduler.acquire(request, timeout_seconds)
+    if slot:
+        logger.info(f"✅ Acquired Selenium slot {slot} for run {request.run_id} ({request.priority})")
+    return slot
+
+
+async def renew_slot(slot: str, run_id: str) -> bool:
+    """Extend the run's lease; False means it expired and was reclaimed."""
+    now = time.time()
+    renewed = await get_redis().eval(
+        _RENEW_SCRIPT,
+        2,
+        SLOT_LEASES_KEY,
+        SLOT_HOLDERS_KEY,
+        slot,
+        run_id,
+        now + lease_seconds(),
+        now,
+        WORKER_ID,
+    )
+    if not renewed:
+        logger.warning(f"⚠️ Selenium slot {slot} lease of run {run_id} was lost (expired and reclaimed)")
+    return bool(renewed)
+
+
+async def release_slot(slot: str, run_id: str) -> None:
+    """Give the slot back (straight to the next waiter, if any)."""
+    if not slot:
+        return
+    now = time.time()
+    reply = await get_redis().eval(
+        _RELEASE_SCRIPT,
+        5,
+        SLOT_LEASES_KEY,
+        SLOT_HOLDERS_KEY,
+        SLOT_WAITERS_KEY,
+        SLOT_REQUESTS_KEY,
+        SLOT_AVG_HOLD_KEY,
+        slot,
+        run_id,
+        now,
+        now + lease_seconds(),
+        SELENIUM_MAX_SLOTS,
+    )
+    if int(reply[0]):
+        logger.info(f"🔓 Released Selenium slot {slot}")
+    else:
+        logger.warning(f"Selenium slot {slot} was no longer held by run {run_id}")
+    grants = _pairs(reply[1:])
+    if grants:
+        await _announce_grants(grants)
+
+
+async def release_runs(run_ids: List[str]) -> int:
+    """
+    Free the slots held by runs that are gone (e.g. reaped zombies) and take
+    them out of the wait queue, without waiting for their leases to expire.
+    Returns the number of leases released.
+    """
+    released = 0
+    grants: List[Tuple[str, str]] = []
+    for start in range(0, len(run_ids), RELEASE_RUNS_CHUNK):
+        now = time.time()
+        reply = await get_redis().eval(
+            _RELEASE_RUNS_SCRIPT,
+            4,
+            SLOT_LEASES_KEY,
+            SLOT_HOLDERS_KEY,
+            SLOT_WAITERS_KEY,
+            SLOT_REQUESTS_KEY,
+            now,
+            now + lease_seconds(),
+            SELENIUM_MAX_SLOTS,
+            *run_ids[start:start + RELEASE_RUNS_CHUNK],
+        )
+        released += int(reply[0])
+        grants.extend(_pairs(reply[1:]))
+    if released:
+        logger.info(f"🔓 Released {released} Selenium slot(s) held by reaped runs")
+    if grants:
+        await _announce_grants(grants)
+    elif run_ids:
+        await _publish_queue()
+    return released
+
+
+async def _cancel_wait(run_id: str) -> Optional[str]:
+    now = time.time()
+    reply = await get_redis().eval(
+        _CANCEL_WAIT_SCRIPT,
+        4,
+        SLOT_LEASES_KEY,
+        SLOT_HOLDERS_KEY,
+        SLOT_WAITERS_KEY,
+        SLOT_REQUESTS_KEY,
+        run_id,
+        now,
+        now + lease_seconds(),
+        SELENIUM_MAX_SLOTS,
+    )
+    slot = _decode(reply[0]) or None
+    grants = _pairs(reply[1:])
+    if grants:
+        await _announce_grants(grants)
+    if not slot:
+        await _publish_positions([(run_id, None)])
+        if not grants:
+            await _publish_queue()
+    return slot
+
+
+async def reclaim_expired() -> int:
+    """
+    Reclaim leases that expired without a release (crashed holder) and hand
+    them to waiters. Returns the number of grants made.
+    """
+    now = time.time()
+    reply = await get_redis().eval(
+        _RECLAIM_SCRIPT,
+        4,
+        SLOT_LEASES_KEY,
+        SLOT_HOLDERS_KEY,
+        SLOT_WAITERS_KEY,
+        SLOT_REQUESTS_KEY,
+        now,
+        now + lease_seconds(),
+        SELENIUM_MAX_SLOTS,
+    )
+    grants = _pairs(reply)
+    if grants:
+        logger.info(f"♻️ Reclaimed expired Selenium slot(s) for {len(grants)} waiting run(s)")
+        await _announce_grants(grants)
+    return len(grants)
+
+
+async def _announce_grants(grants: List[Tuple[str, str]]) -> None:
+    """Wake the granted runs (wherever they are parked) and refresh positions."""
+    try:
+        await get_redis().publish(
+            SLOT_EVENTS_CHANNEL,
+            json.dumps({"type": "granted", "grants": [{"run_id": r, "slot": s} for r, s in grants]}),
+        )
+    except Exception as e:
+        # Parked runs also find their grant when their listener resubscribes
+        logger.error(f"Failed to announce Selenium slot grants: {e}")
+    await _publish_queue()
+
+
+async def _publish_queue() -> None:
+    """Re-publish the position of every waiting run after the queue moved."""
+    waiters = await get_redis().zrange(SLOT_WAITERS_KEY, 0, -1)
+    await _publish_positions([(_decode(run_id), i + 1) for i, run_id in enumerate(waiters)])
+
+
+def _estimated_wait(position: int, avg_hold: float) -> int:
+    """Every SELENIUM_MAX_SLOTS runs ahead cost about one average slot hold."""
+    return int(math.ceil(position / SELENIUM_MAX_SLOTS) * avg_hold)
+
+
+async def _publish_positions(positions: List[Tuple[str, Optional[int]]]) -> None:
+    """
+    Write queue position/ETA to the run documents and publish them to
+    run_updates; a None position clears them (the run left the queue).
+    """
+    if not positions:
+        return
+    from core.repositories import repo
+
+    try:
+        avg_hold = await get_redis().get(SLOT_AVG_HOLD_KEY)
+        avg_hold = float(avg_hold) if avg_hold else DEFAULT_AVG_HOLD_SECONDS
+        etas = {
+            run_id: _estimated_wait(position, avg_hold) if position else None
+            for run_id, position in positions
+        }
+        await Run.get_motor_collection().bulk_write(
+            [
+                UpdateOne(
+                    {"_id": run_id},
+                    {"$set": {"queue_position": position, "queue_eta_seconds": etas[run_id]}},
+                )
+                for run_id, position in positions
+            ],
+            ordered=False,
+        )
+        job_ids = {}
+        async for doc in Run.get_motor_collection().find(
+            {"_id": {"$in": [run_id for run_id, _ in positions]}},
+            projection={"job_id": 1, "status": 1},
+        ):
+            job_ids[doc["_id"]] = (doc.get("job_id"), doc.get("status"))
+
+        pipe = get_redis().pipeline(transaction=False)
+        for run_id, position in positions:
+            job_id, status = job_ids.get(run_id, (None, None))
+            pipe.publish(RUN_UPDATES_CHANNEL, json.dumps({
+                "type": "queue",
+                "run_id": run_id,
+                "job_id": job_id,
+                "workspace_id": await repo.job_workspace(job_id),
+                "status": status,
+                "queue_position": position,
+                "queue_eta_seconds": etas[run_id],
+            }))
+        await pipe.execute()
+    except Exception as e:
+        logger.error(f"Failed to publish Selenium queue positions: {e}")
+
+
+async def list_slots() -> List[Dict]:
+    """Every slot with its current holder and lease timings (for the admin view)."""
+    redis_client = get_redis()
+    leases = dict(await redis_client.zrange(SLOT_LEASES_KEY, 0, -1, withscores=True))
+    holders = await redis_client.hgetall(SLOT_HOLDERS_KEY)
+    leases = {_decode(k): v for k, v in leases.items()}
+    holders = {_decode(k): json.loads(v) for k, v in holders.items()}
+
+    now = time.time()
+    names = [f"slot-{i}" for i in range(SELENIUM_MAX_SLOTS)]
+    # Slots above the configured size are still listed while a lease is out
+    names += sorted(set(leases) - set(names))
+    slots = []
+    for name in names:
+        holder = holders.get(name)
+        expires_at = leases.get(name)
+        if not holder or expires_at is None:
+            slots.append({"slot": name, "state": "free"})
+            continue
+        slots.append({
+            "slot": name,
+            "state": "expired" if expires_at <= now else "leased",
+            "run_id": holder.get("run_id"),
+            "worker": holder.get("worker"),
+            "connector": holder.get("connector"),
+            "credential_id": holder.get("credential_id"),
+            "held_seconds": round(now - holder.get("acquired_at", now), 1),
+            "last_renewed_seconds_ago": round(now - holder.get("renewed_at", now), 1),
+            "expires_in_seconds": round(expires_at - now, 1),
+        })
+    return slots
+
+
+async def list_waiters() -> List[Dict]:
+    """Runs waiting for a slot, in queue order, with their priority and caps."""
+    redis_client = get_redis()
+    waiters = [_decode(run_id) for run_id in await redis_client.zrange(SLOT_WAITERS_KEY, 0, -1)]
+    requests = await redis_client.hmget(SLOT_REQUESTS_KEY, waiters) if waiters else []
+    return [
+        {"run_id": run_id, "position": i + 1, **(json.loads(raw) if raw else {})}
+        for i, (run_id, raw) in enumerate(zip(waiters, requests))
+    ]
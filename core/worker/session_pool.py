@@ -0,0 +1,215 @@
+"""
+Pool of ready Selenium Grid sessions, one per worker process.
+
+Opening a Grid session costs a `webdriver.Remote` handshake, the CDP download
+setup and the node/VNC lookup (core.worker.grid_topology), before a connector does anything. With
+SELENIUM_SESSION_POOL_SIZE > 0 the process keeps up to that many sessions
+open: they are created ahead of time (at most
+SELENIUM_SESSION_POOL_WARMUP_CONCURRENCY at once), leased by runs once they
+hold a Selenium slot and handed back afterwards. A returned session moves to
+a fresh browser context, dropping the one the run used
+(SeleniumExecutor.reset_session), before it goes idle, and is re-pointed at
+the next run's download directory when leased.
+
+Sessions are discarded instead of reused when the run raised or was
+cancelled, after SELENIUM_SESSION_POOL_MAX_USES runs, after
+SELENIUM_SESSION_POOL_IDLE_SECONDS without a run, or when the Grid stops
+answering for them. Idle sessions are pinged every KEEPALIVE_SECONDS so the
+Grid's session timeout does not reap them.
+
+Idle pooled sessions occupy Grid node capacity without holding a slot lease:
+size the Grid for SELENIUM_MAX_SLOTS plus the pool of every worker process.
+Local (JP Morgan) sessions are never pooled.
+"""
+
+import asyncio
+import logging
+import os
+import time
+from collections import deque
+from typing import Deque, Optional, Tuple
+
+from core.config import settings
+from core.connectors.helpers.async_driver import AsyncDriver
+from core.worker.executor import SeleniumExecutor
+from core.worker.grid_topology import grid_topology
+
+logger = logging.getLogger(__name__)
+
+KEEPALIVE_SECONDS = 60
+
+
+class SessionPool:
+    """Idle SeleniumExecutor sessions kept open between runs."""
+
+    def __init__(self):
+        self._idle: Deque[Tuple[SeleniumExecutor, float]] = deque()
+        self._open = 0  # idle + leased pooled sessions
+        self._warming: Optional[asyncio.Task] = None
+        self._keepalive: Optional[asyncio.Task] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._closed = False
+
+    @property
+    def size(self) -> int:
+        return max(0, settings.SELENIUM_SESSION_POOL_SIZE)
+
+    @property
+    def enabled(self) -> bool:
+        return self.size > 0 and not self._closed
+
+    def start(self) -> None:
+        """Start warmup and keepalive on the running loop (no-op when disabled)."""
+        if not self.enabled:
+            return
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop or self._keepalive is None or self._keepalive.done():
+            self._loop = loop
+            self._keepalive = asyncio.create_task(self._keep_alive())
+        self._schedule_warmup()
+
+    # ========== LEASE / RETURN ==========
+
+    async def lease(self, use_local: bool, download_dir: str) -> SeleniumExecutor:
+        """A started session downloading to download_dir: a pooled one if ready."""
+        if use_local or not self.enabled:
+            return await _open_session(SeleniumExecutor(use_local=use_local, download_dir=download_dir))
+
+        self.start()
+        while self._idle:
+            executor, _ = self._idle.popleft()
+            try:
+                await asyncio.to_thread(executor.set_download_dir, download_dir)
+                if await asyncio.to_thread(executor.is_alive):
+                    return executor
+            except Exception as e:
+                logger.warning(f"Discarding pooled Selenium session: {e}")
+            await self._discard(executor)
+
+        self._open += 1
+        try:
+            return await _open_session(SeleniumExecutor(download_dir=download_dir))
+        except BaseException:
+            self._open -= 1
+            raise
+
+    async def give_back(self, executor: SeleniumExecutor, reusable: bool) -> None:
+        """Return a leased session: reset and keep it idle, or quit it."""
+        if executor.use_local or not self.enabled:
+            await asyncio.to_thread(executor.stop)
+            return
+
+        executor.uses += 1
+        if (
+            not reusable
+            or executor.uses >= settings.SELENIUM_SESSION_POOL_MAX_USES
+            # Opened on demand while the pool was busy: more than we keep
+            or self._open > self.size
+        ):
+            await self._discard(executor)
+            self._schedule_warmup()
+            return
+
+        # Each run gets a fresh command thread on the driver
+        AsyncDriver.discard(executor.driver)
+        try:
+            await asyncio.to_thread(executor.reset_session)
+        except Exception as e:
+            logger.warning(f"Could not reset Selenium session, closing it: {e}")
+            await self._discard(executor)
+            self._schedule_warmup()
+            return
+        self._idle.append((executor, time.monotonic()))
+
+    # ========== MAINTENANCE ==========
+
+    def _schedule_warmup(self) -> None:
+        if self.enabled and (self._warming is None or self._warming.done()):
+            self._warming = asyncio.create_task(self._warm_up())
+
+    async def _warm_up(self) -> None:
+        """Open sessions until the pool is full, a few at a time."""
+        missing = self.size - self._open
+        if missing <= 0:
+            return
+        self._open += missing
+        semaphore = asyncio.Semaphore(max(1, settings.SELENIUM_SESSION_POOL_WARMUP_CONCURRENCY))
+
+        async def _warm_one() -> None:
+            async with semaphore:
+                try:
+                    executor = await _open_session(SeleniumExecutor(download_dir=_idle_download_dir()))
+                except Exception as e:
+                    self._open -= 1
+                    logger.warning(f"Could not warm up Selenium session: {e}")
+                    return
+                if self._closed:
+                    self._open -= 1
+                    await asyncio.to_thread(executor.stop)
+                    return
+                self._idle.append((executor, time.monotonic()))
+
+        await asyncio.gather(*[_warm_one() for _ in range(missing)])
+        logger.info(f"🔥 Selenium session pool: {len(self._idle)} ready, {self._open} open")
+
+    async def _keep_alive(self) -> None:
+        while not self._closed:
+            await asyncio.sleep(KEEPALIVE_SECONDS)
+            try:
+                now = time.monotonic()
+                for _ in range(len(self._idle)):
+                    if not self._idle:
+                        # Leased while we were pinging
+                        break
+                    executor, idle_since = self._idle.popleft()
+                    expired = now - idle_since > settings.SELENIUM_SESSION_POOL_IDLE_SECONDS
+                    if not expired and await asyncio.to_thread(executor.is_alive):
+                        self._idle.append((executor, idle_since))
+                    else:
+                        await self._discard(executor)
+                self._schedule_warmup()
+            except Exception as e:
+                logger.error(f"Selenium session pool keepalive error: {e}")
+
+    async def _discard(self, executor: SeleniumExecutor) -> None:
+        self._open -= 1
+        await asyncio.to_thread(executor.stop)
+
+    def shutdown(self) -> None:
+        """Quit idle sessions on worker shutdown (blocking)."""
+        self._closed = True
+        while self._idle:
+            executor, _ = self._idle.popleft()
+            executor.stop()
+
+
+def _idle_download_dir() -> str:
+    # Rewritten over CDP when the session is leased
+    return os.getenv("DOWNLOADS_DIR", "/downloads")
+
+
+async def _open_session(executor: SeleniumExecutor) -> SeleniumExecutor:
+    """Start a session off the loop; if cancelled meanwhile, close it once open."""
+    start_future = asyncio.ensure_future(asyncio.to_thread(executor.start))
+    try:
+        await asyncio.shield(start_future)
+    except asyncio.CancelledError:
+        await asyncio.gather(start_future, return_exceptions=True)
+        await asyncio.to_thread(executor.stop)
+        raise
+    except Exception:
+        await asyncio.to_thread(executor.stop)
+        raise
+
+    if not executor.use_local and not executor.vnc_url:
+        node = await grid_topology.lookup(executor.driver.session_id)
+        if node:
+            executor.node_id, executor.node_uri, executor.vnc_url = node
+    if executor.vnc_url:
+        logger.info(f"📺 VNC: {executor.vnc_url}")
+    else:
+        logger.warning("⚠️ VNC URL not resolved for this session")
+    return executor
+
+
+session_pool = SessionPool()
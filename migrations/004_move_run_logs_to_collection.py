@@ -0,0 +1,68 @@
+"""
+Migration: Move run logs from runs.logs arrays to the run_logs collection
+Date: 2026-10-18
+
+Each log line becomes a run_logs document keyed by (run_id, seq). Runs get a
+log_seq counter with the last allocated seq and lose the logs array.
+"""
+
+import uuid
+from datetime import datetime
+
+BATCH_SIZE = 500
+
+
+async def up(db):
+    await db.run_logs.create_index([("run_id", 1), ("seq", 1)], unique=True)
+    await db.run_logs.create_index("created_at")
+
+    moved_runs = 0
+    moved_lines = 0
+    cursor = db.runs.find(
+        {"logs": {"$exists": True}},
+        projection={"logs": 1, "created_at": 1},
+        batch_size=BATCH_SIZE,
+    )
+    async for run in cursor:
+        lines = run.get("logs") or []
+        created_at = run.get("created_at") or datetime.utcnow()
+        if lines:
+            # Re-runnable: drop lines a previous partial run may have copied
+            await db.run_logs.delete_many({"run_id": run["_id"]})
+            for start in range(0, len(lines), BATCH_SIZE):
+                await db.run_logs.insert_many(
+                    [
+                        {
+                            "_id": str(uuid.uuid4()),
+                            "run_id": run["_id"],
+                            "seq": start + i + 1,
+                            "message": line,
+                            "created_at": created_at,
+                        }
+                        for i, line in enumerate(lines[start:start + BATCH_SIZE])
+                    ],
+                    ordered=False,
+                )
+        await db.runs.update_one(
+            {"_id": run["_id"]},
+            {"$set": {"log_seq": len(lines)}, "$unset": {"logs": ""}},
+        )
+        moved_runs += 1
+        moved_lines += len(lines)
+
+    await db.runs.update_many({"log_seq": {"$exists": False}}, {"$set": {"log_seq": 0}})
+    print(f"  ✓ Moved {moved_lines} log line(s) from {moved_runs} run(s) to run_logs")
+
+
+async def down(db):
+    moved_runs = 0
+    run_ids = await db.run_logs.distinct("run_id")
+    for run_id in run_ids:
+        cursor = db.run_logs.find({"run_id": run_id}, projection={"message": 1}).sort("seq", 1)
+        lines = [doc["message"] async for doc in cursor]
+        await db.runs.update_one({"_id": run_id}, {"$set": {"logs": lines}})
+        moved_runs += 1
+
+    await db.runs.update_many({}, {"$unset": {"log_seq": ""}})
+    await db.run_logs.drop()
+    print(f"  ✓ Restored logs arrays on {moved_runs} run(s)")
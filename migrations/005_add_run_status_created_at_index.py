@@ -0,0 +1,12 @@
+"""
+Migration: Add runs (status, created_at) index for dashboard counters
+Date: 2026-10-18
+"""
+
+
+async def up(db):
+    await db.runs.create_index([("status", 1), ("created_at", 1)])
+
+
+async def down(db):
+    await db.runs.drop_index("status_1_created_at_1")
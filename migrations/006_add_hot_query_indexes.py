@@ -0,0 +1,67 @@
+"""
+Migration: Add compound/partial indexes for hot run, job and credential queries
+Date: 2026-10-18
+
+Mirrors the indexes declared in core/models/mongo_models.py so they are built
+once at deploy time instead of on the first app start. The (status, created_at)
+index from 005 is superseded by (status, created_at, _id).
+"""
+
+RUNS_WITH_FILES = {"files.0": {"$exists": True}}
+
+INDEXES = {
+    "runs": [
+        ([("status", 1), ("created_at", 1), ("_id", 1)], {}),
+        ([("status", 1), ("updated_at", 1)], {}),
+        ([("created_at", -1), ("_id", -1)], {}),
+        ([("job_id", 1), ("created_at", -1), ("_id", -1)], {}),
+        (
+            [("created_at", -1), ("_id", -1)],
+            {"name": "files_created_at_-1__id_-1", "partialFilterExpression": RUNS_WITH_FILES},
+        ),
+        (
+            [("connector", 1), ("created_at", -1), ("_id", -1)],
+            {"name": "files_connector_1_created_at_-1__id_-1", "partialFilterExpression": RUNS_WITH_FILES},
+        ),
+    ],
+    "jobs": [
+        ([("created_at", -1), ("_id", -1)], {}),
+        ([("workspace_id", 1), ("created_at", -1), ("_id", -1)], {}),
+    ],
+    "credentials": [
+        ([("workspace_id", 1), ("username", 1)], {}),
+        ([("created_at", -1), ("_id", -1)], {}),
+        ([("workspace_id", 1), ("created_at", -1), ("_id", -1)], {}),
+    ],
+    "file_processors": [
+        ([("credential_id", 1), ("is_active", 1)], {}),
+    ],
+    "workspaces": [
+        ([("created_at", -1), ("_id", -1)], {}),
+    ],
+}
+
+
+async def up(db):
+    names = {}
+    for collection, indexes in INDEXES.items():
+        names[collection] = []
+        for keys, options in indexes:
+            names[collection].append(await db[collection].create_index(keys, **options))
+
+    existing = await db.runs.index_information()
+    if "status_1_created_at_1" in existing:
+        await db.runs.drop_index("status_1_created_at_1")
+
+    for collection, created in names.items():
+        print(f"   {collection}: {', '.join(created)}")
+
+
+async def down(db):
+    await db.runs.create_index([("status", 1), ("created_at", 1)])
+    for collection, indexes in INDEXES.items():
+        existing = await db[collection].index_information()
+        for keys, options in indexes:
+            name = options.get("name") or "_".join(f"{field}_{direction}" for field, direction in keys)
+            if name in existing:
+                await db[collection].drop_index(name)
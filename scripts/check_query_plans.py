@@ -0,0 +1,125 @@
+"""
+Explain the hot console/worker queries and fail if any needs a COLLSCAN.
+
+Usage (from the repo root, e.g. in the app-console container):
+    PYTHONPATH=. python scripts/check_query_plans.py
+
+Exits 1 when a query's winning plan scans a whole collection, i.e. when an
+index declared in core/models/mongo_models.py is missing or not usable.
+"""
+
+import asyncio
+import sys
+from datetime import datetime, timedelta
+
+from core.db import init_db
+from core.models.mongo_models import (
+    RUNS_WITH_FILES, Credential, FileProcessor, Job, Run, RunLog, RunStat, Workspace
+)
+from core.services.dashboard_stats import _run_counters_pipeline
+
+NOW = datetime.utcnow()
+KEYSET = {
+    "$or": [
+        {"created_at": {"$lt": NOW}},
+        {"created_at": NOW, "_id": {"$lt": "~"}},
+    ]
+}
+NEWEST_FIRST = [("created_at", -1), ("_id", -1)]
+
+
+def _find(document, query, sort=None):
+    return {"document": document, "query": query, "sort": sort}
+
+
+def _aggregate(document, pipeline):
+    return {"document": document, "pipeline": pipeline}
+
+
+HOT_QUERIES = {
+    # Worker: cleanup_stale_runs
+    "zombie runs": _find(Run, {"status": "running", "updated_at": {"$lt": NOW}}),
+    "stuck queued runs": _find(Run, {"status": "queued", "created_at": {"$lt": NOW}}),
+    # Console: /runs, /dashboard/recent-runs
+    "list runs": _find(Run, {}, NEWEST_FIRST),
+    "list runs (next page)": _find(Run, KEYSET, NEWEST_FIRST),
+    "list runs by job": _find(Run, {"job_id": "x"}, NEWEST_FIRST),
+    "list runs by status": _find(Run, {"status": "failed"}, NEWEST_FIRST),
+    # Console: /downloads
+    "list downloads": _find(Run, dict(RUNS_WITH_FILES), [("created_at", -1)]),
+    "list downloads by connector": _find(Run, {**RUNS_WITH_FILES, "connector": "x"}, [("created_at", -1)]),
+    # Worker: artifact_retention_task
+    "cold runs with files": _find(Run, {**RUNS_WITH_FILES, "created_at": {"$lt": NOW}}),
+    # Console: /dashboard/stats fallback when run_stats was never built
+    "dashboard fallback counters": _aggregate(
+        Run, _run_counters_pipeline(NOW - timedelta(days=7), NOW - timedelta(days=14))
+    ),
+    "dashboard run_stats buckets": _find(RunStat, {"day": {"$gte": "2000-01-01", "$lte": "2999-12-31"}, "status": "success"}),
+    # Run logs
+    "run log page": _find(RunLog, {"run_id": "x", "seq": {"$gt": 0}}, [("seq", 1)]),
+    # Jobs / credentials / processors
+    "list jobs": _find(Job, {}, NEWEST_FIRST),
+    "list jobs by workspace": _find(Job, {"workspace_id": "x"}, NEWEST_FIRST),
+    "list workspaces": _find(Workspace, {}, NEWEST_FIRST),
+    "list credentials": _find(Credential, {}, NEWEST_FIRST),
+    "list credentials by workspace": _find(Credential, {"workspace_id": "x"}, NEWEST_FIRST),
+    "legacy credential link": _find(Credential, {"workspace_id": "x", "username": "y"}),
+    "active file processor": _find(FileProcessor, {"credential_id": "x", "is_active": True}),
+}
+
+
+def _stages(plan):
+    """Yield every stage name in an explain plan tree (classic or SBE)."""
+    if isinstance(plan, dict):
+        if "stage" in plan:
+            yield plan["stage"]
+        for value in plan.values():
+            yield from _stages(value)
+    elif isinstance(plan, list):
+        for item in plan:
+            yield from _stages(item)
+
+
+async def _explain(spec) -> dict:
+    collection = spec["document"].get_motor_collection()
+    if "pipeline" in spec:
+        return await collection.database.command(
+            "aggregate", collection.name, pipeline=spec["pipeline"], explain=True
+        )
+    cursor = collection.find(spec["query"])
+    if spec["sort"]:
+        cursor = cursor.sort(spec["sort"])
+    return await cursor.explain()
+
+
+def _winning_plans(explain: dict):
+    """Winning plans of a find or of each $cursor stage of an aggregation."""
+    if "queryPlanner" in explain:
+        yield explain["queryPlanner"]["winningPlan"]
+    for stage in explain.get("stages", []):
+        cursor = stage.get("$cursor", {})
+        if "queryPlanner" in cursor:
+            yield cursor["queryPlanner"]["winningPlan"]
+
+
+async def main() -> int:
+    await init_db()  # init_beanie creates the declared indexes
+    failures = []
+    for name, spec in HOT_QUERIES.items():
+        explain = await _explain(spec)
+        stages = [stage for plan in _winning_plans(explain) for stage in _stages(plan)]
+        if "COLLSCAN" in stages:
+            failures.append(name)
+            print(f"❌ {name}: COLLSCAN ({' > '.join(stages)})")
+        else:
+            print(f"✅ {name}: {' > '.join(stages) or 'n/a'}")
+
+    if failures:
+        print(f"\n{len(failures)} hot quer{'y' if len(failures) == 1 else 'ies'} without a usable index")
+        return 1
+    print(f"\nAll {len(HOT_QUERIES)} hot queries use an index")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main()))
@@ -1,6 +1,6 @@
 import asyncio
 from core.db import init_db
-from core.models.mongo_models import Run
+from core.models.mongo_models import Run, RunLog
 
 async def show_logs():
     await init_db()
@@ -11,7 +11,7 @@ async def show_logs():
     print(f"Erro: {run.error_summary[:200] if run.error_summary else 'N/A'}")
     print("=" * 70)
     print()
-    for log in run.logs:
-        print(log)
+    async for log in RunLog.find(RunLog.run_id == run.id).sort(+RunLog.seq):
+        print(log.message)
 
 asyncio.run(show_logs())